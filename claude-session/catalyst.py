@@ -2,25 +2,30 @@
 """
 Catalyst Deliverable Generator
 Generates technical plans, leadership briefs, or client slides for approved opportunities
+
+Single deliverable:
+    python3 catalyst.py --digest-date 2026-02-02 --opportunity W1 --type brief
+
+Batch (one process for a whole approval reply):
+    python3 catalyst.py --digest-date 2026-02-02 --approvals '[{"opp_id": "H1", "type": "plan"}, {"opp_id": "W1", "type": "brief"}]'
+
+Add --post-to-thread <digest ts> to post the new deliverables into the digest's
+Slack thread (SLACK_BOT_TOKEN and SLACK_CHANNEL from config/.env).
 """
 
 import os
+import re
 import sys
 import json
 import argparse
 from datetime import datetime
-from dotenv import load_dotenv
-from crewai import Agent, Task, Crew, Process
-from tools.context_loader import load_homelab_context, load_work_context
-
-# Load environment variables
-load_dotenv('config/.env')
-
-# === CATALYST AGENT ===
-catalyst = Agent(
-    role='Catalyst Deliverable Generator',
-    goal='Create actionable deliverables (technical plans, leadership briefs, client slides) for approved opportunities',
-    backstory="""You are a strategic deliverable writer who excels at translating
+from tools.worker_client import submit_job
+
+# crewai, dotenv and the context loader are imported inside the functions
+# that need them, so --help, argument errors and jobs handed to the crew
+# worker return without loading them
+
+CATALYST_BACKSTORY = """You are a strategic deliverable writer who excels at translating
     trend signals into concrete, actionable outputs. You understand how to bridge
     between abstract opportunities and practical next steps.
 
@@ -42,14 +47,46 @@ catalyst = Agent(
     - Real-world use cases and examples
     - "So what?" framing (why should they care)
 
-    You write with clarity, pragmatism, and actionability.""",
-    verbose=True,
-    allow_delegation=False,
-    llm='claude-sonnet-4-5-20250929'
-)
+    You write with clarity, pragmatism, and actionability."""
+
+def build_catalyst_agent():
+    """Construct the Catalyst agent"""
+    from crewai import Agent
+
+    return Agent(
+        role='Catalyst Deliverable Generator',
+        goal='Create actionable deliverables (technical plans, leadership briefs, client slides) for approved opportunities',
+        backstory=CATALYST_BACKSTORY,
+        verbose=True,
+        allow_delegation=False,
+        llm='claude-sonnet-4-5-20250929'
+    )
+
+def load_opportunity_mapping(digest_date, store=None):
+    """
+    Load all opportunities for a digest
+
+    Args:
+        digest_date: Digest date (YYYY-MM-DD)
+        store: OpportunityStore to read from (opened here if None)
+
+    Returns:
+        Mapping of opportunity ID -> opportunity data. Digests in the store
+        are looked up one ID at a time; older digests fall back to their
+        mapping file.
+    """
+    from tools.opportunity_store import OpportunityStore
+
+    own_store = store is None
+    store = store or OpportunityStore()
+    try:
+        if store.has_digest(digest_date):
+            # A store opened here is closed below, so its digest is copied out rather than viewed
+            return store.get_digest(digest_date) if own_store else store.digest(digest_date)
+    finally:
+        if own_store:
+            store.close()
 
-def load_opportunity(digest_date, opportunity_id):
-    """Load opportunity data from mapping file"""
     mapping_file = f"output/opportunities_{digest_date}.json"
 
     if not os.path.exists(mapping_file):
@@ -58,13 +95,27 @@ def load_opportunity(digest_date, opportunity_id):
     with open(mapping_file, 'r') as f:
         data = json.load(f)
 
-    if opportunity_id not in data['opportunities']:
+    return data['opportunities']
+
+def load_opportunity(digest_date, opportunity_id, store=None):
+    """Load one opportunity from the opportunity store (or its digest's mapping file)"""
+    opportunities = load_opportunity_mapping(digest_date, store)
+
+    if opportunity_id not in opportunities:
         raise ValueError(f"Opportunity {opportunity_id} not found in mapping")
 
-    return data['opportunities'][opportunity_id]
+    return opportunities[opportunity_id]
+
+def opportunity_query(opportunity_data):
+    """Text describing an opportunity, used to pick the context relevant to it"""
+    return ' '.join(
+        opportunity_data.get(field, '') for field in ('title', 'relevance', 'signal', 'next_steps')
+    )
 
-def create_plan_task(opportunity_data, context_data):
+def create_plan_task(opportunity_data, context_data, agent):
     """Create Technical Plan task for homelab opportunities"""
+    from crewai import Task
+
     return Task(
         description=f"""Generate a Technical Plan for the following homelab opportunity.
 
@@ -98,12 +149,14 @@ Create a technical plan with these sections:
 ## Next Actions
 [Concrete first steps to validate/prototype]
 """,
-        agent=catalyst,
+        agent=agent,
         expected_output="Well-structured technical plan with clear implementation steps"
     )
 
-def create_brief_task(opportunity_data, context_data):
+def create_brief_task(opportunity_data, context_data, agent):
     """Create Leadership Brief task for work opportunities"""
+    from crewai import Task
+
     return Task(
         description=f"""Generate a Leadership Brief for the following work opportunity.
 
@@ -137,12 +190,14 @@ Create a leadership brief with these sections:
 ## Key Stakeholders
 [Who should be involved in this conversation?]
 """,
-        agent=catalyst,
+        agent=agent,
         expected_output="Well-structured leadership brief with strategic framing"
     )
 
-def create_slide_task(opportunity_data, context_data):
+def create_slide_task(opportunity_data, context_data, agent):
     """Create Client Slide task for work opportunities"""
+    from crewai import Task
+
     return Task(
         description=f"""Generate a Client Slide (text format) for the following work opportunity.
 
@@ -175,91 +230,391 @@ Create text content for a single explanatory slide with these sections:
 TONE: Clear, non-technical, value-focused
 AUDIENCE: Business stakeholders / clients (not engineers)
 """,
-        agent=catalyst,
+        agent=agent,
         expected_output="Single-slide content with clear business value framing"
     )
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate Catalyst deliverable')
-    parser.add_argument('--digest-date', required=True, help='Digest date (YYYY-MM-DD)')
-    parser.add_argument('--opportunity', required=True, help='Opportunity ID (e.g., H1, W2)')
-    parser.add_argument('--type', required=True, choices=['plan', 'brief', 'slide'], help='Deliverable type')
-
-    args = parser.parse_args()
-
+def generate_deliverable(
+    digest_date,
+    opportunity_id,
+    deliverable_type,
+    use_cache=True,
+    agent=None,
+    opportunity_data=None,
+    context_data=None,
+    store=None,
+    reply_ts="",
+    force=False,
+    queue=None
+):
+    """
+    Generate one deliverable in this process, once per (digest, opportunity, type)
+
+    The job is recorded in the Catalyst job queue first. If it was already
+    generated, or another process is generating it, that result is returned
+    (with "deduplicated": True, and "duplicate_reply": True if this reply_ts
+    was already submitted) instead of calling the LLM again.
+
+    Args:
+        digest_date / opportunity_id / deliverable_type: As for _generate_deliverable
+        use_cache / agent / opportunity_data / context_data / store: Passed to _generate_deliverable
+        reply_ts: Slack ts of the approval reply that requested it
+        force: Regenerate even if the deliverable already exists (skipping the response cache)
+        queue: JobQueue to record the job in (opened here if None)
+
+    Returns:
+        Result dict printed for n8n ("success" plus deliverable or error fields)
+    """
+    from tools.job_queue import JobQueue
+
+    own_queue = queue is None
+    queue = queue or JobQueue()
     try:
-        # Load opportunity
-        print(f"[Catalyst] Loading opportunity {args.opportunity} from {args.digest_date}...")
-        opportunity_data = load_opportunity(args.digest_date, args.opportunity)
+        submission = queue.submit(digest_date, opportunity_id, deliverable_type, reply_ts, force=force)
+
+        if not queue.claim(digest_date, opportunity_id, deliverable_type):
+            print(f"[Catalyst] {opportunity_id} {deliverable_type} for {digest_date} already requested, reusing it...")
+            job = queue.wait(digest_date, opportunity_id, deliverable_type)
+            if job['state'] in ('done', 'failed'):
+                return {**job['result'], "deduplicated": True, "duplicate_reply": submission['duplicate_reply']}
+            return {
+                "success": False,
+                "error": "Deliverable is still being generated by another process",
+                "digest_date": digest_date,
+                "opportunity_id": opportunity_id,
+                "deliverable_type": deliverable_type
+            }
 
-        # Load context
-        print(f"[Catalyst] Loading context files...")
-        if args.opportunity.startswith('H'):
-            context_data = load_homelab_context()
+        result = _generate_deliverable(
+            digest_date, opportunity_id, deliverable_type,
+            use_cache=use_cache, agent=agent, opportunity_data=opportunity_data,
+            context_data=context_data, store=store, refresh_cache=force
+        )
+        if result["success"]:
+            queue.complete(digest_date, opportunity_id, deliverable_type, result)
         else:
-            context_data = load_work_context()
+            queue.fail(digest_date, opportunity_id, deliverable_type, result)
+        return result
+    finally:
+        if own_queue:
+            queue.close()
+
+def _generate_deliverable(
+    digest_date,
+    opportunity_id,
+    deliverable_type,
+    use_cache=True,
+    agent=None,
+    opportunity_data=None,
+    context_data=None,
+    store=None,
+    refresh_cache=False
+):
+    """
+    Run the Catalyst agent for one deliverable (no job queue bookkeeping)
+
+    Args:
+        digest_date: Digest date (YYYY-MM-DD)
+        opportunity_id: Opportunity ID (e.g., H1, W2)
+        deliverable_type: 'plan', 'brief' or 'slide'
+        use_cache: Serve an identical earlier generation from the response cache
+        agent: Prebuilt Catalyst agent (built here if None)
+        opportunity_data: Preloaded opportunity (loaded from the mapping file if None)
+        context_data: Preloaded homelab/work context (if None, the context
+            chunks relevant to this opportunity are loaded)
+        store: OpportunityStore holding the digest (opened here if None);
+            the opportunity is marked approved, then delivered on success
+        refresh_cache: Call the LLM even on a cache hit, storing the new
+            output (a forced regeneration must not return the cached one)
+
+    Returns:
+        Result dict printed for n8n ("success" plus deliverable or error fields)
+    """
+    from crewai import Crew, Process
+    from tools.context_loader import load_relevant_context
+    from tools.response_cache import ResponseCache, kickoff_cached
+    from tools.opportunity_store import OpportunityStore
+
+    own_store = store is None
+    try:
+        store = store or OpportunityStore()
+
+        # Load opportunity
+        if opportunity_data is None:
+            print(f"[Catalyst] Loading opportunity {opportunity_id} from {digest_date}...")
+            opportunity_data = load_opportunity(digest_date, opportunity_id, store)
+        store.set_status(digest_date, opportunity_id, 'approved')
+
+        # Load only the context relevant to this opportunity, so the prompt
+        # stays the same size however large the transcript archive grows
+        if context_data is None:
+            print(f"[Catalyst] Loading relevant context...")
+            context_data = load_relevant_context(
+                'homelab' if opportunity_id.startswith('H') else 'work',
+                opportunity_query(opportunity_data)
+            )
+
+        if agent is None:
+            agent = build_catalyst_agent()
 
         # Create task
-        print(f"[Catalyst] Creating {args.type} task...")
-        if args.type == 'plan':
-            task = create_plan_task(opportunity_data, context_data)
-        elif args.type == 'brief':
-            task = create_brief_task(opportunity_data, context_data)
+        print(f"[Catalyst] Creating {deliverable_type} task...")
+        if deliverable_type == 'plan':
+            task = create_plan_task(opportunity_data, context_data, agent)
+        elif deliverable_type == 'brief':
+            task = create_brief_task(opportunity_data, context_data, agent)
         else:  # slide
-            task = create_slide_task(opportunity_data, context_data)
+            task = create_slide_task(opportunity_data, context_data, agent)
 
         # Execute
         print(f"[Catalyst] Executing Catalyst agent...")
         crew = Crew(
-            agents=[catalyst],
+            agents=[agent],
             tasks=[task],
             process=Process.sequential,
             verbose=True
         )
 
-        result = crew.kickoff()
-        deliverable_content = str(result)
+        response_cache = ResponseCache() if use_cache else None
+        deliverable_content = kickoff_cached(crew, response_cache, refresh=refresh_cache)[-1]
 
         # Save output
-        output_file = f"output/catalyst_{args.digest_date}_{args.opportunity}_{args.type}.json"
+        output_file = f"output/catalyst_{digest_date}_{opportunity_id}_{deliverable_type}.json"
         output_data = {
             "timestamp": datetime.now().isoformat(),
-            "digest_date": args.digest_date,
-            "opportunity_id": args.opportunity,
-            "deliverable_type": args.type,
+            "digest_date": digest_date,
+            "opportunity_id": opportunity_id,
+            "deliverable_type": deliverable_type,
             "opportunity_data": opportunity_data,
             "deliverable_content": deliverable_content,
             "context_used": {
-                "type": "homelab" if args.opportunity.startswith('H') else "work"
+                "type": "homelab" if opportunity_id.startswith('H') else "work"
             }
         }
 
         with open(output_file, 'w') as f:
             json.dump(output_data, f, indent=2)
+        store.set_status(digest_date, opportunity_id, 'delivered')
 
-        # Print JSON output for n8n to capture
-        result_json = {
+        return {
             "success": True,
             "deliverable_file": output_file,
             "deliverable_content": deliverable_content,
             "opportunity_title": opportunity_data['title']
         }
 
-        print("\n[Catalyst] === OUTPUT START ===")
-        print(json.dumps(result_json, indent=2))
-        print("[Catalyst] === OUTPUT END ===")
-
     except Exception as e:
-        error_json = {
+        return {
             "success": False,
             "error": str(e),
+            "digest_date": digest_date,
+            "opportunity_id": opportunity_id,
+            "deliverable_type": deliverable_type
+        }
+    finally:
+        if own_store and store is not None:
+            store.close()
+
+def generate_batch(digest_date, approvals, max_workers=3, use_cache=True, force=False):
+    """
+    Generate deliverables for a whole approval reply in one process
+
+    One opportunity store connection is shared; deliverables run
+    concurrently, each with its own Catalyst agent and the context relevant
+    to its opportunity (context files are parsed once and memoized).
+
+    Args:
+        digest_date: Digest date (YYYY-MM-DD)
+        approvals: [{"opp_id": "H1", "type": "plan"}, ...] as produced by
+            approval_parser.parse_approval_syntax / validate_against_opportunities,
+            optionally with the "reply_ts" of the Slack reply
+        max_workers: Maximum deliverables generated at once
+        use_cache: Serve identical earlier generations from the response cache
+        force: Regenerate deliverables that already exist (skipping the response cache)
+
+    Returns:
+        {"success": bool, "digest_date": ..., "results": [per-item result, ...]}
+        with results in the same order as approvals
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from tools.opportunity_store import OpportunityStore
+    from tools.job_queue import JobQueue
+
+    store = queue = None
+    try:
+        try:
+            print(f"[Catalyst] Loading opportunities from {digest_date}...")
+            store = OpportunityStore()
+            queue = JobQueue()
+            opportunities = load_opportunity_mapping(digest_date, store)
+        except Exception as e:
+            return {"success": False, "digest_date": digest_date, "error": str(e), "results": []}
+
+        def run_one(approval):
+            opp_id, deliverable_type = approval['opp_id'], approval['type']
+            if opp_id not in opportunities:
+                result = {"success": False, "error": f"Opportunity {opp_id} not found in mapping"}
+            else:
+                result = generate_deliverable(
+                    digest_date,
+                    opp_id,
+                    deliverable_type,
+                    use_cache=use_cache,
+                    opportunity_data=opportunities[opp_id],
+                    store=store,
+                    reply_ts=approval.get('reply_ts', ''),
+                    force=force,
+                    queue=queue
+                )
+            return {"opportunity_id": opp_id, "deliverable_type": deliverable_type, **result}
+
+        print(f"[Catalyst] Generating {len(approvals)} deliverables ({max_workers} at a time)...")
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(approvals)))) as pool:
+            results = list(pool.map(run_one, approvals))
+
+        return {
+            "success": all(r["success"] for r in results),
+            "digest_date": digest_date,
+            "results": results
+        }
+    finally:
+        # Closed even when the mapping fails to load
+        if store is not None:
+            store.close()
+        if queue is not None:
+            queue.close()
+
+def post_to_thread(thread_ts, result_json, opportunity_id=None, deliverable_type=None):
+    """
+    Post the deliverables of a single or batch result into a Slack digest thread
+
+    Deduplicated results were posted when first generated and are skipped.
+
+    Returns:
+        slack_delivery.post_messages result dict
+    """
+    from dotenv import load_dotenv
+    from tools.slack_delivery import DEFAULT_SLACK_API_URL, SlackClient, deliver_deliverables
+
+    load_dotenv('config/.env')
+    token = os.getenv('SLACK_BOT_TOKEN')
+    if not token:
+        return {"success": False, "messages": 0, "error": "SLACK_BOT_TOKEN not set"}
+
+    if 'results' in result_json:
+        results = result_json['results']
+    else:
+        results = [{"opportunity_id": opportunity_id, "deliverable_type": deliverable_type, **result_json}]
+    results = [result for result in results if not result.get('deduplicated')]
+    if not results:
+        return {"success": True, "messages": 0}
+
+    client = SlackClient(token, os.getenv('SLACK_API_URL', DEFAULT_SLACK_API_URL))
+    return deliver_deliverables(client, os.getenv('SLACK_CHANNEL', '#trend-monitoring'), thread_ts, results)
+
+def approvals_arg(value):
+    """argparse type: JSON list of {"opp_id", "type"} approvals"""
+    try:
+        approvals = json.loads(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("approvals must be a JSON list")
+    if not isinstance(approvals, list) or not approvals:
+        raise argparse.ArgumentTypeError("approvals must be a non-empty JSON list")
+    for approval in approvals:
+        if not isinstance(approval, dict) or not re.match(r'^[HW]\d+$', str(approval.get('opp_id', ''))):
+            raise argparse.ArgumentTypeError(f"invalid approval {approval!r} (expected {{\"opp_id\": \"H1\", \"type\": \"plan\"}})")
+        if approval.get('type') not in ('plan', 'brief', 'slide'):
+            raise argparse.ArgumentTypeError(f"invalid deliverable type in {approval!r}")
+    return approvals
+
+def digest_date_arg(value):
+    """argparse type: YYYY-MM-DD date"""
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid digest date '{value}' (expected YYYY-MM-DD)")
+    return value
+
+def opportunity_id_arg(value):
+    """argparse type: H* or W* opportunity ID"""
+    if not re.match(r'^[HW]\d+$', value):
+        raise argparse.ArgumentTypeError(f"invalid opportunity ID '{value}' (expected H1, W2, etc.)")
+    return value
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate Catalyst deliverable')
+    parser.add_argument('--digest-date', required=True, type=digest_date_arg, help='Digest date (YYYY-MM-DD)')
+    parser.add_argument('--opportunity', type=opportunity_id_arg, help='Opportunity ID (e.g., H1, W2)')
+    parser.add_argument('--type', choices=['plan', 'brief', 'slide'], help='Deliverable type')
+    parser.add_argument('--approvals', type=approvals_arg,
+                        help='Batch mode: JSON list of approvals, e.g. \'[{"opp_id": "H1", "type": "plan"}]\'')
+    parser.add_argument('--max-workers', type=int, default=3, help='Batch mode: deliverables generated at once (default: 3)')
+    parser.add_argument('--reply-ts', default='',
+                        help='Slack ts of the approval reply (repeats of one reply are not rerun); in batch mode, '
+                             'applied to each approval without its own "reply_ts"')
+    parser.add_argument('--no-cache', action='store_true', help='Always call the LLM, ignoring cached responses')
+    parser.add_argument('--force', action='store_true', help='Regenerate even if the deliverable already exists')
+    parser.add_argument('--local', action='store_true', help='Run in this process even if the crew worker is running')
+    parser.add_argument('--post-to-thread', metavar='DIGEST_TS',
+                        help='Post new deliverables into this Slack digest thread, batched into as few messages as fit')
+
+    args = parser.parse_args()
+
+    if args.approvals:
+        if args.opportunity or args.type:
+            parser.error("--approvals cannot be combined with --opportunity/--type")
+        if args.reply_ts:
+            # One Slack reply approving several items: each is a submission of that reply
+            args.approvals = [{**approval, "reply_ts": approval.get('reply_ts') or args.reply_ts} for approval in args.approvals]
+        kind = 'deliverable_batch'
+        job = {
             "digest_date": args.digest_date,
-            "opportunity_id": args.opportunity,
-            "deliverable_type": args.type
+            "approvals": args.approvals,
+            "max_workers": args.max_workers,
+            "use_cache": not args.no_cache,
+            "force": args.force
         }
-        print("\n[Catalyst] === OUTPUT START ===")
-        print(json.dumps(error_json, indent=2))
-        print("[Catalyst] === OUTPUT END ===")
+    else:
+        if not (args.opportunity and args.type):
+            parser.error("--opportunity and --type are required (or use --approvals)")
+        kind = 'deliverable'
+        job = {
+            "digest_date": args.digest_date,
+            "opportunity": args.opportunity,
+            "type": args.type,
+            "use_cache": not args.no_cache,
+            "reply_ts": args.reply_ts,
+            "force": args.force
+        }
+
+    # Hand the job to the warm crew worker when it is running
+    result_json = None if args.local else submit_job(kind, job)
+
+    if result_json is None:
+        from dotenv import load_dotenv
+
+        # Load environment variables
+        load_dotenv('config/.env')
+        if kind == 'deliverable_batch':
+            result_json = generate_batch(
+                args.digest_date, args.approvals, max_workers=args.max_workers,
+                use_cache=not args.no_cache, force=args.force
+            )
+        else:
+            result_json = generate_deliverable(
+                args.digest_date, args.opportunity, args.type, use_cache=not args.no_cache,
+                reply_ts=args.reply_ts, force=args.force
+            )
+
+    if args.post_to_thread:
+        result_json['slack'] = post_to_thread(args.post_to_thread, result_json, args.opportunity, args.type)
+
+    # Print JSON output for n8n to capture
+    print("\n[Catalyst] === OUTPUT START ===")
+    print(json.dumps(result_json, indent=2))
+    print("[Catalyst] === OUTPUT END ===")
+
+    if not result_json["success"]:
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -6,9 +6,67 @@ Extracts and numbers opportunities from Strategist outputs
 
 import re
 import json
-from typing import Dict, Any
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Tuple
 from datetime import datetime
 
+# Starts each opportunity; the text before the first one is ignored
+_HEADER_RE = re.compile(r'###\s+Opportunity:\s+')
+
+# Field labels: **Relevance...:**, **Signal...:**, **Next Steps...:** (extra
+# words allowed before the colon, as in extract_subsection)
+_LABEL_RE = re.compile(r'\*\*(Relevance|Signal|Next Steps)[^:\n]*:\*\*')
+# Where a field value ends: a new line starting with **Capitalized or ---.
+# Kept separate from _LABEL_RE: re only skips ahead quickly on a literal
+# prefix, and an alternation of the two scans several times slower.
+_BOUNDARY_RE = re.compile(r'\n\s*(?=\*\*[A-Z]|---)')
+_WHITESPACE_RE = re.compile(r'\s*')
+
+FIELD_KEYS = {'Relevance': 'relevance', 'Signal': 'signal', 'Next Steps': 'next_steps'}
+
+# Characters re-searched for a header that may be split across stream chunks
+HEADER_LOOKBACK = 64
+
+def _parse_fields(text: str, start: int, end: int) -> Dict[str, str]:
+    """
+    Extract every field of one section in a single pass over its labels and boundaries
+
+    Same result as calling extract_subsection() per field on text[start:end]:
+    the first label for each field wins, and its value runs from after the
+    label to the first boundary after it (or the end of the section).
+    """
+    boundaries = [match.start() for match in _BOUNDARY_RE.finditer(text, start, end)]
+
+    found = {}
+    pos = start
+    while len(found) < len(FIELD_KEYS):
+        label = _LABEL_RE.search(text, pos, end)
+        if label is None:
+            break
+        # Labels can overlap ("**Relevance**Signal:**"), so resume just past this one's start
+        pos = label.start() + 1
+
+        key = FIELD_KEYS[label.group(1)]
+        if key in found:
+            continue
+        # A label followed by a newline skips that boundary: the value runs on to the next one
+        value_start = _WHITESPACE_RE.match(text, label.end(), end).end()
+        i = bisect_left(boundaries, value_start)
+        found[key] = text[value_start:boundaries[i] if i < len(boundaries) else end].strip()
+    return found
+
+def _build_opportunity(text: str, start: int, end: int) -> Dict[str, str]:
+    """Opportunity dict for the section text[start:end] (the text after its header)"""
+    section = text[start:end].strip()
+    fields = _parse_fields(text, start, end)
+    return {
+        "title": section.split('\n', 1)[0].strip(),
+        "full_text": section,
+        "relevance": fields.get('relevance', ''),
+        "signal": fields.get('signal', ''),
+        "next_steps": fields.get('next_steps', '')
+    }
+
 def parse_opportunities(text: str, prefix: str) -> Dict[str, Dict[str, str]]:
     """
     Parse structured opportunities from Strategist output
@@ -19,35 +77,80 @@ def parse_opportunities(text: str, prefix: str) -> Dict[str, Dict[str, str]]:
 
     Returns:
         Dict mapping IDs to opportunity data
-        Example: {"H1": {"title": "...", "text": "...", "relevance": "...", "signal": "...", "next_steps": "..."}}
+        Example: {"H1": {"title": "...", "full_text": "...", "relevance": "...", "signal": "...", "next_steps": "..."}}
     """
+    headers = list(_HEADER_RE.finditer(text))
     opportunities = {}
+    for idx, header in enumerate(headers, start=1):
+        end = headers[idx].start() if idx < len(headers) else len(text)
+        opportunities[f"{prefix}{idx}"] = _build_opportunity(text, header.end(), end)
+    return opportunities
+
+class OpportunityStream:
+    """
+    Incremental parser for Strategist output that is still arriving
+
+    feed() returns each opportunity as soon as the next header shows it is
+    complete; close() returns the last one. Results match parse_opportunities()
+    on the concatenated text.
+    """
 
-    # Split by ### Opportunity: headers
-    sections = re.split(r'###\s+Opportunity:\s+', text)
+    def __init__(self, prefix: str):
+        """
+        Args:
+            prefix: 'H' for homelab, 'W' for work
+        """
+        self.prefix = prefix
+        self._buffer = ''
+        self._in_section = False  # False until the first header arrives
+        self._search_from = 0
+        self._count = 0
 
-    # Skip first section (text before first opportunity)
-    for idx, section in enumerate(sections[1:], start=1):
-        opp_id = f"{prefix}{idx}"
+    def _complete(self, end: int) -> Tuple[str, Dict[str, str]]:
+        self._count += 1
+        return f"{self.prefix}{self._count}", _build_opportunity(self._buffer, 0, end)
 
-        # Extract title (first line)
-        lines = section.strip().split('\n')
-        title = lines[0].strip()
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, str]]]:
+        """Add text; returns [(opp_id, opportunity), ...] completed by it"""
+        self._buffer += chunk
+        completed = []
+        while True:
+            header = _HEADER_RE.search(self._buffer, self._search_from)
+            if header is None:
+                break
+            if self._in_section:
+                completed.append(self._complete(header.start()))
+            # Only the current section is kept
+            self._buffer = self._buffer[header.end():]
+            self._in_section = True
+            self._search_from = 0
 
-        # Extract subsections
-        relevance = extract_subsection(section, 'Relevance')
-        signal = extract_subsection(section, 'Signal')
-        next_steps = extract_subsection(section, 'Next Steps')
+        # A header may be split across chunks, so the next search backs up a little
+        self._search_from = max(self._search_from, len(self._buffer) - HEADER_LOOKBACK)
+        if not self._in_section:
+            self._buffer = self._buffer[self._search_from:]
+            self._search_from = 0
+        return completed
 
-        opportunities[opp_id] = {
-            "title": title,
-            "full_text": section.strip(),
-            "relevance": relevance,
-            "signal": signal,
-            "next_steps": next_steps
-        }
+    def close(self) -> List[Tuple[str, Dict[str, str]]]:
+        """End of output; returns the final opportunity, if any"""
+        completed = [self._complete(len(self._buffer))] if self._in_section else []
+        self._buffer = ''
+        self._in_section = False
+        return completed
 
-    return opportunities
+def iter_opportunities(chunks: Iterable[str], prefix: str) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    Yield (opp_id, opportunity) pairs from streamed Strategist output
+
+    Args:
+        chunks: Text fragments in arrival order (e.g. LLM stream deltas)
+        prefix: 'H' for homelab, 'W' for work
+    """
+    stream = OpportunityStream(prefix)
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+    yield from stream.close()
 
 def extract_subsection(text: str, subsection_name: str) -> str:
     """Extract content from **Subsection...:** pattern (flexible name matching).
@@ -85,7 +188,8 @@ def save_opportunity_mapping(
     opportunities: Dict[str, Dict[str, str]],
     digest_date: str,
     digest_message_ts: str = "",
-    output_file: str = None
+    output_file: str = None,
+    store=None
 ) -> str:
     """
     Save opportunity mapping to JSON file for Catalyst reference
@@ -95,10 +199,16 @@ def save_opportunity_mapping(
         digest_date: YYYY-MM-DD
         digest_message_ts: Slack message timestamp (filled in later by n8n)
         output_file: Path to save (default: output/opportunities_{date}.json)
+        store: OpportunityStore to record the digest in; the JSON file is
+            then exported from the store (None writes only the file)
 
     Returns:
         Path to saved file
     """
+    if store is not None:
+        store.save_digest(digest_date, opportunities, digest_message_ts)
+        return store.export_json(digest_date, output_file)
+
     if output_file is None:
         output_file = f"output/opportunities_{digest_date}.json"
 
@@ -157,5 +267,30 @@ if __name__ == "__main__":
     with open(test_file, 'r') as f:
         saved_data = json.load(f)
     print(f"✅ Verified: {len(saved_data['opportunities'])} opportunities in saved file")
+
+    # Single-scan fields must match the per-field regex, and streaming the batch parse
+    print("="*60)
+    print("Single-pass and Streaming Parser Test:")
+    variant_text = test_text + """
+    ### Opportunity: Variant labels
+    **Relevance to Homelab:** Spans
+    two lines
+    **Signal Strength:** High
+    ---
+    **Next Steps:** Prototype **Signal:** not a new field
+    **Note:** trailing bold ends the field
+    """
+    for sample in (test_text, variant_text):
+        parsed = parse_opportunities(sample, 'W')
+        sections = re.split(r'###\s+Opportunity:\s+', sample)[1:]
+        assert len(parsed) == len(sections)
+        for opp, section in zip(parsed.values(), sections):
+            for name, key in FIELD_KEYS.items():
+                assert opp[key] == extract_subsection(section, name), (key, opp[key])
+
+        for size in (1, 7, 64):
+            chunks = [sample[i:i + size] for i in range(0, len(sample), size)]
+            assert dict(iter_opportunities(chunks, 'W')) == parsed, f"stream mismatch at chunk size {size}"
+    print(f"✅ Matches extract_subsection and streams identically at chunk sizes 1/7/64")
     print("\n" + "="*60)
     print("All tests passed! ✅")
@@ -270,7 +270,9 @@ def save_for_n8n_with_opportunities(
         "raw_outputs": {
             "scout": scout_output,
             "analyst": analyst_output
-        }
+        },
+        # Per-stage timings, tokens and cost, when the crew recorded them
+        "telemetry": metadata.get('telemetry')
     }
 
     # Save to file
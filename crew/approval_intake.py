@@ -0,0 +1,657 @@
+#!/usr/bin/env python3
+"""
+Approval Intake
+Receives Slack reply events on a webhook and starts Catalyst jobs as soon as
+an approval arrives, instead of waiting for the n8n poller's next 5-minute run
+
+Replaces the n8n "Approval Poller and Catalyst Trigger" workflow: disable it
+once the Slack app's event subscription (message.channels) points here.
+Both write output/approvals.jsonl, so a reply is never handled twice during
+the switch-over.
+
+Usage:
+    python3 approval_intake.py [--host 127.0.0.1] [--port 8791]
+    python3 approval_intake.py --self-test
+
+Endpoints:
+    GET  /health        -> {"status": "ok", ...}
+    POST /slack/events  Slack Events API callbacks (url_verification and
+                        message events); point the Slack app's Request URL here
+
+Environment (config/.env):
+    SLACK_BOT_TOKEN       Bot token used to post replies into the digest thread
+    SLACK_SIGNING_SECRET  Verifies that events come from Slack (unsigned
+                          requests are accepted only when this is unset)
+    SLACK_DIGEST_CHANNEL  Channel ID the digest is posted to; replies elsewhere
+                          are ignored (default: any channel)
+    SLACK_APPROVER_IDS    Comma-separated user IDs allowed to approve (default: anyone)
+    SLACK_API_URL         Slack Web API base (default: https://slack.com/api)
+"""
+
+import os
+import hmac
+import json
+import time
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from tools.approval_parser import (
+    parse_approval_syntax, validate_against_opportunities, record_decisions, generate_help_message
+)
+from tools.opportunity_store import OpportunityStore
+from tools.job_queue import JobQueue
+from tools.slack_delivery import (
+    DEFAULT_SLACK_API_URL, DELIVERABLE_LABELS, DIGEST_MARKER, SlackClient, SlackError, TokenBucket,
+    deliver_deliverables
+)
+
+DEFAULT_PORT = 8791
+
+# Slack rejects replayed requests older than this
+MAX_REQUEST_AGE_SECONDS = 300
+# Event IDs remembered for Slack's at-least-once redelivery
+SEEN_EVENTS = 1000
+# Replies that are approval commands; all other thread chatter is ignored
+APPROVAL_KEYWORDS = ('approve', 'dismiss')
+
+def verify_signature(signing_secret: str, timestamp: str, body: bytes, signature: str, now: float = None) -> bool:
+    """
+    Check Slack's X-Slack-Signature header
+
+    Args:
+        signing_secret: The Slack app's signing secret
+        timestamp: X-Slack-Request-Timestamp header
+        body: Raw request body
+        signature: X-Slack-Signature header ("v0=<hex>")
+        now: Current time (for tests)
+
+    Returns:
+        True if the signature matches and the request is recent
+    """
+    try:
+        age = abs((now or time.time()) - int(timestamp))
+    except (TypeError, ValueError):
+        return False
+    if age > MAX_REQUEST_AGE_SECONDS:
+        return False
+    basestring = b'v0:' + timestamp.encode('utf-8') + b':' + body
+    expected = 'v0=' + hmac.new(signing_secret.encode('utf-8'), basestring, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature or '')
+
+def format_existing_message(job: Dict[str, Any]) -> str:
+    """Slack text for a re-approved deliverable that was already generated"""
+    _, label = DELIVERABLE_LABELS.get(job['type'], ('📄', 'Deliverable'))
+    deliverable_file = (job['result'] or {}).get('deliverable_file', '')
+    return (f"ℹ️ The {label} for *{job['opp_id']}* was already generated "
+            f"({job['updated_at'][:16].replace('T', ' ')}, `{deliverable_file}`); see it earlier in this thread.")
+
+def run_catalyst(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate one deliverable on the crew worker, or in this process if none is running"""
+    from tools.worker_client import submit_job
+
+    result = submit_job('deliverable', {
+        "digest_date": job['digest_date'],
+        "opportunity": job['opp_id'],
+        "type": job['type'],
+        "use_cache": True,
+        "reply_ts": job['reply_ts']
+    })
+    if result is None:
+        import catalyst
+        result = catalyst.generate_deliverable(
+            job['digest_date'], job['opp_id'], job['type'], reply_ts=job['reply_ts']
+        )
+    return result
+
+class ApprovalIntake:
+    """Turns Slack reply events into opportunity status updates and Catalyst jobs"""
+
+    def __init__(
+        self,
+        store: OpportunityStore = None,
+        queue: JobQueue = None,
+        slack_token: str = None,
+        signing_secret: str = None,
+        digest_channel: str = None,
+        approvers: Iterable[str] = None,
+        slack_api_url: str = DEFAULT_SLACK_API_URL,
+        messages_per_second: float = 1.0,
+        run_deliverable: Callable[[Dict[str, Any]], Dict[str, Any]] = run_catalyst,
+        max_workers: int = 2,
+        approvals_log: str = "output/approvals.jsonl"
+    ):
+        """
+        Args:
+            store: Opportunity store (opened at the default path if None)
+            queue: Catalyst job queue (opened at the default path if None);
+                jobs still queued from before a restart are resumed
+            slack_token: Bot token for replies (None: replies are only printed)
+            signing_secret: Slack signing secret (None: signatures not checked)
+            digest_channel: Channel ID the digest is posted to (None: any channel)
+            approvers: User IDs allowed to approve or dismiss (None: anyone)
+            slack_api_url: Slack Web API base URL (a local fake in tests)
+            messages_per_second: Rate limit for posts into digest threads
+            run_deliverable: Runs one {"digest_date", "opp_id", "type", "reply_ts"}
+                job through the job queue and returns catalyst.generate_deliverable's
+                result dict
+            max_workers: Deliverables generated at once
+            approvals_log: Approval log shared with the n8n poller, whose
+                duplicate check skips replies already handled here
+        """
+        self.store = store or OpportunityStore()
+        self.queue = queue or JobQueue()
+        self.signing_secret = signing_secret
+        self.digest_channel = digest_channel
+        self.approvers = set(approvers) if approvers else None
+        self.slack = SlackClient(slack_token, slack_api_url, TokenBucket(rate=messages_per_second)) if slack_token else None
+        self.run_deliverable = run_deliverable
+        self.approvals_log = approvals_log
+        self.started_at = datetime.now().isoformat()
+        self.stats = {'events': 0, 'replies': 0, 'jobs_queued': 0, 'jobs_done': 0}
+        self._seen_events = OrderedDict()
+        self._lock = threading.Lock()
+        # Replies are handled off the request thread: Slack redelivers any
+        # event not acknowledged within 3 seconds
+        self._replies = ThreadPoolExecutor(max_workers=1)
+        self._jobs = ThreadPoolExecutor(max_workers=max_workers)
+
+        for job in self.queue.pending():
+            if job['context']:
+                print(f"[Intake] Resuming {job['digest_date']} {job['opp_id']} {job['type']}")
+                self._dispatch({
+                    "digest_date": job['digest_date'], "opp_id": job['opp_id'], "type": job['type'],
+                    **job['context'], "received_at": time.monotonic()
+                })
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _first_delivery(self, event_id: str) -> bool:
+        """False for an event ID already received (Slack retries)"""
+        if not event_id:
+            return True
+        with self._lock:
+            if event_id in self._seen_events:
+                return False
+            self._seen_events[event_id] = True
+            if len(self._seen_events) > SEEN_EVENTS:
+                self._seen_events.popitem(last=False)
+        return True
+
+    def handle_event(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Acknowledge one Events API callback, queueing any approval reply
+
+        Returns:
+            Response body for Slack ({"challenge": ...} for url_verification)
+        """
+        if payload.get('type') == 'url_verification':
+            return {"challenge": payload.get('challenge', '')}
+        if payload.get('type') != 'event_callback':
+            return {"ok": True}
+
+        self._count('events')
+        event = payload.get('event') or {}
+        if not self._first_delivery(payload.get('event_id')):
+            return {"ok": True, "duplicate": True}
+        if not self._is_approval_reply(event):
+            return {"ok": True, "ignored": True}
+
+        event['received_at'] = time.monotonic()
+        self._replies.submit(self._process_logged, event)
+        return {"ok": True}
+
+    def _is_approval_reply(self, event: Dict[str, Any]) -> bool:
+        """
+        A human's threaded reply in the digest channel that starts with
+        approve or dismiss (not the digest itself, an edit, a bot post or chatter)
+        """
+        return (
+            event.get('type') == 'message'
+            and not event.get('subtype')
+            and not event.get('bot_id')
+            and bool(event.get('thread_ts'))
+            and event.get('thread_ts') != event.get('ts')
+            and (self.digest_channel is None or event.get('channel') == self.digest_channel)
+            and (event.get('text') or '').strip().lower().startswith(APPROVAL_KEYWORDS)
+            and (self.approvers is None or event.get('user') in self.approvers)
+        )
+
+    def _digest_date(self, channel: str, thread_ts: str) -> Optional[str]:
+        """
+        Digest a thread belongs to, by its recorded Slack ts
+
+        A digest posted by n8n has no ts recorded until its first approval: if
+        that day's digest has none and the thread's parent is a bot-posted
+        digest message, its ts is recorded once. A recorded ts is never replaced.
+        """
+        digest_date = self.store.find_digest(thread_ts)
+        if digest_date or self.slack is None:
+            return digest_date
+
+        posted = datetime.fromtimestamp(float(thread_ts)).strftime('%Y-%m-%d')
+        if not self.store.has_digest(posted):
+            mapping_file = f"output/opportunities_{posted}.json"
+            if not os.path.exists(mapping_file):
+                return None
+            self.store.import_json(mapping_file)
+            digest_date = self.store.find_digest(thread_ts)
+            if digest_date:
+                return digest_date
+
+        try:
+            parent = self.slack.fetch_message(channel, thread_ts)
+        except SlackError as e:
+            print(f"[Intake] Could not look up thread {thread_ts}: {e}")
+            return None
+        if not parent or not parent.get('bot_id') or DIGEST_MARKER not in (parent.get('text') or ''):
+            return None
+        if self.store.set_message_ts(posted, thread_ts, overwrite=False):
+            print(f"[Intake] Recorded {thread_ts} as the {posted} digest")
+            return posted
+        return None
+
+    def _process_logged(self, event: Dict[str, Any]):
+        try:
+            self.process_reply(event)
+        except Exception as e:
+            print(f"[Intake] Failed to process reply {event.get('ts')}: {e}")
+
+    def process_reply(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Parse, validate and act on one approval reply
+
+        Args:
+            event: Slack message event ({"text", "user", "ts", "thread_ts", "channel"})
+
+        Returns:
+            {"digest_date", "action", "queued": [{"opp_id", "type"}, ...],
+             "existing": [...] (already generated or generating), "errors": [...]}
+        """
+        self._count('replies')
+        channel, thread_ts = event.get('channel', ''), event['thread_ts']
+        outcome = {"digest_date": None, "action": None, "queued": [], "existing": [], "errors": []}
+
+        digest_date = self._digest_date(channel, thread_ts)
+        outcome['digest_date'] = digest_date
+        if digest_date is None:
+            # Not a digest thread: ignored without replying
+            outcome['errors'].append(f"No digest found for thread {thread_ts}")
+            return outcome
+
+        parsed = parse_approval_syntax(event.get('text', ''))
+        outcome['action'] = parsed['action']
+        if not parsed['valid']:
+            outcome['errors'] = parsed['errors']
+            self.post_message(channel, generate_help_message(parsed['errors']), thread_ts)
+            return outcome
+
+        validation = validate_against_opportunities(parsed['approvals'], self.store.digest(digest_date))
+        for error in validation['errors']:
+            outcome['errors'].append(error)
+            self.post_message(channel, f"❌ {error}. Please check the opportunity ID and try again.", thread_ts)
+
+        valid_ids = {approval['opp_id'] for approval in validation['validated_approvals']}
+        record_decisions(
+            {**parsed, "approvals": [a for a in parsed['approvals'] if a['opp_id'] in valid_ids]},
+            digest_date,
+            self.store
+        )
+        if parsed['action'] == 'dismiss':
+            for opp_id in sorted(valid_ids):
+                self._log_approval(digest_date, opp_id, 'none', 'dismissed', event)
+            return outcome
+
+        for approval in validation['validated_approvals']:
+            opp_id, deliverable_type = approval['opp_id'], approval['type']
+            context = {"channel": channel, "thread_ts": thread_ts, "reply_ts": event.get('ts', '')}
+            submission = self.queue.submit(digest_date, opp_id, deliverable_type, context['reply_ts'], context)
+            if submission['duplicate_reply']:
+                # This reply was handled before (e.g. redelivered after a restart)
+                continue
+
+            self._log_approval(digest_date, opp_id, deliverable_type, 'approved', event)
+            job = submission['job']
+            if job['state'] == 'done':
+                outcome['existing'].append({"opp_id": opp_id, "type": deliverable_type})
+                self.post_message(channel, format_existing_message(job), thread_ts)
+            elif job['state'] == 'running':
+                # Its runner posts the result when it finishes
+                outcome['existing'].append({"opp_id": opp_id, "type": deliverable_type})
+            else:
+                self._dispatch({
+                    "digest_date": digest_date, "opp_id": opp_id, "type": deliverable_type,
+                    **context, "received_at": event.get('received_at', time.monotonic())
+                })
+                outcome['queued'].append({"opp_id": opp_id, "type": deliverable_type})
+
+        queued = ', '.join(f"{q['opp_id']} {q['type']}" for q in outcome['queued'])
+        print(f"[Intake] {digest_date}: queued {queued or 'nothing'}")
+        return outcome
+
+    def _dispatch(self, job: Dict[str, Any]):
+        self._count('jobs_queued')
+        self._jobs.submit(self._run_job, job)
+
+    def _run_job(self, job: Dict[str, Any]):
+        try:
+            result = self.run_deliverable(job)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        if result.get('deduplicated'):
+            # Another runner claimed the job first and posts its result
+            self._count('jobs_done')
+            return
+        result = {"opportunity_id": job['opp_id'], "deliverable_type": job['type'], **result}
+        if self.slack is None:
+            print(f"[Intake] (no Slack token) {job['opp_id']} {job['type']}: {result.get('deliverable_file') or result.get('error')}")
+        else:
+            # Long deliverables are split into several threaded messages
+            deliver_deliverables(self.slack, job['channel'], job['thread_ts'], [result])
+        self._count('jobs_done')
+
+        latency = time.monotonic() - job['received_at']
+        print(f"[Intake] {job['digest_date']} {job['opp_id']} {job['type']}: "
+              f"{'delivered' if result.get('success') else 'failed'} {latency:.1f}s after the reply")
+
+    def _log_approval(self, digest_date: str, opp_id: str, deliverable_type: str, status: str, event: Dict[str, Any]):
+        """Append to approvals.jsonl in the n8n poller's format"""
+        entry = {
+            'timestamp': datetime.now().isoformat(),
+            'digest_date': digest_date,
+            'opportunity_id': opp_id,
+            'deliverable_type': deliverable_type,
+            'status': status,
+            'slack_user': event.get('user', ''),
+            'slack_message_ts': event.get('ts', '')
+        }
+        directory = os.path.dirname(self.approvals_log)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, open(self.approvals_log, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def post_message(self, channel: str, text: str, thread_ts: str) -> bool:
+        """Post a short note into the digest thread; False if it failed"""
+        if self.slack is None:
+            print(f"[Intake] (no Slack token) reply to {thread_ts}: {text[:200]}")
+            return False
+        try:
+            self.slack.post_message(channel, text=text, thread_ts=thread_ts)
+        except SlackError as e:
+            print(f"[Intake] {e}")
+            return False
+        return True
+
+    def close(self):
+        """Finish queued replies and jobs"""
+        self._replies.shutdown(wait=True)
+        self._jobs.shutdown(wait=True)
+
+def make_handler(intake: ApprovalIntake):
+    """Bind a request handler class to an intake instance"""
+
+    class EventHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if urlparse(self.path).path != '/health':
+                self._send_json(404, {"ok": False, "error": "Not found"})
+                return
+            self._send_json(200, {"status": "ok", "started_at": intake.started_at, **intake.stats})
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/slack/events':
+                self._send_json(404, {"ok": False, "error": "Not found"})
+                return
+
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if intake.signing_secret and not verify_signature(
+                intake.signing_secret,
+                self.headers.get('X-Slack-Request-Timestamp', ''),
+                body,
+                self.headers.get('X-Slack-Signature', '')
+            ):
+                self._send_json(401, {"ok": False, "error": "Invalid signature"})
+                return
+
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                self._send_json(400, {"ok": False, "error": "Request body must be JSON"})
+                return
+            self._send_json(200, intake.handle_event(payload))
+
+        def log_message(self, format, *args):
+            pass
+
+    return EventHandler
+
+def main():
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description='Receive Slack approval replies and start Catalyst jobs')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: localhost only)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--max-workers', type=int, default=2, help='Deliverables generated at once (default: 2)')
+    parser.add_argument('--self-test', action='store_true', help='Run against a local fake Slack and exit')
+    args = parser.parse_args()
+
+    if args.self_test:
+        self_test()
+        return
+
+    # Load environment variables
+    load_dotenv('config/.env')
+
+    approvers = [user.strip() for user in os.getenv('SLACK_APPROVER_IDS', '').split(',') if user.strip()]
+    intake = ApprovalIntake(
+        slack_token=os.getenv('SLACK_BOT_TOKEN'),
+        signing_secret=os.getenv('SLACK_SIGNING_SECRET'),
+        digest_channel=os.getenv('SLACK_DIGEST_CHANNEL') or None,
+        approvers=approvers or None,
+        slack_api_url=os.getenv('SLACK_API_URL', DEFAULT_SLACK_API_URL),
+        max_workers=args.max_workers
+    )
+    if not intake.signing_secret:
+        print("[Intake] WARNING: SLACK_SIGNING_SECRET not set, accepting unsigned events")
+    if not intake.digest_channel:
+        print("[Intake] WARNING: SLACK_DIGEST_CHANNEL not set, accepting replies in any channel")
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(intake))
+    print(f"[Intake] Listening on http://{args.host}:{args.port}/slack/events")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[Intake] Shutting down")
+    finally:
+        server.server_close()
+        intake.close()
+
+def self_test():
+    """A local stand-in posts Slack-shaped events; a fake Slack API records the replies"""
+    import tempfile
+    import urllib.error
+    import urllib.request
+    from statistics import median
+
+    from tools.slack_delivery import FakeSlackServer
+
+    test_dir = tempfile.mkdtemp()
+    slack = FakeSlackServer()
+    posted = slack.messages
+
+    store = OpportunityStore(os.path.join(test_dir, 'opportunities.db'))
+    digest_ts = '1770000000.000100'
+    store.save_digest('2026-02-02', {
+        'H1': {'title': 'Local LLM Fine-tuning'},
+        'W1': {'title': 'Code Review Patterns'},
+        'W2': {'title': 'Agent Evaluation'},
+    }, digest_ts)
+
+    queue = JobQueue(os.path.join(test_dir, 'jobs.db'))
+    generated = []
+
+    def fake_catalyst(job):
+        # Same queue bookkeeping as catalyst.generate_deliverable
+        if not queue.claim(job['digest_date'], job['opp_id'], job['type']):
+            return {**queue.wait(job['digest_date'], job['opp_id'], job['type'], poll=0.01)['result'], "deduplicated": True}
+        generated.append(job['opp_id'])
+        time.sleep(0.05)
+        result = {"success": True, "deliverable_content": f"{job['type']} body", "opportunity_title": job['opp_id'],
+                  "deliverable_file": f"output/catalyst_{job['digest_date']}_{job['opp_id']}_{job['type']}.json"}
+        queue.complete(job['digest_date'], job['opp_id'], job['type'], result)
+        return result
+
+    intake = ApprovalIntake(
+        store=store,
+        queue=queue,
+        slack_token='xoxb-test',
+        signing_secret='shh',
+        digest_channel='C1',
+        approvers=['U123'],
+        slack_api_url=slack.url, messages_per_second=50,
+        run_deliverable=fake_catalyst,
+        approvals_log=os.path.join(test_dir, 'approvals.jsonl')
+    )
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(intake))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/slack/events"
+
+    def send(payload, secret='shh'):
+        body = json.dumps(payload).encode('utf-8')
+        timestamp = str(int(time.time()))
+        signature = 'v0=' + hmac.new(secret.encode(), b'v0:' + timestamp.encode() + b':' + body, hashlib.sha256).hexdigest()
+        request = urllib.request.Request(url, data=body, method='POST', headers={
+            'Content-Type': 'application/json', 'X-Slack-Request-Timestamp': timestamp, 'X-Slack-Signature': signature
+        })
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def reply(event_id, text, ts, user='U123', **extra):
+        return {"type": "event_callback", "event_id": event_id, "event": {
+            "type": "message", "channel": "C1", "user": user, "text": text,
+            "ts": ts, "thread_ts": digest_ts, **extra
+        }}
+
+    def make_intake(**overrides):
+        return ApprovalIntake(**{
+            "store": store, "queue": queue, "slack_token": 'xoxb-test', "signing_secret": 'shh',
+            "digest_channel": 'C1', "approvers": ['U123'], "slack_api_url": slack.url,
+            "messages_per_second": 50, "run_deliverable": fake_catalyst,
+            "approvals_log": os.path.join(test_dir, 'approvals.jsonl'), **overrides
+        })
+
+    def wait_for(count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while len(posted) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return len(posted) >= count
+
+    assert send({"type": "url_verification", "challenge": "abc"}) == (200, {"challenge": "abc"})
+    assert send(reply('Ev0', 'approve H1', '1770000100.1'), secret='wrong')[0] == 401
+
+    latencies = []
+    for i, text in enumerate(['approve H1', 'approve W1 brief', 'approve W2 slide']):
+        start = time.monotonic()
+        assert send(reply(f"Ev{i + 1}", text, f"17700001{i}0.1"))[0] == 200
+        assert wait_for(i + 1)
+        latencies.append(time.monotonic() - start)
+    print(f"Approval -> deliverable posted: median {median(latencies) * 1000:.0f} ms")
+    assert median(latencies) < 2
+    assert posted[0]['thread_ts'] == digest_ts and posted[0]['text'].startswith('🔧 *Technical Plan for [H1]')
+    assert store.get_status('2026-02-02', 'W1') == 'approved'
+
+    # Slack redelivery, bots, other users, top-level messages: no new jobs
+    assert send(reply('Ev1', 'approve H1', '1770000100.1'))[1].get('duplicate')
+    assert send(reply('Ev9', 'approve H1', '1770000900.1', bot_id='B1'))[1].get('ignored')
+    assert send(reply('Ev10', 'approve H1', '1770001000.1', user='U999'))[1].get('ignored')
+    assert send(reply('Ev11', 'approve H1', digest_ts))[1].get('ignored')
+
+    # Bad syntax and unknown IDs get a help reply in the thread; dismiss updates status only
+    send(reply('Ev12', 'approve H1 slide', '1770001200.1'))
+    send(reply('Ev13', 'approve H9', '1770001300.1'))
+    send(reply('Ev14', 'dismiss W2', '1770001400.1'))
+    assert wait_for(5)
+    intake.close()
+    assert "Invalid approval syntax" in posted[3]['text'] and "H9 not found" in posted[4]['text']
+    assert store.get_status('2026-02-02', 'W2') == 'dismissed'
+    assert intake.stats['jobs_queued'] == intake.stats['jobs_done'] == 3 and len(posted) == 5
+
+    # After a restart the same reply arrives again under a new event ID: nothing reruns or reposts.
+    # Approving an existing deliverable again gets a pointer to it instead of a new generation.
+    intake = make_intake()
+    server.RequestHandlerClass = make_handler(intake)
+    send(reply('Ev20', 'approve H1', '1770000100.1'))
+    send(reply('Ev21', 'approve W1 brief', '1770002100.1'))
+    assert wait_for(6)
+    intake.close()
+    assert generated == ['H1', 'W1', 'W2'] and len(posted) == 6
+    assert posted[5]['text'].startswith('ℹ️ The Leadership Brief for *W1* was already generated')
+
+    # Concurrent re-approvals of a new deliverable: generated and posted once
+    store.save_digest('2026-02-02', {**store.get_digest('2026-02-02'), 'H2': {'title': 'Proxmox Backup'}})
+    intake = make_intake(signing_secret=None)
+    for i in range(3):
+        intake.process_reply(reply(f"Ev3{i}", 'approve H2', f"17700030{i}0.1")['event'])
+    intake.close()
+    assert generated.count('H2') == 1 and sum('[H2]' in p['text'] for p in posted) == 1
+
+    with open(os.path.join(test_dir, 'approvals.jsonl')) as f:
+        logged = [json.loads(line) for line in f]
+    assert [(e['opportunity_id'], e['status']) for e in logged] == [
+        ('H1', 'approved'), ('W1', 'approved'), ('W2', 'approved'), ('W2', 'dismissed'),
+        ('W1', 'approved'), ('H2', 'approved'), ('H2', 'approved'), ('H2', 'approved')
+    ]
+
+    # Replies in other channels, other threads or that are not commands: ignored silently
+    intake = make_intake()
+    server.RequestHandlerClass = make_handler(intake)
+    other_thread = {"thread_ts": '1770000500.000100'}
+    slack.messages.append({"channel": "C1", "ts": '1770000500.000100', "user": "U555", "text": "Lunch?"})
+    before = len(posted)
+    assert send(reply('Ev40', 'thanks', '1770004000.1', channel='C_OTHER', **other_thread))[1].get('ignored')
+    assert send(reply('Ev41', 'approve H1', '1770004100.1', channel='C_OTHER'))[1].get('ignored')
+    assert send(reply('Ev42', 'thanks, looks great', '1770004200.1'))[1].get('ignored')
+    # A command under a non-digest thread in the digest channel does not rebind the digest
+    outcome = intake.process_reply(reply('Ev43', 'approve H1', '1770004300.1', **other_thread)['event'])
+    assert outcome['digest_date'] is None and store.find_digest(digest_ts) == '2026-02-02'
+
+    # A digest n8n posted (no ts recorded yet): bound once, to the bot's digest message only
+    n8n_ts = '1770200000.000100'
+    n8n_date = datetime.fromtimestamp(float(n8n_ts)).strftime('%Y-%m-%d')
+    store.save_digest(n8n_date, {'H1': {'title': 'Tailscale ACLs'}})
+    slack.messages.append({"channel": "C1", "ts": n8n_ts, "bot_id": "B1", "text": "📊 *Strategic Intelligence Digest*\n..."})
+    slack.messages.append({"channel": "C1", "ts": '1770200100.000100', "bot_id": "B1", "text": "📊 *Strategic Intelligence Digest*\n..."})
+    assert intake.process_reply(reply('Ev44', 'approve H1', '1770200050.1', thread_ts=n8n_ts)['event'])['queued']
+    assert store.find_digest(n8n_ts) == n8n_date
+    assert intake.process_reply(reply('Ev45', 'approve H1', '1770200150.1', thread_ts='1770200100.000100')['event'])['digest_date'] is None
+    assert store.find_digest(n8n_ts) == n8n_date
+    intake.close()
+    assert len(posted) == before + 3 and posted[-1]['thread_ts'] == n8n_ts, "only the n8n digest's deliverable is posted"
+
+    server.shutdown()
+    slack.close()
+    print("All tests passed! ✅")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Hot Path Benchmark
+Times the deterministic (non-LLM) digest code on synthetic corpora of
+10/100/1000/10000 entries/opportunities and on the recorded feed fixtures,
+and compares each result against stored baselines
+
+Covered: feed parsing (feed_stream.iter_entries), SourceFetcher.format_for_scout,
+opportunity_parser.parse_opportunities / iter_opportunities (streamed) /
+extract_subsection,
+approval_parser.parse_approval_syntax and
+slack_formatter.format_for_slack_with_opportunities.
+
+Usage (from /opt/crewai):
+    python3 benchmarks/hot_paths.py                 # run and compare with baselines
+    python3 benchmarks/hot_paths.py --save          # record new baselines
+    python3 benchmarks/hot_paths.py --sizes 10 100  # quicker subset
+
+Each case is compared in units of a fixed pure-Python reference workload
+timed right before it, so a slower or busier host does not read as a
+regression. Exits 1 if any case is slower than its baseline by more than
+--tolerance, so it can gate a deploy ahead of the 6 AM run. Record
+baselines on the host that runs the check.
+"""
+
+import os
+import re
+import sys
+import json
+import random
+import argparse
+import platform
+import importlib
+import importlib.util
+import timeit
+from datetime import datetime
+
+CREW_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(CREW_ROOT, 'benchmarks', 'baselines.json')
+FEED_FIXTURES = os.path.join(CREW_ROOT, 'tools', 'fixtures', 'feeds')
+
+SIZES = [10, 100, 1000, 10000]
+
+# Deployed these live in tools/; in the source tree they are kept elsewhere
+MODULE_SOURCES = {
+    'opportunity_parser': os.path.join(CREW_ROOT, '..', 'claude-session', 'opportunity_parser.py'),
+    'slack_formatter': os.path.join(CREW_ROOT, '..', 'claude-session', 'slack_formatter_updated.py'),
+    'approval_parser': os.path.join(CREW_ROOT, '..', 'tools', 'approval_parser.py'),
+}
+
+TOPICS = ["local inference", "agent evaluation", "MCP servers", "prompt caching", "vector search",
+          "quantized models", "GPU passthrough", "workflow automation", "structured output", "code review agents"]
+WORDS = ("the a new model tool release workflow team latency cost context agent pipeline homelab "
+         "cluster benchmark adoption practitioners open source self-hosted inference").split()
+
+def load_module(name):
+    """Import tools.<name>, falling back to its source-tree location; None if neither exists"""
+    try:
+        return importlib.import_module(f"tools.{name}")
+    except ImportError:
+        pass
+    path = MODULE_SOURCES.get(name)
+    if not path or not os.path.exists(path):
+        return None
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered first: slack_formatter falls back to `from opportunity_parser import ...`
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# === Synthetic corpora (seeded, so every run times the same input) ===
+
+def sentence(rng, words=14):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+def make_entries(count, seed=1):
+    from tools.entry import Entry
+
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        summary = ' '.join(sentence(rng) for _ in range(rng.randint(2, 30)))
+        entries.append(Entry(
+            source=f"Source {i % 8}",
+            guid=f"guid-{i}",
+            title=f"{rng.choice(TOPICS).title()} update {i}",
+            link=f"https://example.com/posts/{i}",
+            summary=summary,
+            published=f"2026-02-{1 + i % 28:02d}T09:00:00",
+            content=summary
+        ))
+    return entries
+
+def make_strategist_output(count, seed=2):
+    rng = random.Random(seed)
+    parts = ["Reviewing today's signals against the documented context.\n\n"]
+    for i in range(count):
+        parts.append(
+            f"### Opportunity: {rng.choice(TOPICS).title()} experiment {i + 1}\n"
+            f"**Relevance:** {sentence(rng, 25)}\n"
+            f"**Signal:** {sentence(rng, 18)}\n"
+            f"**Next Steps:** {sentence(rng, 20)}\n"
+            f"{sentence(rng, 10)}\n\n"
+        )
+    return ''.join(parts)
+
+def make_approval_reply(count, seed=3):
+    rng = random.Random(seed)
+    items = [f"H{i + 1}" if rng.random() < 0.5 else f"W{i + 1} {rng.choice(['brief', 'slide'])}" for i in range(count)]
+    return "approve " + ', '.join(items)
+
+def make_opportunities(count, prefix, seed=4):
+    rng = random.Random(seed)
+    return {
+        f"{prefix}{i + 1}": {
+            'title': f"{rng.choice(TOPICS).title()} experiment {i + 1}",
+            'full_text': sentence(rng, 60),
+            'relevance': sentence(rng, 25),
+            'signal': sentence(rng, 18),
+            'next_steps': sentence(rng, 20)
+        }
+        for i in range(count)
+    }
+
+def load_fixture_entries():
+    """Every entry of the recorded feeds, as the fetcher would hand them on"""
+    from tools.entry import Entry
+    from tools.feed_stream import iter_entries
+
+    entries = []
+    for name in sorted(os.listdir(FEED_FIXTURES)):
+        with open(os.path.join(FEED_FIXTURES, name), 'rb') as f:
+            for item in iter_entries(f):
+                published = item['published'] or item['updated']
+                entries.append(Entry(
+                    name, item['guid'], item['title'], item['link'], item['summary'],
+                    published.isoformat() if published else 'Unknown', item['content']
+                ))
+    return entries
+
+# === Cases: name -> (module names needed, setup(size) -> zero-arg callable) ===
+
+def feed_parse_case(_size):
+    from tools.feed_stream import iter_entries
+
+    documents = []
+    for name in sorted(os.listdir(FEED_FIXTURES)):
+        with open(os.path.join(FEED_FIXTURES, name), 'rb') as f:
+            documents.append(f.read())
+
+    def run():
+        import io
+        for document in documents:
+            for _ in iter_entries(io.BytesIO(document)):
+                pass
+    return run
+
+def format_for_scout_case(size):
+    from tools.source_fetcher import SourceFetcher
+
+    fetcher = SourceFetcher()
+    entries = load_fixture_entries() if size is None else make_entries(size)
+    return lambda: fetcher.format_for_scout(entries)
+
+def parse_opportunities_case(size):
+    parser = load_module('opportunity_parser')
+    text = make_strategist_output(size)
+    return lambda: parser.parse_opportunities(text, 'H')
+
+def iter_opportunities_case(size):
+    parser = load_module('opportunity_parser')
+    text = make_strategist_output(size)
+    # Roughly the size of LLM stream deltas
+    chunks = [text[i:i + 64] for i in range(0, len(text), 64)]
+    return lambda: list(parser.iter_opportunities(chunks, 'H'))
+
+def extract_subsection_case(size):
+    parser = load_module('opportunity_parser')
+    sections = re.split(r'###\s+Opportunity:\s+', make_strategist_output(size))[1:]
+
+    def run():
+        for section in sections:
+            for name in ('Relevance', 'Signal', 'Next Steps'):
+                parser.extract_subsection(section, name)
+    return run
+
+def approval_case(size):
+    parser = load_module('approval_parser')
+    reply = make_approval_reply(size)
+    return lambda: parser.parse_approval_syntax(reply)
+
+def slack_format_case(size):
+    formatter = load_module('slack_formatter')
+    homelab = make_opportunities(size // 2, 'H')
+    work = make_opportunities(size - size // 2, 'W')
+    scout = make_strategist_output(5)
+    metadata = {'timestamp': '2026-02-02 06:00:00', 'sources_count': 5, 'signals_count': size}
+    return lambda: formatter.format_for_slack_with_opportunities(scout, scout, homelab, work, metadata)
+
+# size None = recorded feed fixtures only
+CASES = {
+    'feed_stream.iter_entries': ([], feed_parse_case, [None]),
+    'format_for_scout': ([], format_for_scout_case, [None] + SIZES),
+    'parse_opportunities': (['opportunity_parser'], parse_opportunities_case, SIZES),
+    'iter_opportunities': (['opportunity_parser'], iter_opportunities_case, SIZES),
+    'extract_subsection': (['opportunity_parser'], extract_subsection_case, SIZES),
+    'parse_approval_syntax': (['approval_parser'], approval_case, SIZES),
+    'format_for_slack_with_opportunities': (['opportunity_parser', 'slack_formatter'], slack_format_case, SIZES),
+}
+
+def reference_workload():
+    """Fixed mix of string building, regex and dict work (the cost unit cases are compared in)"""
+    text = ' '.join(f"word{i % 97}" for i in range(2000))
+    counts = {}
+    for word in re.findall(r'\w+', text):
+        counts[word] = counts.get(word, 0) + 1
+    return ''.join(sorted(counts))
+
+def time_case(func, repeat):
+    """Best per-call seconds over `repeat` runs of an auto-sized loop (~0.2s each)"""
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=loops)) / loops
+
+def measure(func, repeat):
+    """(per-call seconds, per-call time in reference-workload units)"""
+    reference = time_case(reference_workload, repeat)
+    seconds = time_case(func, repeat)
+    return seconds, seconds / reference
+
+def size_label(size):
+    return 'fixtures' if size is None else str(size)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the non-LLM digest hot paths')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='Synthetic corpus sizes to run')
+    parser.add_argument('--repeat', type=int, default=7, help='Timing runs per case (best reported)')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Allowed slowdown over baseline before failing (0.5 = 50%%)')
+    parser.add_argument('--save', action='store_true', help=f'Record results as the new baselines ({BASELINE_FILE})')
+    args = parser.parse_args()
+
+    # Modules use relative paths (config/, cache/), so run from the crew root
+    os.chdir(CREW_ROOT)
+    sys.path.insert(0, CREW_ROOT)
+
+    baselines = {}
+    if os.path.exists(BASELINE_FILE) and not args.save:
+        with open(BASELINE_FILE, 'r') as f:
+            baseline_data = json.load(f)
+        baselines = baseline_data['results']
+        if baseline_data.get('machine') != platform.node():
+            print(f"[Benchmark] Note: baselines were recorded on '{baseline_data.get('machine')}'")
+
+    print("=" * 92)
+    print("HOT PATH BENCHMARK")
+    print("=" * 92)
+    print(f"{'case':38s} {'size':>8s} {'per call':>12s} {'relative':>10s} {'baseline':>10s} {'change':>8s}")
+
+    results = {}
+    regressions = []
+    for name, (modules, setup, case_sizes) in CASES.items():
+        missing = [m for m in modules if load_module(m) is None]
+        if missing:
+            print(f"{name:38s} skipped ({', '.join(missing)} not found)")
+            continue
+
+        for size in case_sizes:
+            if size is not None and size not in args.sizes:
+                continue
+            func = setup(size)
+            label = size_label(size)
+            seconds, relative = measure(func, args.repeat)
+
+            baseline = baselines.get(name, {}).get(label, {}).get('relative')
+            if baseline and relative / baseline - 1 > args.tolerance:
+                # Only report a slowdown that reproduces (shared hosts are noisy)
+                seconds, relative = min((seconds, relative), measure(func, args.repeat), key=lambda r: r[1])
+            results.setdefault(name, {})[label] = {'seconds': seconds, 'relative': relative}
+
+            change = ''
+            if baseline:
+                ratio = relative / baseline - 1
+                change = f"{ratio:+7.0%}"
+                if ratio > args.tolerance:
+                    regressions.append(f"{name} [{label}]: {relative:.2f} vs {baseline:.2f} reference units")
+                    change += ' !'
+            baseline_text = f"{baseline:10.2f}" if baseline else f"{'-':>10s}"
+            print(f"{name:38s} {label:>8s} {seconds * 1e3:9.3f} ms {relative:10.2f} {baseline_text} {change:>8s}")
+
+    print("=" * 92)
+
+    if args.save:
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump({
+                'recorded_at': datetime.now().isoformat(timespec='seconds'),
+                'machine': platform.node(),
+                'python': platform.python_version(),
+                'results': results
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"[Benchmark] Baselines saved to {BASELINE_FILE}")
+        return
+
+    if regressions:
+        print(f"[Benchmark] {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for regression in regressions:
+            print(f"   {regression}")
+        sys.exit(1)
+    if baselines:
+        print(f"[Benchmark] No regressions beyond {args.tolerance:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures entry-point startup cost for trivial invocations (--help, argument
+errors) using wall-clock timing and `python -X importtime`
+
+Usage (from /opt/crewai):
+    python3 benchmarks/startup.py [--runs 5] [--top 10]
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import time
+
+# Trivial invocations n8n can trigger; none of them should load crewai
+CASES = [
+    ("crew.py --help", ["crew.py", "--help"]),
+    ("catalyst.py --help", ["catalyst.py", "--help"]),
+    ("catalyst.py bad date", ["catalyst.py", "--digest-date", "yesterday", "--opportunity", "H1", "--type", "plan"]),
+    ("catalyst.py bad type", ["catalyst.py", "--digest-date", "2026-02-02", "--opportunity", "W1", "--type", "deck"]),
+]
+
+def time_invocation(args, runs):
+    """Median wall time in ms of running `python args` from the crew root"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, capture_output=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def slowest_imports(args, top):
+    """Top imports by cumulative time (us) from -X importtime"""
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + args, capture_output=True, text=True)
+    imports = []
+    for line in proc.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((int(cumulative), name.rstrip()))
+    imports.sort(reverse=True)
+    return imports[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark entry-point startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per case (median reported)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list per case')
+    args = parser.parse_args()
+
+    # Entry points use relative paths (config/, tools/), so run from the crew root
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    print("=" * 70)
+    print("STARTUP BENCHMARK")
+    print("=" * 70)
+
+    for label, case_args in CASES:
+        if not os.path.exists(case_args[0]):
+            print(f"\n{label}: skipped ({case_args[0]} not found)")
+            continue
+
+        median_ms = time_invocation(case_args, args.runs)
+        print(f"\n{label}: {median_ms:.0f} ms (median of {args.runs})")
+        for cumulative_us, name in slowest_imports(case_args, args.top):
+            print(f"   {cumulative_us / 1000:8.1f} ms  {name}")
+
+    print("\n" + "=" * 70)
+
+if __name__ == "__main__":
+    main()
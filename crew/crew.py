@@ -1,46 +1,29 @@
 #!/usr/bin/env python3
 """
-CrewAI Strategic Intelligence Crew - Criterion 2: Minimal Viable Crew
-Scout + Analyst agents for trend monitoring
+CrewAI Strategic Intelligence Crew - Criterion 5
+Scout + Analyst + Homelab Strategist + Work Strategist + Slack Formatting
+
+Stages run as a DAG: fetch -> Scout -> Analyst -> {Homelab, Work} -> format
+-> deliver, with the two Strategists running concurrently.
+
+Runs the digest through the resident crew worker (worker.py) when one is
+listening, otherwise in this process.
 """
 
 import os
-import yaml
+import json
+import time
+import argparse
+import traceback
 from datetime import datetime
-from dotenv import load_dotenv
-from crewai import Agent, Task, Crew, Process
-from tools.source_fetcher import SourceFetcher
-
-# Load environment variables
-load_dotenv('config/.env')
-
-# Initialize source fetcher (24 hours for initial test)
-fetcher = SourceFetcher(lookback_hours=24)
-
-# Load source configuration
-with open('config/sources.yaml', 'r') as f:
-    config = yaml.safe_load(f)
-
-# Fetch content from all active sources
-print("[Crew] Fetching content from sources...")
-all_entries = []
-for source in config['sources']:
-    if source['active'] and source['type'] == 'rss':
-        entries = fetcher.fetch_rss(source['url'], source['name'])
-        all_entries.extend(entries[:5])  # Limit to 5 entries per source
-
-# Limit total entries to 15 for manageable context
-all_entries = all_entries[:15]
-
-# Format for Scout
-source_content = fetcher.format_for_scout(all_entries)
-print(f"[Crew] Fetched {len(all_entries)} total entries (limited for test)\n")
-
-# === SCOUT AGENT ===
-scout = Agent(
-    role='Trend Scout',
-    goal='Monitor AI/automation/homelab sources and tag signals by significance',
-    backstory="""You are an experienced technology scout with deep expertise in 
+from typing import Any, Dict
+from tools.worker_client import submit_job
+
+# crewai, feedparser, yaml and dotenv are imported inside the functions that
+# need them: a job handed to the crew worker (or a --help / argument error)
+# never pays their import cost
+
+SCOUT_BACKSTORY = """You are an experienced technology scout with deep expertise in 
     AI tooling, automation, and homelab systems. You excel at filtering signal 
     from noise and recognizing when a development is truly significant versus 
     just incremental progress.
@@ -53,32 +36,220 @@ scout = Agent(
     ⚪ NOISE - Logged for context but not immediately relevant
     
     You focus on: practical tools, adoption patterns, workflow changes, 
-    new capabilities that solve real problems.""",
-    verbose=True,
-    allow_delegation=False,
-    llm='claude-3-haiku-20240307'
-)
-
-# === ANALYST AGENT ===
-analyst = Agent(
-    role='Pattern Analyst',
-    goal='Synthesize patterns across Scout signals and identify emerging themes',
-    backstory="""You are a strategic analyst who excels at connecting dots 
+    new capabilities that solve real problems."""
+
+ANALYST_BACKSTORY = """You are a strategic analyst who excels at connecting dots 
     across disparate signals. You see patterns before they become obvious. 
     You think in terms of implications, not just features.
     
     Your job is to take the Scout's tagged signals and synthesize them into 
     insights. You look for convergence, contradictions, gaps, and acceleration.
     
-    You write analysis that is concise, opinionated, and actionable.""",
-    verbose=True,
-    allow_delegation=False,
-    llm='claude-3-haiku-20240307'
-)
+    You write analysis that is concise, opinionated, and actionable."""
+
+HOMELAB_BACKSTORY = """You are a strategic advisor focused on homelab infrastructure and 
+    self-hosted systems. You understand the constraints of home hardware, the value 
+    of local-first architectures, and the balance between experimentation and stability.
+    
+    You excel at recognizing when a new trend, tool, or technique could:
+    - Solve an existing homelab pain point
+    - Enable a new capability worth exploring
+    - Connect to active learning goals or projects
+    - Improve reliability, observability, or maintainability
+    
+    You are selective and practical. Not every signal is actionable. You focus on 
+    opportunities that are:
+    - Achievable with consumer hardware and reasonable effort
+    - Aligned with current projects or clear next steps
+    - Worth the complexity/maintenance tradeoff
+    
+    When you identify an opportunity, you explain the specific connection to Kyle's 
+    homelab context and suggest a concrete next action."""
+
+WORK_BACKSTORY = """You are a strategic advisor for a Director of Experience Strategy 
+    at a consulting company. You understand the pressures of digital transformation, 
+    the challenge of integrating AI into creative work, and the importance of 
+    balancing efficiency with differentiation.
+    
+    You excel at recognizing when a trend, tool, or capability could:
+    - Solve a current client or team challenge
+    - Create competitive differentiation in client work
+    - Upskill the team without disrupting productivity
+    - Provide leadership visibility and alignment opportunities
+    - Enable rapid prototyping or vibecoding workflows
+    
+    You are highly selective. Most signals won't be work-relevant. You focus on:
+    - Tools/techniques gaining practitioner adoption (not just hype)
+    - Capabilities that solve documented problems or priorities
+    - Approaches that balance human creativity with AI efficiency
+    - Opportunities Kyle can actually influence or advocate for
+    
+    When you identify an opportunity, you connect it specifically to documented 
+    projects, hot topics, or strategic priorities, and suggest how to leverage it."""
+
+# Estimated tokens of archive context (briefs, transcripts, ...) per Strategist
+STRATEGIST_CONTEXT_TOKENS = 6000
+
+STRATEGIST_EXPECTED_OUTPUT = "Structured opportunities with ### Opportunity: headers containing Relevance, Signal, and Next Steps, or explicit no-opportunity statement"
+
+def load_config(path: str = 'config/sources.yaml') -> Dict[str, Any]:
+    """Load source configuration"""
+    import yaml
+
+    with open(path, 'r') as f:
+        return yaml.safe_load(f)
+
+def create_fetcher(config: Dict[str, Any]):
+    """Create a SourceFetcher from the 'fetch' config section"""
+    from tools.source_fetcher import SourceFetcher
+    from tools.seen_index import SeenIndex
+
+    fetch_config = config.get('fetch', {})
+
+    # Incremental mode: skip entries already analyzed in earlier runs
+    seen_index = None
+    if fetch_config.get('seen_index'):
+        seen_index = SeenIndex(fetch_config['seen_index'], fetch_config.get('seen_retention_days', 30))
+
+    # 24 hours for initial test
+    return SourceFetcher(
+        lookback_hours=24,
+        timeout=fetch_config.get('timeout', 30),
+        validator_cache=fetch_config.get('validator_cache'),
+        seen_index=seen_index,
+        retries=fetch_config.get('retries', 3),
+        time_budget=fetch_config.get('time_budget', 90)
+    )
+
+def build_agents() -> Dict[str, Any]:
+    """Construct the Scout, Analyst and Strategist agents"""
+    from crewai import Agent
+
+    # === SCOUT AGENT ===
+    scout = Agent(
+        role='Trend Scout',
+        goal='Monitor AI/automation/homelab sources and tag signals by significance',
+        backstory=SCOUT_BACKSTORY,
+        verbose=True,
+        allow_delegation=False,
+        llm='claude-3-haiku-20240307'
+    )
+
+    # === ANALYST AGENT ===
+    analyst = Agent(
+        role='Pattern Analyst',
+        goal='Synthesize patterns across Scout signals and identify emerging themes',
+        backstory=ANALYST_BACKSTORY,
+        verbose=True,
+        allow_delegation=False,
+        llm='claude-3-haiku-20240307'
+    )
+
+    # === HOMELAB STRATEGIST AGENT ===
+    homelab_strategist = Agent(
+        role='Homelab Strategist',
+        goal='Evaluate trend signals for relevance to Kyle\'s homelab projects and learning goals',
+        backstory=HOMELAB_BACKSTORY,
+        verbose=True,
+        allow_delegation=False,
+        llm='claude-sonnet-4-5-20250929'
+    )
+
+    # === WORK STRATEGIST AGENT ===
+    work_strategist = Agent(
+        role='Work Strategist',
+        goal='Evaluate trend signals for relevance to Kyle\'s work projects, leadership priorities, and strategic goals',
+        backstory=WORK_BACKSTORY,
+        verbose=True,
+        allow_delegation=False,
+        llm='claude-sonnet-4-5-20250929'
+    )
+
+    return {
+        'scout': scout,
+        'analyst': analyst,
+        'homelab_strategist': homelab_strategist,
+        'work_strategist': work_strategist
+    }
+
+def fetch_stage(config, fetcher, telemetry):
+    """Fetch, dedup, rank and pack source entries for the Scout"""
+    from tools.dedup import deduplicate
+    from tools.relevance import build_query, select_top_k
+
+    fetch_config = config.get('fetch', {})
+    selection_config = config.get('selection', {})
+
+    print("[Crew] Fetching content from sources...")
+    active_sources = [s for s in config['sources'] if s['active'] and s['type'] in ('rss', 'web')]
+    all_entries = []
+    fetched = fetcher.fetch_all(
+        active_sources,
+        max_workers=fetch_config.get('max_workers', 8),
+        per_host_limit=fetch_config.get('per_host_limit', 2)
+    )
+    for source, entries in zip(active_sources, fetched):
+        all_entries.extend(entries)
+        telemetry.record_span(
+            f"fetch:{source['name']}", 'fetch', fetcher.source_seconds.get(source['name'], 0.0),
+            status=fetcher.source_status.get(source['name']), entries=len(entries)
+        )
 
-# === SCOUT TASK ===
-scout_task = Task(
-    description=f"""Analyze the following content from AI/automation/homelab sources.
+    http_stats = fetcher.session.stats
+    print(f"[Crew] HTTP: {http_stats['requests']} requests over {http_stats['connections_opened']} connections, "
+          f"{http_stats['bytes_received'] // 1024} KB received, {http_stats['retries']} retries")
+
+    unchanged_sources = [name for name, status in fetcher.source_status.items() if status == 'unchanged']
+    if unchanged_sources:
+        print(f"[Crew] Unchanged since last run: {', '.join(unchanged_sources)}")
+
+    # Collapse the same story reported by several sources before selection
+    fetched_count = len(all_entries)
+    with telemetry.span('dedup', 'select', entries=fetched_count):
+        all_entries = deduplicate(all_entries)
+    if len(all_entries) < fetched_count:
+        print(f"[Crew] Collapsed {fetched_count - len(all_entries)} near-duplicate entries")
+
+    # Keep the most relevant entries for manageable context
+    relevance_query = build_query(
+        [s['category'] for s in config['sources'] if s['active']],
+        selection_config.get('interest_areas')
+    )
+    with telemetry.span('rank', 'select', entries=len(all_entries)):
+        all_entries = select_top_k(
+            all_entries,
+            relevance_query,
+            max_entries=selection_config.get('max_entries', 15),
+            per_source_limit=selection_config.get('per_source_limit', 5)
+        )
+
+    # Format for Scout within the prompt token budget
+    with telemetry.span('pack', 'prompt', entries=len(all_entries)):
+        source_content, pack_manifest = fetcher.pack_for_scout(
+            all_entries, selection_config.get('prompt_token_budget', 6000)
+        )
+    all_entries = [all_entries[item['index']] for item in pack_manifest if item['status'] != 'dropped']
+    truncated_count = sum(1 for item in pack_manifest if item['status'] == 'truncated')
+    dropped_count = sum(1 for item in pack_manifest if item['status'] == 'dropped')
+    print(f"[Crew] Selected {len(all_entries)} of {fetched_count} fetched entries by relevance "
+          f"({truncated_count} truncated, {dropped_count} dropped for token budget)\n")
+
+    return {
+        # Plain dicts from here on: the stage result is checkpointed as JSON
+        'entries': [entry.to_dict() for entry in all_entries],
+        'source_content': source_content,
+        'unchanged_sources': unchanged_sources
+    }
+
+def scout_stage(agents, source_content, response_cache, telemetry):
+    """Tag signals in the fetched content"""
+    from crewai import Task, Crew, Process
+    from tools.prompt_packer import estimate_tokens
+    from tools.response_cache import kickoff_cached
+
+    prompt_start = time.perf_counter()
+    scout_task = Task(
+        description=f"""Analyze the following content from AI/automation/homelab sources.
     Identify and tag signals by significance level.
     
     CONTENT TO ANALYZE:
@@ -100,13 +271,32 @@ scout_task = Task(
     ## ⚪ Noise (Context Only)
     [List noise signals briefly]
     """,
-    agent=scout,
-    expected_output="Tagged signals organized by significance level with descriptions"
-)
+        agent=agents['scout'],
+        expected_output="Tagged signals organized by significance level with descriptions"
+    )
+
+    telemetry.record_span(
+        'scout', 'prompt', time.perf_counter() - prompt_start, tokens=estimate_tokens(scout_task.description)
+    )
 
-# === ANALYST TASK ===
-analyst_task = Task(
-    description="""Take the Scout's tagged signals and synthesize patterns across them.
+    crew = Crew(agents=[agents['scout']], tasks=[scout_task], process=Process.sequential, verbose=True)
+    return kickoff_cached(crew, response_cache, telemetry, 'scout')[0]
+
+def analyst_stage(agents, scout_output, response_cache, telemetry):
+    """Synthesize patterns across the Scout's signals"""
+    from crewai import Task, Crew, Process
+    from tools.prompt_packer import estimate_tokens
+    from tools.response_cache import kickoff_cached
+
+    prompt_start = time.perf_counter()
+
+    # Scout output is passed in the description rather than via Task
+    # context, so the Analyst can run on its own when resuming a run
+    analyst_task = Task(
+        description=f"""Take the Scout's tagged signals and synthesize patterns across them.
+    
+    SCOUT SIGNALS:
+    {scout_output}
     
     Your analysis should include:
     1. Emerging Patterns - What themes or directions are appearing?
@@ -116,53 +306,414 @@ analyst_task = Task(
     Be concise but insightful. Focus on synthesis, not just summary.
     
     Output a well-structured analysis section.""",
-    agent=analyst,
-    expected_output="Synthesized analysis identifying patterns, implications, and open questions",
-    context=[scout_task]
-)
-
-# === CREW ORCHESTRATION ===
-crew = Crew(
-    agents=[scout, analyst],
-    tasks=[scout_task, analyst_task],
-    process=Process.sequential,
-    verbose=True
-)
-
-# === EXECUTE ===
-print("\n" + "="*80)
-print("STARTING CREW EXECUTION")
-print("="*80 + "\n")
-
-try:
-    result = crew.kickoff()
-    
-    # Get individual task outputs
-    scout_output = scout_task.output.raw if hasattr(scout_task, 'output') else "Scout output not available"
-    analyst_output = str(result)
-    
-    # === SAVE OUTPUT ===
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    output_file = f"output/digest_{timestamp}.md"
+        agent=agents['analyst'],
+        expected_output="Synthesized analysis identifying patterns, implications, and open questions"
+    )
+
+    telemetry.record_span(
+        'analyst', 'prompt', time.perf_counter() - prompt_start, tokens=estimate_tokens(analyst_task.description)
+    )
+
+    crew = Crew(agents=[agents['analyst']], tasks=[analyst_task], process=Process.sequential, verbose=True)
+    return kickoff_cached(crew, response_cache, telemetry, 'analyst')[0]
+
+def homelab_stage(agents, scout_output, analyst_output, response_cache, telemetry):
+    """Evaluate the signals against the homelab context"""
+    from crewai import Task, Crew, Process
+    from tools.context_loader import load_relevant_context
+    from tools.prompt_packer import estimate_tokens
+    from tools.response_cache import kickoff_cached
+
+    # Core files plus the archive chunks that match today's signals
+    prompt_start = time.perf_counter()
+    homelab_context = load_relevant_context('homelab', f"{scout_output}\n{analyst_output}", STRATEGIST_CONTEXT_TOKENS)
+
+    homelab_task = Task(
+        description=f"""Evaluate the Scout signals and Analyst synthesis for relevance to 
+    Kyle's homelab infrastructure and learning goals.
+    
+    HOMELAB CONTEXT:
+    {homelab_context}
+    
+    SCOUT SIGNALS:
+    {scout_output}
+    
+    ANALYST SYNTHESIS:
+    {analyst_output}
+    
+    Your job:
+    1. Review the signals and synthesis from Scout and Analyst
+    2. Identify which signals (if any) are relevant to the homelab context above
+    3. For each relevant signal, explain:
+       - What specific homelab project, system, or learning goal it connects to
+       - Why it's worth attention (what problem it solves or capability it enables)
+       - Suggested next action (experiment, research, prototype, or defer)
+    
+    Be selective. Most signals will NOT be homelab-relevant. Only flag genuine opportunities.
     
+    If no signals are relevant, state that clearly rather than forcing connections.
+    
+    OUTPUT REQUIREMENTS:
+    For each opportunity you identify, use this EXACT structure:
+
+    ### Opportunity: [Clear Title]
+    **Relevance:** [Why this matters to Kyle's homelab context - specific project/system connection]
+    **Signal:** [What specific development/trend triggered this opportunity]
+    **Next Steps:** [Concrete action to explore/implement this - be specific]
+
+    Important formatting rules:
+    - Each opportunity MUST start with "### Opportunity:" header
+    - Use **bold** for subsection headers (Relevance, Signal, Next Steps)
+    - Be selective - only flag genuinely actionable opportunities
+    - If no opportunities exist, output: "No homelab-relevant signals in this digest."
+
+    Example:
+    ### Opportunity: Local LLM Fine-tuning with Ollama
+    **Relevance:** Connects to AI Box project (192.168.1.204) and local inference goals
+    **Signal:** New Ollama fine-tuning capabilities for consumer hardware announced
+    **Next Steps:** Research Ollama adapter support and test with Gemma 7B model on AI Box
+    """,
+        agent=agents['homelab_strategist'],
+        expected_output=STRATEGIST_EXPECTED_OUTPUT
+    )
+
+    telemetry.record_span(
+        'homelab', 'prompt', time.perf_counter() - prompt_start, tokens=estimate_tokens(homelab_task.description)
+    )
+
+    crew = Crew(agents=[agents['homelab_strategist']], tasks=[homelab_task], process=Process.sequential, verbose=True)
+    return kickoff_cached(crew, response_cache, telemetry, 'homelab')[0]
+
+def work_stage(agents, scout_output, analyst_output, response_cache, telemetry):
+    """Evaluate the signals against the work context"""
+    from crewai import Task, Crew, Process
+    from tools.context_loader import load_relevant_context
+    from tools.prompt_packer import estimate_tokens
+    from tools.response_cache import kickoff_cached
+
+    # Core files plus the archive chunks that match today's signals
+    prompt_start = time.perf_counter()
+    work_context = load_relevant_context('work', f"{scout_output}\n{analyst_output}", STRATEGIST_CONTEXT_TOKENS)
+
+    work_task = Task(
+        description=f"""Evaluate the Scout signals and Analyst synthesis for relevance to 
+    Kyle's work role, active projects, and strategic priorities.
+    
+    WORK CONTEXT:
+    {work_context}
+    
+    SCOUT SIGNALS:
+    {scout_output}
+    
+    ANALYST SYNTHESIS:
+    {analyst_output}
+    
+    Your job:
+    1. Review the signals and synthesis from Scout and Analyst
+    2. Cross-reference against documented work role, project briefs, hot topics, and transcripts
+    3. Identify which signals (if any) connect to work priorities or challenges
+    4. For each relevant signal, explain:
+       - What specific project, priority, or hot topic it addresses
+       - Why it's actionable for Kyle's role and influence level
+       - How it could provide leadership visibility or team value
+       - Suggested next action (experiment, advocate, pilot, share with team)
+    
+    Be highly selective. Most signals won't be work-relevant. Only flag opportunities that:
+    - Connect to documented priorities or problems
+    - Are within Kyle's sphere of influence
+    - Offer genuine differentiation or efficiency gains
+    
+    If no signals are relevant, state that clearly rather than forcing connections.
+    
+    OUTPUT REQUIREMENTS:
+    For each opportunity you identify, use this EXACT structure:
+
+    ### Opportunity: [Clear Title]
+    **Relevance:** [Why this matters to Kyle's work context - specific project/priority connection]
+    **Signal:** [What specific development/trend triggered this opportunity]
+    **Next Steps:** [Concrete action to leverage this - experiment, advocate, pilot, share]
+
+    Important formatting rules:
+    - Each opportunity MUST start with "### Opportunity:" header
+    - Use **bold** for subsection headers (Relevance, Signal, Next Steps)
+    - Be highly selective - only flag genuinely actionable work opportunities
+    - If no opportunities exist, output: "No work-relevant signals in this digest."
+
+    Example:
+    ### Opportunity: AI-Assisted Code Review Patterns
+    **Relevance:** Directly relates to velocity improvement goals in Project Phoenix brief
+    **Signal:** New Claude Code review capabilities with contextual feedback emerging in practitioner adoption
+    **Next Steps:** Pilot with one team sprint, document productivity impact, share findings with leadership
+    """,
+        agent=agents['work_strategist'],
+        expected_output=STRATEGIST_EXPECTED_OUTPUT
+    )
+
+    telemetry.record_span(
+        'work', 'prompt', time.perf_counter() - prompt_start, tokens=estimate_tokens(work_task.description)
+    )
+
+    crew = Crew(agents=[agents['work_strategist']], tasks=[work_task], process=Process.sequential, verbose=True)
+    return kickoff_cached(crew, response_cache, telemetry, 'work')[0]
+
+def format_stage(config, run_id, fetch_result, scout_output, analyst_output, homelab_output, work_output, telemetry):
+    """Parse opportunities and write the markdown digest and Slack JSON"""
+    from tools.context_loader import get_context_summary
+    from tools.opportunity_parser import parse_opportunities, save_opportunity_mapping
+    from tools.opportunity_store import OpportunityStore
+    from tools.slack_formatter import save_for_n8n_with_opportunities
+    from tools.telemetry import format_summary_line
+
+    print("\n[Crew] Parsing opportunities from Strategist outputs...")
+    homelab_opportunities = parse_opportunities(homelab_output, 'H')
+    work_opportunities = parse_opportunities(work_output, 'W')
+
+    print(f"[Crew] Parsed {len(homelab_opportunities)} homelab opportunities")
+    print(f"[Crew] Parsed {len(work_opportunities)} work opportunities")
+
+    # Combine for mapping file
+    all_opportunities = {**homelab_opportunities, **work_opportunities}
+
+    # Save opportunity mapping for approval poller
+    digest_date = datetime.now().strftime("%Y-%m-%d")
+    if all_opportunities:
+        store = OpportunityStore()
+        try:
+            opp_mapping_file = save_opportunity_mapping(all_opportunities, digest_date, store=store)
+        finally:
+            store.close()
+        print(f"[Crew] Opportunity mapping saved: {opp_mapping_file}")
+    else:
+        print(f"[Crew] No opportunities to save (both Strategists returned no opportunities)")
+
+    metadata = {
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'sources_count': len(config['sources']),
+        'signals_count': len(fetch_result['entries']),
+        'context': get_context_summary(),
+        # Every stage up to this one; the full run is in output/telemetry_{run_id}.json
+        'telemetry': telemetry.summary()
+    }
+
+    output_file = f"output/digest_{run_id}.md"
+
     with open(output_file, 'w') as f:
         f.write(f"# Strategic Intelligence Digest\n")
-        f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"**Sources Monitored:** {len(config['sources'])}\n")
-        f.write(f"**Signals Analyzed:** {len(all_entries)}\n\n")
+        f.write(f"**Generated:** {metadata['timestamp']}\n")
+        f.write(f"**Sources Monitored:** {metadata['sources_count']}\n")
+        f.write(f"**Sources Unchanged:** {len(fetch_result['unchanged_sources'])}\n")
+        f.write(f"**Signals Analyzed:** {metadata['signals_count']}\n")
+        f.write(f"**Context Loaded:** {metadata['context']}\n")
+        f.write(f"**Run Cost:** {format_summary_line(metadata['telemetry'])}\n\n")
         f.write("---\n\n")
-        f.write("# Scout Report\n\n")
+        f.write("# 🔍 Scout Report\n\n")
         f.write(scout_output)
         f.write("\n\n---\n\n")
-        f.write("# Analyst Synthesis\n\n")
+        f.write("# 🧠 Analyst Synthesis\n\n")
         f.write(analyst_output)
         f.write("\n\n---\n\n")
-        f.write("*Generated by CrewAI Strategic Intelligence Crew (Criterion 2)*\n")
-    
-    print(f"\n\n[Crew] Output saved to: {output_file}")
-    print(f"[Crew] Execution complete!")
-    
-except Exception as e:
-    print(f"\n\n[ERROR] Crew execution failed: {str(e)}")
-    import traceback
-    traceback.print_exc()
+        f.write("# 🏠 Homelab Opportunities\n\n")
+        f.write(homelab_output)
+        f.write("\n\n---\n\n")
+        f.write("# 💼 Work Opportunities\n\n")
+        f.write(work_output)
+        f.write("\n\n---\n\n")
+        f.write("*Generated by CrewAI Strategic Intelligence Crew (Criterion 5)*\n")
+
+    slack_json_file = save_for_n8n_with_opportunities(
+        scout_output, analyst_output,
+        homelab_opportunities, work_opportunities,
+        metadata, f"output/slack_digest_{run_id}.json"
+    )
+
+    return {
+        'output_file': output_file,
+        'slack_json_file': slack_json_file,
+        'digest_date': digest_date,
+        'opportunity_ids': sorted(all_opportunities.keys())
+    }
+
+def deliver_stage(config, format_result, telemetry):
+    """Post the digest to Slack as Block Kit messages, if the 'slack' config section enables it"""
+    from tools.slack_delivery import DEFAULT_SLACK_API_URL, SlackClient, TokenBucket, deliver_digest
+    from tools.opportunity_store import OpportunityStore
+
+    slack_config = config.get('slack', {})
+    token = os.getenv('SLACK_BOT_TOKEN')
+    if not slack_config.get('deliver') or not token:
+        print("[Crew] Slack delivery disabled - n8n posts the digest from the Slack JSON")
+        return {'delivered': False}
+
+    with open(format_result['slack_json_file'], 'r') as f:
+        payload = json.load(f)
+
+    client = SlackClient(
+        token,
+        os.getenv('SLACK_API_URL', DEFAULT_SLACK_API_URL),
+        TokenBucket(rate=slack_config.get('messages_per_second', 1))
+    )
+    result = deliver_digest(client, slack_config.get('channel', '#trend-monitoring'), payload)
+    if not result['success']:
+        # Not raised: a resumed run would post the top-level message a second time
+        print(f"[Crew] Slack delivery incomplete after {result['messages']} message(s): {result['error']}")
+        return {'delivered': False, 'ts': result['ts'], 'error': result['error']}
+
+    # Approval replies are matched to the digest by this ts
+    digest_date = format_result.get('digest_date')
+    if digest_date and result['ts']:
+        store = OpportunityStore()
+        try:
+            if store.set_message_ts(digest_date, result['ts']):
+                store.export_json(digest_date)
+        finally:
+            store.close()
+
+    print(f"[Crew] Digest posted to Slack ({result['messages']} messages, "
+          f"{client.stats['rate_limited']} rate-limited, ts {result['ts']})")
+    return {'delivered': True, 'ts': result['ts'], 'messages': result['messages']}
+
+def run_digest(agents: Dict[str, Any] = None, resume: str = None, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Run the digest pipeline in this process
+
+    Args:
+        agents: Prebuilt agents from build_agents() (built here if None)
+        resume: Run ID whose completed stages should be reused
+        use_cache: Serve identical LLM calls from the response cache
+
+    Returns:
+        {"success": True, "run_id": ..., "output_file": ..., "slack_json_file": ..., "slack_ts": ...,
+         "telemetry_file": ..., "opportunity_ids": [...], "signals_count": ...,
+         "stage_timings": {stage: seconds}, "cost_usd": ...}
+        or {"success": False, "run_id": ..., "error": ...}
+    """
+    from tools.checkpoint import RunCheckpoint
+    from tools.dag import run_dag
+    from tools.response_cache import ResponseCache
+    from tools.telemetry import RunTelemetry, format_summary_line
+
+    try:
+        # Stage outputs are checkpointed under output/runs/{run_id}/
+        checkpoint = RunCheckpoint(resume)
+    except FileNotFoundError as e:
+        return {"success": False, "run_id": resume, "error": str(e)}
+    print(f"[Crew] Run ID: {checkpoint.run_id}{' (resuming)' if checkpoint.resumed else ''}")
+    telemetry = RunTelemetry(checkpoint.run_id)
+
+    def run_stage(name, func, *stage_args):
+        """Run a stage, or load its checkpoint if it already completed in this run"""
+        if checkpoint.has(name):
+            print(f"[Crew] Stage '{name}' already complete - loading checkpoint")
+            with telemetry.span(name, 'stage', checkpoint=True):
+                return checkpoint.load(name)
+
+        with telemetry.span(name, 'stage'):
+            result = func(*stage_args, telemetry)
+        checkpoint.save(name, result)
+        return result
+
+    # === EXECUTE ===
+    print("\n" + "="*80)
+    print("STARTING CREW EXECUTION")
+    print("="*80 + "\n")
+
+    fetcher = None
+    try:
+        config = load_config()
+        fetcher = create_fetcher(config)
+        if agents is None:
+            agents = build_agents()
+
+        # Identical inputs (e.g. an n8n retry) are served from the response cache
+        response_cache = ResponseCache() if use_cache else None
+
+        # Each stage starts as soon as its inputs are ready; the Homelab and
+        # Work Strategists both depend only on the Analyst, so they overlap
+        run_id = checkpoint.run_id
+        stages = {
+            'fetch': ([], lambda r: run_stage('fetch', fetch_stage, config, fetcher)),
+            'scout': (['fetch'], lambda r: run_stage(
+                'scout', scout_stage, agents, r['fetch']['source_content'], response_cache)),
+            'analyst': (['scout'], lambda r: run_stage(
+                'analyst', analyst_stage, agents, r['scout'], response_cache)),
+            'homelab': (['scout', 'analyst'], lambda r: run_stage(
+                'homelab', homelab_stage, agents, r['scout'], r['analyst'], response_cache)),
+            'work': (['scout', 'analyst'], lambda r: run_stage(
+                'work', work_stage, agents, r['scout'], r['analyst'], response_cache)),
+            'format': (['fetch', 'scout', 'analyst', 'homelab', 'work'], lambda r: run_stage(
+                'format', format_stage, config, run_id, r['fetch'], r['scout'], r['analyst'], r['homelab'], r['work'])),
+            'deliver': (['format'], lambda r: run_stage('deliver', deliver_stage, config, r['format'])),
+        }
+        results, stage_timings = run_dag(stages)
+        fetch_result = results['fetch']
+        format_result = results['format']
+
+        print(f"\n\n[Crew] Markdown output saved to: {format_result['output_file']}")
+        print(f"[Crew] Slack JSON output saved to: {format_result['slack_json_file']}")
+        if format_result['opportunity_ids']:
+            print(f"[Crew] Opportunity IDs: {', '.join(format_result['opportunity_ids'])}")
+
+        print("[Crew] Stage timings:")
+        for stage_name, seconds in stage_timings.items():
+            print(f"[Crew]   {stage_name:8s} {seconds:7.1f}s")
+
+        telemetry_file = telemetry.save(f"output/telemetry_{run_id}.json")
+        print(f"[Crew] Telemetry ({format_summary_line(telemetry.summary())}) saved to: {telemetry_file}")
+
+        # Persist feed validators and seen entries only once the digest is
+        # written, so a failed run refetches the same content next time
+        if fetcher.validators:
+            fetcher.validators.save()
+        if fetcher.seen_index:
+            fetcher.seen_index.mark_seen(fetch_result['entries'])
+        print(f"[Crew] Execution complete!")
+
+        return {
+            "success": True,
+            "run_id": checkpoint.run_id,
+            "output_file": format_result['output_file'],
+            "slack_json_file": format_result['slack_json_file'],
+            "slack_ts": results['deliver'].get('ts'),
+            "opportunity_ids": format_result['opportunity_ids'],
+            "telemetry_file": telemetry_file,
+            "signals_count": len(fetch_result['entries']),
+            "stage_timings": {name: round(seconds, 2) for name, seconds in stage_timings.items()},
+            "cost_usd": telemetry.summary()['totals']['cost_usd']
+        }
+
+    except Exception as e:
+        print(f"\n\n[ERROR] Crew execution failed: {str(e)}")
+        traceback.print_exc()
+        return {"success": False, "run_id": checkpoint.run_id, "error": str(e)}
+    finally:
+        if fetcher:
+            fetcher.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Strategic Intelligence digest crew')
+    parser.add_argument('--no-cache', action='store_true', help='Always call the LLMs, ignoring cached responses')
+    parser.add_argument('--resume', metavar='RUN_ID', help='Resume a failed run, skipping its completed stages')
+    parser.add_argument('--local', action='store_true', help='Run in this process even if the crew worker is running')
+    args = parser.parse_args()
+
+    job = {"resume": args.resume, "use_cache": not args.no_cache}
+    result = None if args.local else submit_job('digest', job)
+
+    if result is None:
+        from dotenv import load_dotenv
+
+        # Load environment variables
+        load_dotenv('config/.env')
+        result = run_digest(resume=args.resume, use_cache=not args.no_cache)
+    else:
+        print(f"[Crew] Digest run {result.get('run_id')} handled by crew worker")
+
+    if result['success']:
+        print(f"[Crew] Digest: {result['output_file']}")
+    else:
+        print(f"[ERROR] {result['error']}")
+        if result.get('run_id'):
+            print(f"[Crew] Resume with: python3 crew.py --resume {result['run_id']}")
+
+if __name__ == "__main__":
+    main()
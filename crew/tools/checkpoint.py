@@ -0,0 +1,46 @@
+"""
+Run Checkpoints
+Persists each pipeline stage's output so a failed run can resume where it stopped
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+class RunCheckpoint:
+    """Stage outputs for one pipeline run, stored under output/runs/{run_id}/"""
+
+    def __init__(self, run_id: Optional[str] = None, base_dir: str = "output/runs"):
+        """
+        Args:
+            run_id: Existing run to resume, or None to start a new run
+            base_dir: Directory holding one subdirectory per run
+        """
+        self.resumed = run_id is not None
+        self.run_id = run_id or datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.directory = os.path.join(base_dir, self.run_id)
+
+        if self.resumed and not os.path.isdir(self.directory):
+            raise FileNotFoundError(f"No checkpoints found for run {self.run_id}: {self.directory}")
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, stage: str) -> str:
+        return os.path.join(self.directory, f"{stage}.json")
+
+    def has(self, stage: str) -> bool:
+        """Check whether a stage already completed in this run"""
+        return os.path.exists(self._path(stage))
+
+    def load(self, stage: str) -> Any:
+        """Load a completed stage's output"""
+        with open(self._path(stage), 'r') as f:
+            return json.load(f)['data']
+
+    def save(self, stage: str, data: Any):
+        """Record a stage's output (atomically, so a crash never leaves half a checkpoint)"""
+        path = self._path(stage)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'stage': stage, 'saved_at': datetime.now().isoformat(), 'data': data}, f, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,326 @@
+"""
+Context Retrieval Index
+Incremental on-disk BM25 index over the /context archives (hot topics, briefs, transcripts)
+
+Only files whose mtime or size changed since the last refresh are rechunked,
+and a query reads just the postings of its own terms, so retrieval cost stays
+bounded as the archive grows.
+"""
+
+import os
+import re
+import math
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List
+
+from tools.relevance import tokenize
+
+CHUNK_CHARS = 1500
+SUMMARY_CHARS = 300
+# Long queries (e.g. a whole Analyst synthesis) keep their most frequent terms
+MAX_QUERY_TERMS = 256
+
+_HEADING_RE = re.compile(r'^#{1,6}\s+(.*)$', re.MULTILINE)
+
+def summarize(text: str, max_chars: int = SUMMARY_CHARS) -> str:
+    """First heading and opening paragraph of a markdown file, capped at max_chars"""
+    heading = _HEADING_RE.search(text)
+    body = _HEADING_RE.sub('', text)
+    paragraph = next((p.strip() for p in body.split('\n\n') if p.strip()), '')
+
+    summary = f"{heading.group(1).strip()}: {paragraph}" if heading else paragraph
+    summary = ' '.join(summary.split())
+    if len(summary) > max_chars:
+        summary = summary[:max_chars].rsplit(' ', 1)[0] + '...'
+    return summary
+
+def chunk_markdown(text: str, max_chars: int = CHUNK_CHARS) -> List[Dict]:
+    """
+    Split markdown into heading sections, then paragraphs, of at most max_chars
+
+    Returns:
+        [{"heading": ..., "text": ..., "terms": Counter}, ...] in file order
+    """
+    sections = []
+    heading = ''
+    start = 0
+    for match in _HEADING_RE.finditer(text):
+        sections.append((heading, text[start:match.start()]))
+        heading = match.group(1).strip()
+        start = match.start()
+    sections.append((heading, text[start:]))
+
+    chunks = []
+    for heading, section in sections:
+        current = ''
+        for paragraph in section.split('\n\n'):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if current and len(current) + len(paragraph) + 2 > max_chars:
+                chunks.append((heading, current))
+                current = ''
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+            # A single oversized paragraph (e.g. an unbroken transcript) is hard-split
+            while len(current) > max_chars:
+                chunks.append((heading, current[:max_chars]))
+                current = current[max_chars:]
+        if current:
+            chunks.append((heading, current))
+
+    # Heading counted with the text: it names what the chunk is about
+    return [
+        {'heading': heading, 'text': chunk_text, 'terms': Counter(tokenize(f"{heading} {chunk_text}"))}
+        for heading, chunk_text in chunks
+    ]
+
+class ContextIndex:
+    """SQLite-backed chunk store with an inverted index, refreshed incrementally"""
+
+    def __init__(self, path: str, context_dir: str, chunk_chars: int = CHUNK_CHARS):
+        """
+        Open (or create) the index
+
+        Args:
+            path: SQLite database file
+            context_dir: Root that section paths are relative to (e.g. /context)
+            chunk_chars: Maximum characters per chunk
+        """
+        self.path = path
+        self.context_dir = context_dir
+        self.chunk_chars = chunk_chars
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # The worker and a one-off catalyst.py run may refresh at the same time
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " section TEXT NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " summary TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            " id INTEGER PRIMARY KEY,"
+            " path TEXT NOT NULL,"
+            " section TEXT NOT NULL,"
+            " heading TEXT NOT NULL,"
+            " text TEXT NOT NULL,"
+            " length INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " term TEXT NOT NULL,"
+            " chunk_id INTEGER NOT NULL,"
+            " tf INTEGER NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS chunks_path ON chunks(path);"
+            "CREATE INDEX IF NOT EXISTS chunks_section ON chunks(section);"
+            "CREATE INDEX IF NOT EXISTS postings_term ON postings(term);"
+            "CREATE INDEX IF NOT EXISTS postings_chunk ON postings(chunk_id);"
+        )
+        self._conn.commit()
+
+    def _section_files(self, section: str) -> List[str]:
+        path = os.path.join(self.context_dir, section)
+        if os.path.isdir(path):
+            return [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.md')]
+        return [path] if os.path.exists(path) else []
+
+    def _delete_file(self, path: str):
+        self._conn.execute(
+            "DELETE FROM postings WHERE chunk_id IN (SELECT id FROM chunks WHERE path = ?)", (path,)
+        )
+        self._conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+        self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def refresh(self, sections: Iterable[str]) -> int:
+        """
+        Bring the given sections up to date, reindexing only changed files
+
+        Args:
+            sections: Files or directories relative to context_dir
+                (e.g. 'hot_topics.md', 'transcripts')
+
+        Returns:
+            Number of files (re)indexed or removed
+        """
+        changed = 0
+        with self._lock:
+            for section in sections:
+                indexed = {
+                    path: (mtime_ns, size)
+                    for path, mtime_ns, size in self._conn.execute(
+                        "SELECT path, mtime_ns, size FROM files WHERE section = ?", (section,)
+                    )
+                }
+
+                for path in self._section_files(section):
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    if indexed.pop(path, None) == (stat.st_mtime_ns, stat.st_size):
+                        continue
+
+                    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                        text = f.read()
+
+                    self._delete_file(path)
+                    self._conn.execute(
+                        "INSERT INTO files (path, section, mtime_ns, size, summary) VALUES (?, ?, ?, ?, ?)",
+                        (path, section, stat.st_mtime_ns, stat.st_size, summarize(text))
+                    )
+                    for chunk in chunk_markdown(text, self.chunk_chars):
+                        chunk_id = self._conn.execute(
+                            "INSERT INTO chunks (path, section, heading, text, length) VALUES (?, ?, ?, ?, ?)",
+                            (path, section, chunk['heading'], chunk['text'], sum(chunk['terms'].values()))
+                        ).lastrowid
+                        self._conn.executemany(
+                            "INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)",
+                            [(term, chunk_id, tf) for term, tf in chunk['terms'].items()]
+                        )
+                    changed += 1
+
+                # Whatever is left was deleted from disk since the last refresh
+                for path in indexed:
+                    self._delete_file(path)
+                    changed += 1
+
+            self._conn.commit()
+        return changed
+
+    def top_k(self, query: str, k: int = 5, sections: Iterable[str] = None, k1: float = 1.5, b: float = 0.75) -> List[Dict]:
+        """
+        Retrieve the k chunks that best match a query (BM25)
+
+        Args:
+            query: Free text (e.g. an opportunity's title, relevance and signal)
+            k: Maximum chunks returned
+            sections: Restrict to these sections (all indexed sections if None)
+
+        Returns:
+            [{"path", "name", "section", "heading", "text", "score"}, ...],
+            best first, only chunks sharing at least one term with the query
+        """
+        query_terms = Counter(dict(Counter(tokenize(query)).most_common(MAX_QUERY_TERMS)))
+        if not query_terms:
+            return []
+
+        section_filter = ''
+        section_args = []
+        if sections is not None:
+            sections = list(sections)
+            if not sections:
+                return []
+            section_filter = f" AND c.section IN ({', '.join('?' * len(sections))})"
+            section_args = sections
+
+        with self._lock:
+            n, avg_length = self._conn.execute(
+                f"SELECT COUNT(*), AVG(length) FROM chunks c WHERE 1 = 1{section_filter}", section_args
+            ).fetchone()
+            if not n:
+                return []
+
+            terms = list(query_terms)
+            rows = self._conn.execute(
+                "SELECT p.term, p.chunk_id, p.tf, c.length FROM postings p JOIN chunks c ON c.id = p.chunk_id"
+                f" WHERE p.term IN ({', '.join('?' * len(terms))}){section_filter}",
+                terms + section_args
+            ).fetchall()
+
+        # Same weighting as relevance.bm25_scores, computed from the postings alone
+        postings = defaultdict(list)
+        for term, chunk_id, tf, length in rows:
+            postings[term].append((chunk_id, tf, length))
+
+        avg_length = avg_length or 1.0
+        scores = Counter()
+        for term, matches in postings.items():
+            idf = math.log(1 + (n - len(matches) + 0.5) / (len(matches) + 0.5))
+            weight = 1 + math.log(query_terms[term])
+            for chunk_id, tf, length in matches:
+                norm = k1 * (1 - b + b * length / avg_length)
+                scores[chunk_id] += idf * (tf * (k1 + 1)) / (tf + norm) * weight
+
+        best = scores.most_common(k)
+        if not best:
+            return []
+
+        with self._lock:
+            chunks = {
+                row[0]: row[1:]
+                for row in self._conn.execute(
+                    f"SELECT id, path, section, heading, text FROM chunks WHERE id IN ({', '.join('?' * len(best))})",
+                    [chunk_id for chunk_id, _ in best]
+                )
+            }
+
+        results = []
+        for chunk_id, score in best:
+            path, section, heading, text = chunks[chunk_id]
+            results.append({
+                'path': path,
+                'name': os.path.relpath(path, self.context_dir),
+                'section': section,
+                'heading': heading,
+                'text': text,
+                'score': round(score, 3)
+            })
+        return results
+
+    def recent_summaries(self, sections: Iterable[str], limit: int = 5) -> List[Dict]:
+        """Summaries of the most recently modified files in the given sections"""
+        sections = list(sections)
+        if not sections:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT path, section, summary FROM files WHERE section IN ({', '.join('?' * len(sections))})"
+                " ORDER BY mtime_ns DESC LIMIT ?",
+                sections + [limit]
+            ).fetchall()
+        return [
+            {'path': path, 'name': os.path.relpath(path, self.context_dir), 'section': section, 'summary': summary}
+            for path, section, summary in rows
+        ]
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+# Quick test
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as test_dir:
+        os.makedirs(os.path.join(test_dir, 'transcripts'))
+        for day in range(30):
+            with open(os.path.join(test_dir, 'transcripts', f'2026-01-{day + 1:02d}.md'), 'w') as f:
+                topic = "vector database migration for client search" if day == 17 else "quarterly staffing and budget review"
+                f.write(f"# Meeting {day + 1}\n\n" + f"We discussed {topic}.\n\n" * 40)
+
+        index = ContextIndex(os.path.join(test_dir, 'index.db'), test_dir)
+        assert index.refresh(['transcripts']) == 30
+        assert index.refresh(['transcripts']) == 0, "unchanged files must not be reindexed"
+
+        hits = index.top_k("vector database search for clients", k=3, sections=['transcripts'])
+        for hit in hits:
+            print(f"{hit['score']:6.2f}  {hit['name']} / {hit['heading']}")
+        assert hits and all(hit['name'] == 'transcripts/2026-01-18.md' for hit in hits)
+
+        # Edits and deletions are picked up on the next refresh
+        with open(os.path.join(test_dir, 'transcripts', '2026-01-02.md'), 'a') as f:
+            f.write("\nFollow-up: vector database vendors shortlisted.\n")
+        os.remove(os.path.join(test_dir, 'transcripts', '2026-01-18.md'))
+        assert index.refresh(['transcripts']) == 2
+        hits = index.top_k("vector database", k=3, sections=['transcripts'])
+        assert [hit['name'] for hit in hits] == ['transcripts/2026-01-02.md']
+        index.close()
+
+    print("All tests passed! ✅")
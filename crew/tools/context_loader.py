@@ -0,0 +1,229 @@
+"""
+Context Loader
+Loads the /context files the Strategists and Catalyst reason against
+
+Files are read once per change (memoized by path, mtime and size), so a
+resident process such as the crew worker only rereads what the Slack
+/transcript, /newproject and hot-topic commands touched. Catalyst asks the
+retrieval index (tools/context_index.py) for the chunks relevant to one
+opportunity instead of the whole archive, which keeps its prompt flat as
+transcripts accumulate.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from tools.context_index import ContextIndex
+from tools.prompt_packer import estimate_tokens
+
+CONTEXT_DIR = "/context"
+INDEX_PATH = "cache/context_index.db"
+
+# Small, hand-maintained files sent in full; archives are searched by chunk
+HOMELAB_CORE = [('Homelab Architecture', 'homelab_architecture.md')]
+HOMELAB_ARCHIVES = []
+WORK_CORE = [('Work Role', 'work_role.md')]
+WORK_ARCHIVES = [('Hot Topics', 'hot_topics.md'), ('Project Briefs', 'briefs'), ('Transcripts', 'transcripts')]
+
+RELEVANT_TOKEN_BUDGET = 2500
+RELEVANT_MAX_CHUNKS = 20
+
+class ContextCache:
+    """Context file contents, reread only when their mtime or size changes"""
+
+    def __init__(self, context_dir: str = CONTEXT_DIR):
+        self.context_dir = context_dir
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[Dict]:
+        """
+        Load one file
+
+        Returns:
+            {"path", "name", "text"}, or None if the file does not exist
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._files.pop(path, None)
+            return None
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._files.get(path)
+        if cached and cached['key'] == key:
+            return cached
+
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+
+        parsed = {
+            'key': key,
+            'path': path,
+            'name': os.path.relpath(path, self.context_dir),
+            'text': text
+        }
+        with self._lock:
+            self._files[path] = parsed
+        return parsed
+
+    def section(self, relative_path: str) -> List[Dict]:
+        """Load a file, or every .md file in a directory (sorted by name)"""
+        path = os.path.join(self.context_dir, relative_path)
+        if os.path.isdir(path):
+            paths = [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.md')]
+        else:
+            paths = [path]
+        return [parsed for parsed in map(self.get, paths) if parsed]
+
+_cache = ContextCache()
+_index = None
+_index_lock = threading.Lock()
+
+def _get_index() -> ContextIndex:
+    """Open the shared retrieval index on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ContextIndex(INDEX_PATH, CONTEXT_DIR)
+        return _index
+
+def _render_full(sections: List[Tuple[str, str]]) -> str:
+    parts = []
+    for label, relative_path in sections:
+        for parsed in _cache.section(relative_path):
+            if parsed['text'].strip():
+                parts.append(f"=== {label}: {parsed['name']} ===\n{parsed['text'].strip()}")
+    return '\n\n'.join(parts) if parts else "No context files available."
+
+def load_homelab_context() -> str:
+    """Full homelab context"""
+    return _render_full(HOMELAB_CORE + HOMELAB_ARCHIVES)
+
+def load_work_context() -> str:
+    """Full work context: role, hot topics, project briefs and transcripts"""
+    return _render_full(WORK_CORE + WORK_ARCHIVES)
+
+def top_k(query: str, k: int = 5, kind: Optional[str] = None) -> List[Dict]:
+    """
+    Retrieve the archive chunks that best match a query
+
+    Args:
+        query: Free text to match
+        k: Maximum chunks returned
+        kind: 'homelab' or 'work' to search only that context's archives
+            (both if None)
+
+    Returns:
+        Chunk dicts from ContextIndex.top_k, best first, each with its 'label'
+    """
+    archives = {'homelab': HOMELAB_ARCHIVES, 'work': WORK_ARCHIVES}.get(kind, HOMELAB_ARCHIVES + WORK_ARCHIVES)
+    labels = {relative_path: label for label, relative_path in archives}
+    if not labels:
+        return []
+
+    # Only files changed since the last call are rechunked
+    index = _get_index()
+    index.refresh(labels)
+    return [dict(hit, label=labels[hit['section']]) for hit in index.top_k(query, k, sections=labels)]
+
+def load_relevant_context(kind: str, query_text: str, token_budget: int = RELEVANT_TOKEN_BUDGET) -> str:
+    """
+    Core context plus the archive chunks most relevant to a query
+
+    Args:
+        kind: 'homelab' or 'work'
+        query_text: What the context is for (e.g. an opportunity's title,
+            relevance, signal and next steps)
+        token_budget: Estimated tokens allowed for archive chunks
+
+    Returns:
+        Core files in full, then the best-matching archive chunks (each
+        labelled with its file and heading) until the budget is spent. If
+        nothing matches, the summaries of the most recent archive files.
+    """
+    core, archives = (HOMELAB_CORE, HOMELAB_ARCHIVES) if kind == 'homelab' else (WORK_CORE, WORK_ARCHIVES)
+    labels = {relative_path: label for label, relative_path in archives}
+
+    parts = [_render_full(core)]
+    if not labels:
+        return parts[0]
+
+    selected = []
+    remaining = token_budget
+    for hit in top_k(query_text, RELEVANT_MAX_CHUNKS, kind):
+        heading = f" / {hit['heading']}" if hit['heading'] else ''
+        block = f"=== {hit['label']}: {hit['name']}{heading} ===\n{hit['text']}"
+        cost = estimate_tokens(block)
+        if cost <= remaining:
+            selected.append(block)
+            remaining -= cost
+
+    if not selected:
+        # Nothing matched: orient the agent with what was recently added instead
+        for item in _get_index().recent_summaries(labels):
+            block = f"=== {labels[item['section']]}: {item['name']} (summary) ===\n{item['summary']}"
+            cost = estimate_tokens(block)
+            if cost > remaining:
+                break
+            selected.append(block)
+            remaining -= cost
+
+    parts.extend(selected)
+    return '\n\n'.join(parts)
+
+def get_context_summary() -> str:
+    """One-line description of the context files available"""
+    counts = []
+    for label, relative_path in HOMELAB_CORE + HOMELAB_ARCHIVES + WORK_CORE + WORK_ARCHIVES:
+        files = _cache.section(relative_path)
+        if not files:
+            continue
+        path = os.path.join(CONTEXT_DIR, relative_path)
+        counts.append(f"{len(files)} {label.lower()}" if os.path.isdir(path) else label)
+    return ', '.join(counts) if counts else "no context files found"
+
+# Quick test
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory() as test_dir:
+        os.makedirs(os.path.join(test_dir, 'transcripts'))
+        with open(os.path.join(test_dir, 'work_role.md'), 'w') as f:
+            f.write("# Work Role\n\nDirector of Experience Strategy.\n")
+        for day in range(30):
+            with open(os.path.join(test_dir, 'transcripts', f'2026-01-{day + 1:02d}.md'), 'w') as f:
+                topic = "vector database migration for client search" if day == 17 else "quarterly staffing and budget review"
+                f.write(f"# Meeting {day + 1}\n\n" + f"We discussed {topic}.\n\n" * 40)
+
+        _cache = ContextCache(test_dir)
+        CONTEXT_DIR = test_dir
+        INDEX_PATH = os.path.join(test_dir, 'index.db')
+
+        start = time.perf_counter()
+        load_work_context()
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        full = load_work_context()
+        warm = time.perf_counter() - start
+        print(f"Full work context: {estimate_tokens(full)} tokens (cold {cold * 1000:.1f}ms, warm {warm * 1000:.1f}ms)")
+
+        relevant = load_relevant_context('work', "Opportunity: vector database search for clients", token_budget=500)
+        print(f"Relevant work context: {estimate_tokens(relevant)} tokens")
+        print(get_context_summary())
+
+        assert "transcripts/2026-01-18.md" in relevant
+        assert "2026-01-01.md" not in relevant
+        assert estimate_tokens(relevant) < estimate_tokens(full) / 10
+        assert top_k("staffing budget", k=3, kind='work')[0]['label'] == 'Transcripts'
+
+        # Edits are picked up on the next call
+        with open(os.path.join(test_dir, 'work_role.md'), 'a') as f:
+            f.write("\nAlso leads the AI enablement program.\n")
+        assert "AI enablement" in load_work_context()
+
+    print("All tests passed! ✅")
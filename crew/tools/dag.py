@@ -0,0 +1,90 @@
+"""
+Stage DAG Executor
+Runs pipeline stages as soon as their dependencies finish, independent stages concurrently
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Tuple
+
+# name -> (dependency names, function taking {dependency name: result})
+Stages = Dict[str, Tuple[List[str], Callable[[Dict[str, Any]], Any]]]
+
+def run_dag(stages: Stages, max_workers: int = 4) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Execute a stage graph
+
+    Args:
+        stages: {name: ([dependency names], func)}; func receives a dict of
+            its dependencies' results
+        max_workers: Maximum stages running at once
+
+    Returns:
+        (results by stage name, wall-clock seconds by stage name)
+
+    Raises:
+        ValueError: On unknown dependencies or cycles
+        Exception: The first stage failure; stages already running are
+            allowed to finish, stages not yet started are skipped
+    """
+    for name, (deps, _) in stages.items():
+        unknown = [d for d in deps if d not in stages]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {', '.join(unknown)}")
+
+    pending = dict(stages)
+    results = {}
+    timings = {}
+
+    def timed(func, inputs):
+        start = time.perf_counter()
+        result = func(inputs)
+        return result, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+
+        while pending or running:
+            ready = [name for name, (deps, _) in pending.items() if all(d in results for d in deps)]
+            for name in ready:
+                deps, func = pending.pop(name)
+                inputs = {d: results[d] for d in deps}
+                running[pool.submit(timed, func, inputs)] = name
+
+            if not running:
+                raise ValueError(f"Stage dependency cycle among: {', '.join(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name], timings[name] = future.result()
+
+    return results, timings
+
+# Quick test
+if __name__ == "__main__":
+    def sleeper(label, seconds):
+        def run(inputs):
+            time.sleep(seconds)
+            return f"{label}({', '.join(sorted(inputs))})"
+        return run
+
+    test_stages = {
+        'fetch': ([], sleeper('fetch', 0.1)),
+        'scout': (['fetch'], sleeper('scout', 0.1)),
+        'analyst': (['scout'], sleeper('analyst', 0.1)),
+        'homelab': (['analyst'], sleeper('homelab', 0.3)),
+        'work': (['analyst'], sleeper('work', 0.3)),
+        'format': (['homelab', 'work'], sleeper('format', 0.0)),
+    }
+
+    start = time.perf_counter()
+    test_results, test_timings = run_dag(test_stages)
+    elapsed = time.perf_counter() - start
+
+    print(test_results['format'])
+    for stage_name, seconds in test_timings.items():
+        print(f"  {stage_name:8s} {seconds:.2f}s")
+    print(f"  total    {elapsed:.2f}s (sequential would be {sum(test_timings.values()):.2f}s)")
+    assert elapsed < 0.8, "homelab and work should run concurrently"
+    print("All tests passed! ✅")
@@ -0,0 +1,139 @@
+"""
+Near-Duplicate Detection
+Collapses the same story reported by multiple sources into one entry (MinHash + LSH)
+"""
+
+import re
+import zlib
+import random
+from typing import List, Dict, Set
+
+# 64 permutations split into 16 bands of 4 rows: pairs with Jaccard
+# similarity around 0.5 or higher almost always share at least one band
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+MERSENNE_PRIME = (1 << 61) - 1
+
+_rng = random.Random(1337)  # Fixed seed: signatures must be stable across runs
+_PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+def shingles(text: str, k: int = 3) -> Set[int]:
+    """Hash word k-shingles of text (HTML stripped, lowercased)"""
+    words = _WORD_RE.findall(_TAG_RE.sub(' ', text).lower())
+    if len(words) < k:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + k]).encode('utf-8'))
+        for i in range(len(words) - k + 1)
+    }
+
+def minhash(shingle_set: Set[int]) -> List[int]:
+    """Compute the MinHash signature of a shingle set"""
+    if not shingle_set:
+        return [MERSENNE_PRIME] * NUM_PERM
+    return [
+        min((a * x + b) % MERSENNE_PRIME for x in shingle_set)
+        for a, b in _PERMUTATIONS
+    ]
+
+def estimate_similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Estimate Jaccard similarity from two MinHash signatures"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+def deduplicate(entries: List[Dict], threshold: float = 0.5) -> List[Dict]:
+    """
+    Collapse near-duplicate entries across sources
+
+    Candidate pairs come from LSH buckets, so cost grows with the number of
+    entries rather than the number of pairs; candidates are then confirmed
+    against the estimated Jaccard similarity of their title+summary shingles.
+
+    Args:
+        entries: Entry dicts from SourceFetcher
+        threshold: Minimum estimated similarity to treat two entries as duplicates
+
+    Returns:
+        One entry per cluster, in order of first appearance. Clustered entries
+        gain 'sources' (every contributing source name) and 'duplicates'
+        (source/title/link/guid of each collapsed entry).
+    """
+    signatures = [
+        minhash(shingles(f"{entry.get('title', '')} {entry.get('summary', '')}"))
+        for entry in entries
+    ]
+
+    # Union-find over entry indices
+    parent = list(range(len(entries)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    for i, sig in enumerate(signatures):
+        if not any(v != MERSENNE_PRIME for v in sig):
+            continue  # No text to compare
+        for band in range(BANDS):
+            key = (band, tuple(sig[band * ROWS:(band + 1) * ROWS]))
+            for j in buckets.setdefault(key, []):
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j and estimate_similarity(sig, signatures[j]) >= threshold:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+            buckets[key].append(i)
+
+    # Collapse clusters onto their earliest entry
+    clusters = {}
+    for i in range(len(entries)):
+        clusters.setdefault(find(i), []).append(i)
+
+    deduplicated = []
+    for root in sorted(clusters):
+        members = clusters[root]
+        representative = entries[root]
+        if len(members) > 1:
+            # copy() works on dicts and Entry objects and shares their strings
+            representative = representative.copy()
+            sources = []
+            for i in members:
+                if entries[i]['source'] not in sources:
+                    sources.append(entries[i]['source'])
+            representative['sources'] = sources
+            representative['duplicates'] = [
+                {
+                    'source': entries[i]['source'],
+                    'title': entries[i].get('title', ''),
+                    'link': entries[i].get('link', ''),
+                    'guid': entries[i].get('guid', '')
+                }
+                for i in members[1:]
+            ]
+        deduplicated.append(representative)
+
+    return deduplicated
+
+# Quick test
+if __name__ == "__main__":
+    test_entries = [
+        {'source': 'Latent Space', 'title': 'Anthropic releases Claude with 1M token context',
+         'summary': 'Anthropic today announced a new Claude model with a one million token context window, available in the API.'},
+        {'source': 'Import AI', 'title': 'Anthropic releases Claude with 1M token context',
+         'summary': 'Anthropic today announced a new Claude model with a one million token context window, now available in the API.'},
+        {'source': 'LocalLLaMA', 'title': 'Running Qwen on a single 3090',
+         'summary': 'A walkthrough of quantizing Qwen to 4 bits and serving it with llama.cpp on consumer hardware.'},
+    ]
+
+    result = deduplicate(test_entries)
+    print(f"{len(test_entries)} entries -> {len(result)} after dedup")
+    for entry in result:
+        print(f"  {entry['title']} | sources: {entry.get('sources', [entry['source']])}")
+    assert len(result) == 2
+    print("All tests passed! ✅")
@@ -0,0 +1,132 @@
+"""
+Fetched Entry
+Compact representation of one fetched feed/web item
+
+Entries are the bulk of what a large fetch holds in memory, so they use
+__slots__ instead of a per-item dict, intern their source name, and store
+content only when it differs from the summary. Dict-style access (entry['title'],
+entry.get('sources', ...), copy()) is kept so dedup, relevance, packing and
+the seen index work on entries and plain dicts alike.
+"""
+
+import sys
+from typing import Any, Dict, Iterator
+
+class Entry:
+    """One fetched item; behaves like a read/write mapping over a fixed set of keys"""
+
+    __slots__ = ('source', 'guid', 'title', 'link', 'summary', '_content', 'published', 'sources', 'duplicates', 'score')
+
+    # Keys in to_dict()/checkpoint order; the last three exist only once set
+    KEYS = ('source', 'guid', 'title', 'link', 'summary', 'published', 'content', 'sources', 'duplicates', 'score')
+    OPTIONAL_KEYS = frozenset(('sources', 'duplicates', 'score'))
+
+    def __init__(self, source: str, guid: str, title: str, link: str, summary: str, published: str, content: str = None):
+        # Every entry from a feed shares one copy of its source name
+        self.source = sys.intern(source)
+        self.guid = guid
+        self.title = title
+        self.link = link
+        self.summary = summary
+        self.published = published
+        self.content = content
+        self.sources = None
+        self.duplicates = None
+        self.score = None
+
+    @property
+    def content(self) -> str:
+        return self.summary if self._content is None else self._content
+
+    @content.setter
+    def content(self, value: str):
+        # Feeds often repeat the full HTML body as both summary and content
+        self._content = None if value is None or value == self.summary else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None and key in self.OPTIONAL_KEYS:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.KEYS:
+            raise KeyError(f"Entry has no field '{key}'")
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> Iterator[str]:
+        return (key for key in self.KEYS if key in self)
+
+    def copy(self) -> 'Entry':
+        """Shallow copy: the new entry shares every string with this one"""
+        clone = Entry.__new__(Entry)
+        for slot in self.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict (e.g. for JSON checkpoints)"""
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"Entry({self.source!r}, {self.title!r})"
+
+# Quick test
+if __name__ == "__main__":
+    import tracemalloc
+
+    body = "<p>" + "Long article body. " * 100 + "</p>"
+
+    def raw_items(count):
+        # feedparser hands back equal but distinct summary/content strings
+        for i in range(count):
+            yield f"Feed {i % 5}", f"id-{i}", f"Title {i}", f"https://example.com/{i}", body + str(i), (body + str(i))[:]
+
+    tracemalloc.start()
+    as_dicts = [
+        {'source': ''.join(source), 'guid': guid, 'title': title, 'link': link,
+         'summary': summary, 'published': 'Unknown', 'content': ''.join(list(content))}
+        for source, guid, title, link, summary, content in raw_items(5000)
+    ]
+    dict_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del as_dicts
+
+    tracemalloc.start()
+    as_entries = [
+        Entry(''.join(source), guid, title, link, summary, 'Unknown', ''.join(list(content)))
+        for source, guid, title, link, summary, content in raw_items(5000)
+    ]
+    entry_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"5000 items: dicts {dict_peak // 1024} KB peak, Entry {entry_peak // 1024} KB peak")
+    assert entry_peak < dict_peak * 0.7
+
+    entry = as_entries[7]
+    assert entry['content'] == entry['summary'] and entry._content is None
+    assert entry['source'] is as_entries[2]['source'], "source names should be interned"
+    assert entry.get('sources', ['fallback']) == ['fallback'] and 'score' not in entry
+
+    annotated = entry.copy()
+    annotated['score'] = 1.5
+    assert annotated['summary'] is entry['summary'] and entry.get('score') is None
+    assert list(annotated.to_dict()) == ['source', 'guid', 'title', 'link', 'summary', 'published', 'content', 'score']
+
+    distinct = Entry('Feed', 'g', 'T', 'l', 'short summary', 'Unknown', 'different full content')
+    assert distinct['content'] == 'different full content'
+    print("All tests passed! ✅")
@@ -0,0 +1,161 @@
+"""
+Streaming Feed Parser
+Yields RSS/Atom entries one at a time with incremental XML parsing
+
+Each entry is discarded from the parse tree once yielded, so peak memory
+depends on the largest entry rather than the feed size, and a caller that
+stops iterating early never reads the rest of the document. Malformed
+feeds raise xml.etree.ElementTree.ParseError; callers fall back to
+feedparser for those.
+"""
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional
+
+ENTRY_TAGS = {'item', 'entry'}
+PUBLISHED_TAGS = {'pubDate', 'published', 'issued', 'date'}
+UPDATED_TAGS = {'updated', 'modified'}
+
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an RFC 822 (RSS) or ISO 8601 (Atom, Dublin Core) date
+
+    Returns:
+        Naive UTC datetime (as feedparser's *_parsed fields), or None
+    """
+    if not value:
+        return None
+    value = value.strip()
+
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        parsed = None
+    if parsed is None:
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def _text(elem) -> str:
+    # Atom type="xhtml" content is child elements rather than text
+    if len(elem):
+        return ''.join(elem.itertext()).strip()
+    return (elem.text or '').strip()
+
+def _entry(elem) -> Dict:
+    """Normalize an <item>/<entry> element into a plain dict"""
+    fields = {'guid': '', 'title': '', 'link': '', 'summary': '', 'content': '', 'published': None, 'updated': None}
+
+    for child in elem:
+        name = _local(child.tag)
+        if name == 'title':
+            fields['title'] = _text(child)
+        elif name == 'link':
+            # Atom: <link rel="alternate" href="..."/>; RSS: <link>url</link>
+            href = child.get('href')
+            if href is None:
+                fields['link'] = fields['link'] or _text(child)
+            elif child.get('rel', 'alternate') == 'alternate' and not fields['link']:
+                fields['link'] = href
+        elif name in ('guid', 'id'):
+            fields['guid'] = _text(child)
+        elif name in ('description', 'summary'):
+            fields['summary'] = _text(child)
+        elif name in ('encoded', 'content'):
+            fields['content'] = fields['content'] or _text(child)
+        elif name in PUBLISHED_TAGS:
+            fields['published'] = fields['published'] or parse_date(child.text)
+        elif name in UPDATED_TAGS:
+            fields['updated'] = fields['updated'] or parse_date(child.text)
+
+    # Same fallbacks feedparser applies
+    fields['summary'] = fields['summary'] or fields['content']
+    fields['content'] = fields['content'] or fields['summary']
+    return fields
+
+def iter_entries(stream) -> Iterator[Dict]:
+    """
+    Stream entries from an RSS 2.0, RSS 1.0 or Atom document
+
+    Args:
+        stream: Binary file-like object (e.g. an HTTP response)
+
+    Yields:
+        {"guid", "title", "link", "summary", "content", "published", "updated"}
+        in document order; dates are naive UTC datetimes or None
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is not well-formed XML
+    """
+    stack = []
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        if _local(elem.tag) in ENTRY_TAGS:
+            yield _entry(elem)
+            # Detach the finished entry so the tree never holds more than one
+            if stack:
+                stack[-1].remove(elem)
+            elem.clear()
+
+# Quick test
+if __name__ == "__main__":
+    import io
+    import tracemalloc
+
+    def atom_feed(count):
+        entries = ''.join(
+            f"<entry><id>tag:test,{i}</id><title>Post {i}</title>"
+            f"<link rel='alternate' href='https://example.com/{i}'/>"
+            f"<published>2026-01-{31 - i % 30:02d}T12:00:00Z</published>"
+            f"<content type='html'>{'lorem ipsum ' * 200}</content></entry>"
+            for i in range(count)
+        )
+        return f"<?xml version='1.0'?><feed xmlns='http://www.w3.org/2005/Atom'>{entries}</feed>".encode()
+
+    rss = (
+        b"<rss version='2.0' xmlns:content='http://purl.org/rss/1.0/modules/content/'><channel><title>T</title>"
+        b"<item><title>Hello</title><link>https://example.com/hello</link>"
+        b"<pubDate>Mon, 02 Feb 2026 09:30:00 -0500</pubDate><description>Short</description>"
+        b"<content:encoded><![CDATA[<p>Long</p>]]></content:encoded></item></channel></rss>"
+    )
+    item = next(iter_entries(io.BytesIO(rss)))
+    assert item['title'] == 'Hello' and item['link'] == 'https://example.com/hello'
+    assert item['published'] == datetime(2026, 2, 2, 14, 30)
+    assert item['summary'] == 'Short' and item['content'] == '<p>Long</p>'
+
+    first = next(iter_entries(io.BytesIO(atom_feed(1))))
+    assert first['link'] == 'https://example.com/0' and first['published'] == datetime(2026, 1, 31, 12, 0)
+
+    peaks = {}
+    for count in (200, 2000):
+        document = atom_feed(count)
+        tracemalloc.start()
+        parsed = sum(1 for _ in iter_entries(io.BytesIO(document)))
+        peaks[count] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert parsed == count
+        print(f"{count:5d} entries ({len(document) // 1024} KB): peak parser memory {peaks[count] // 1024} KB")
+    assert peaks[2000] < peaks[200] * 2, "parser memory should not grow with feed size"
+
+    try:
+        list(iter_entries(io.BytesIO(b"<rss><channel><item><title>&nbsp;</title></item></channel></rss>")))
+        raise AssertionError("malformed feed should raise ParseError")
+    except ET.ParseError:
+        pass
+
+    print("All tests passed! ✅")
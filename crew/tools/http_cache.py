@@ -0,0 +1,97 @@
+"""
+HTTP Cache Utilities
+Persists conditional-GET validators (ETag / Last-Modified) and content hashes between runs
+"""
+
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+class ValidatorStore:
+    """On-disk store of HTTP validators keyed by URL"""
+
+    def __init__(self, path: str):
+        """
+        Load validators from disk (missing or corrupt file starts empty)
+
+        Args:
+            path: JSON file holding {url: {"etag": ..., "last_modified": ..., "content_hash": ...}}
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._validators = {}
+        self._dirty = False
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self._validators = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[ValidatorStore] Ignoring unreadable cache {path}: {str(e)}")
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a URL"""
+        with self._lock:
+            validators = self._validators.get(url, {})
+
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def update(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """Record validators from a 200 response (no-op if the server sent none)"""
+        if not etag and not last_modified:
+            return
+
+        with self._lock:
+            self._validators.setdefault(url, {}).update({
+                'etag': etag,
+                'last_modified': last_modified,
+                'updated_at': datetime.now().isoformat()
+            })
+            self._dirty = True
+
+    def content_changed(self, url: str, body: bytes) -> bool:
+        """
+        Compare a 200 response body with the last one seen for the URL
+
+        Catches unchanged pages from servers that ignore conditional GET.
+        The new hash is recorded either way.
+        """
+        content_hash = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            entry = self._validators.setdefault(url, {})
+            if entry.get('content_hash') == content_hash:
+                return False
+            entry['content_hash'] = content_hash
+            self._dirty = True
+        return True
+
+    def save(self):
+        """
+        Write validators to disk atomically
+
+        Call only after the fetched content has been processed: once saved,
+        the next run will get 304 (or a matching content hash) for unchanged
+        sources and skip their entries.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self._validators)
+            self._dirty = False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,349 @@
+"""
+HTTP Session
+Keep-alive connection pool for source fetches, with compression and retries
+
+One TLS handshake per host rather than per request, gzip/deflate negotiated
+and decoded on the fly, and transient failures (connection errors, timeouts,
+429/5xx) retried with capped exponential backoff inside a per-request time
+budget, so a one-off blip no longer drops a whole source from the digest.
+"""
+
+import time
+import zlib
+import random
+import http.client
+import threading
+from typing import Callable, Dict, Optional
+from urllib.parse import urljoin, urlparse
+
+USER_AGENT = "Mozilla/5.0 (compatible; CrewAI-Strategist/1.0)"
+
+MAX_REDIRECTS = 5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+READ_CHUNK_BYTES = 64 * 1024
+
+class HttpResponse:
+    """
+    Response whose body is streamed and decompressed on read()
+
+    Use as a context manager (or call close()): a fully read body hands its
+    connection back to the pool, a partly read one closes it.
+    """
+
+    def __init__(self, url: str, raw: http.client.HTTPResponse, release: Callable[[bool], None], session):
+        self.url = url
+        self.status = raw.status
+        self.headers = {k.lower(): v for k, v in raw.getheaders()}
+        self.body = None  # set by HttpSession.get()
+        self._raw = raw
+        self._release = release
+        self._session = session
+        self._buffer = bytearray()
+        self._eof = False
+
+        encoding = self.headers.get('content-encoding', '').lower()
+        # 32 + MAX_WBITS: accept both gzip and zlib-wrapped deflate
+        self._decoder = zlib.decompressobj(32 + zlib.MAX_WBITS) if encoding in ('gzip', 'deflate') else None
+
+    def _fill(self, size: int):
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = self._raw.read(READ_CHUNK_BYTES)
+            self._session._count('bytes_received', len(chunk))
+            if not chunk:
+                self._eof = True
+                if self._decoder:
+                    self._buffer += self._decoder.flush()
+                break
+            self._buffer += self._decoder.decompress(chunk) if self._decoder else chunk
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size decoded bytes (all remaining if size < 0)"""
+        self._fill(size)
+        # In-place append and front delete: the rest of the buffer is not recopied per chunk
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return data
+
+    def close(self):
+        if self._release is not None:
+            self._release(self._eof)
+            self._release = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class HttpSession:
+    """Thread-safe pool of persistent HTTP(S) connections, keyed by scheme and host"""
+
+    def __init__(
+        self,
+        timeout: float = 30,
+        max_idle_per_host: int = 2,
+        retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8,
+        time_budget: float = 90,
+        user_agent: str = USER_AGENT
+    ):
+        """
+        Args:
+            timeout: Socket timeout per attempt in seconds
+            max_idle_per_host: Idle connections kept open per host
+            retries: Retries after the first attempt for transient failures
+            backoff_base: First retry delay in seconds (doubles each retry, with jitter)
+            backoff_max: Cap on a single retry delay in seconds
+            time_budget: Total seconds for one request including retries and redirects
+            user_agent: User-Agent sent with every request
+        """
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.time_budget = time_budget
+        self.user_agent = user_agent
+        self.stats = {'requests': 0, 'connections_opened': 0, 'retries': 0, 'bytes_received': 0}
+        self._idle = {}  # (scheme, netloc) -> [connection, ...]
+        self._lock = threading.Lock()
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._lock:
+            self.stats[stat] += amount
+
+    def _connect(self, scheme: str, netloc: str, timeout: float):
+        self._count('connections_opened')
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection_class(netloc, timeout=timeout)
+
+    def _checkout(self, scheme: str, netloc: str, timeout: float):
+        """Reuse an idle connection to the host, or open a new one; returns (connection, reused)"""
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            connection = idle.pop() if idle else None
+        if connection is None:
+            return self._connect(scheme, netloc, timeout), False
+
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection, True
+
+    def _checkin(self, scheme: str, netloc: str, connection):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _open_once(self, url: str, headers: Dict[str, str], timeout: float) -> HttpResponse:
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        path = parsed.path or '/'
+        if parsed.query:
+            path = f"{path}?{parsed.query}"
+
+        request_headers = {'User-Agent': self.user_agent, 'Accept-Encoding': 'gzip, deflate'}
+        request_headers.update(headers)
+
+        self._count('requests')
+        connection, reused = self._checkout(parsed.scheme, parsed.netloc, timeout)
+        try:
+            try:
+                connection.request('GET', path, headers=request_headers)
+                raw = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; retry at once on a fresh one
+                connection.close()
+                connection = self._connect(parsed.scheme, parsed.netloc, timeout)
+                connection.request('GET', path, headers=request_headers)
+                raw = connection.getresponse()
+        except Exception:
+            connection.close()
+            raise
+
+        def release(fully_read: bool):
+            if fully_read and not raw.will_close:
+                self._checkin(parsed.scheme, parsed.netloc, connection)
+            else:
+                connection.close()
+
+        return HttpResponse(url, raw, release, self)
+
+    def _backoff(self, attempt: int, response: Optional[HttpResponse] = None) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+        # Honour a numeric Retry-After on 429/503, within the same cap
+        retry_after = response.headers.get('retry-after', '') if response else ''
+        if retry_after.isdigit():
+            delay = min(self.backoff_max, max(delay, float(retry_after)))
+        return delay
+
+    def _request(self, url: str, headers: Optional[Dict[str, str]], read_body: bool) -> HttpResponse:
+        headers = headers or {}
+        deadline = time.monotonic() + self.time_budget
+        attempt = 0
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Time budget of {self.time_budget}s exhausted fetching {url}")
+
+            response = None
+            error = None
+            try:
+                target = url
+                for _ in range(MAX_REDIRECTS + 1):
+                    response = self._open_once(target, headers, min(self.timeout, max(remaining, 0.1)))
+                    location = response.headers.get('location')
+                    if response.status not in (301, 302, 303, 307, 308) or not location:
+                        break
+                    response.read()
+                    response.close()
+                    target = urljoin(target, location)
+                    remaining = deadline - time.monotonic()
+                else:
+                    raise http.client.HTTPException(f"Too many redirects fetching {url}")
+
+                if response.status not in RETRY_STATUSES:
+                    if read_body:
+                        with response:
+                            response.body = response.read()
+                    return response
+            except (OSError, http.client.HTTPException, zlib.error) as e:
+                # socket timeouts and connection errors are OSErrors
+                if response is not None:
+                    response.close()
+                error = e
+
+            if attempt >= self.retries:
+                if error is not None:
+                    raise error
+                # Out of retries on a 429/5xx: hand the caller the error response
+                if read_body:
+                    with response:
+                        response.body = response.read()
+                return response
+
+            delay = self._backoff(attempt, None if error else response)
+            if error is None:
+                # Drain the (small) error body so the connection can be reused
+                with response:
+                    response.read()
+            if time.monotonic() + delay >= deadline:
+                if error is not None:
+                    raise error
+                raise TimeoutError(f"Time budget of {self.time_budget}s exhausted fetching {url} (HTTP {response.status})")
+
+            print(f"[HttpSession] Retrying {url} in {delay:.1f}s ({error or f'HTTP {response.status}'})")
+            self._count('retries')
+            time.sleep(delay)
+            attempt += 1
+
+    def open(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        """
+        GET a URL for streaming, following redirects and retrying transient failures
+
+        Args:
+            url: http(s) URL
+            headers: Extra request headers (e.g. conditional-GET validators)
+
+        Returns:
+            HttpResponse positioned at the start of the (decoded) body; the
+            caller must close it. Non-retryable statuses (including 304 and
+            4xx) are returned rather than raised.
+
+        Raises:
+            OSError / http.client.HTTPException: Connection failures that
+                persisted through every retry
+            TimeoutError: The time budget ran out
+        """
+        return self._request(url, headers, read_body=False)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        """Like open(), but reads the whole body into response.body (retrying failed reads too)"""
+        return self._request(url, headers, read_body=True)
+
+    def close(self):
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+# Quick test
+if __name__ == "__main__":
+    import gzip
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    calls = {'flaky': 0}
+
+    class TestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == '/flaky':
+                calls['flaky'] += 1
+                if calls['flaky'] < 3:
+                    self.send_response(503)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+            if self.path == '/moved':
+                self.send_response(301)
+                self.send_header('Location', '/doc')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            body = b'<rss>' + b'<item>hello</item>' * 500 + b'</rss>'
+            self.send_response(200)
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body)
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    session = HttpSession(backoff_base=0.05)
+    for path in ('/doc', '/doc', '/moved', '/flaky'):
+        response = session.get(base + path)
+        assert response.status == 200 and response.body.startswith(b'<rss><item>hello'), path
+
+    with session.open(base + '/doc') as streamed:
+        assert streamed.read(5) == b'<rss>'
+        assert streamed.read().endswith(b'</rss>')
+
+    print(f"Session stats: {session.stats}")
+    assert session.stats['connections_opened'] == 1, "keep-alive should reuse one connection"
+    assert session.stats['retries'] == 2
+    assert session.stats['bytes_received'] < 6 * 1000, "body should arrive gzip-compressed"
+
+    session.time_budget = 0.2
+    session.backoff_base = 1
+    calls['flaky'] = 0
+    try:
+        session.get(base + '/flaky')
+        raise AssertionError("retries past the time budget should fail")
+    except TimeoutError:
+        pass
+
+    server.shutdown()
+    print("All tests passed! ✅")
@@ -0,0 +1,276 @@
+"""
+Catalyst Job Queue
+Durable, deduplicated record of deliverable jobs
+
+One job per (digest_date, opp_id, type): however many times it is approved,
+the deliverable is generated once and later submissions get the stored
+result. Every submission is recorded by its Slack reply ts, so the same reply
+seen twice (a re-poll, a redelivered event) is recognized as a duplicate.
+Jobs move queued -> running -> done | failed; a failed job (or a running one
+whose process died) is picked up again by the next submission.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+JOBS_PATH = "cache/jobs.db"
+
+# A running job not finished after this long is assumed to have died with its process
+STALE_SECONDS = 1800
+
+class JobQueue:
+    """SQLite-backed (WAL) queue shared by catalyst.py, the crew worker and the approval intake"""
+
+    def __init__(self, path: str = JOBS_PATH, stale_seconds: float = STALE_SECONDS, timeout: float = 30):
+        """
+        Open (or create) the queue
+
+        Args:
+            path: SQLite database file
+            stale_seconds: Age after which a running job may be claimed again
+            timeout: Seconds to wait for another process's write lock
+        """
+        self.path = path
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Autocommit: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " digest_date TEXT NOT NULL,"
+            " opp_id TEXT NOT NULL,"
+            " type TEXT NOT NULL,"
+            " state TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " context TEXT,"
+            " result TEXT,"
+            " created_at TEXT NOT NULL,"
+            " updated_at TEXT NOT NULL,"
+            " PRIMARY KEY (digest_date, opp_id, type)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state, updated_at);"
+            "CREATE TABLE IF NOT EXISTS submissions ("
+            " digest_date TEXT NOT NULL,"
+            " opp_id TEXT NOT NULL,"
+            " type TEXT NOT NULL,"
+            " reply_ts TEXT NOT NULL,"
+            " submitted_at TEXT NOT NULL,"
+            " PRIMARY KEY (digest_date, opp_id, type, reply_ts)) WITHOUT ROWID;"
+        )
+
+    def _transaction(self, work):
+        """Run work() inside BEGIN IMMEDIATE so check-then-write is atomic across processes"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = work()
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return value
+
+    def _stale_cutoff(self) -> str:
+        return (datetime.now() - timedelta(seconds=self.stale_seconds)).isoformat()
+
+    def submit(
+        self,
+        digest_date: str,
+        opp_id: str,
+        deliverable_type: str,
+        reply_ts: str = "",
+        context: Dict[str, Any] = None,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Record a request for a deliverable, creating its job if needed
+
+        Args:
+            digest_date / opp_id / deliverable_type: The job key
+            reply_ts: Slack ts of the approval reply ('' for manual runs,
+                which are never treated as duplicate replies)
+            context: JSON-serializable data kept with a new job (e.g. the
+                Slack channel and thread to post the result to)
+            force: Queue a finished (done or failed) job again so it is regenerated
+
+        Returns:
+            {"duplicate_reply": bool (this reply ts was already submitted),
+             "created": bool (the job was newly queued), "job": get() of the job}
+        """
+        now = datetime.now().isoformat()
+
+        def work():
+            duplicate_reply = False
+            if reply_ts:
+                duplicate_reply = self._conn.execute(
+                    "INSERT OR IGNORE INTO submissions VALUES (?, ?, ?, ?, ?)",
+                    (digest_date, opp_id, deliverable_type, reply_ts, now)
+                ).rowcount == 0
+            created = self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (digest_date, opp_id, type, state, context, created_at, updated_at)"
+                " VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (digest_date, opp_id, deliverable_type, json.dumps(context) if context else None, now, now)
+            ).rowcount > 0
+            if force and not created:
+                created = self._conn.execute(
+                    "UPDATE jobs SET state = 'queued', updated_at = ? WHERE digest_date = ? AND opp_id = ? AND type = ?"
+                    " AND state IN ('done', 'failed')",
+                    (now, digest_date, opp_id, deliverable_type)
+                ).rowcount > 0
+            return duplicate_reply, created
+
+        duplicate_reply, created = self._transaction(work)
+        return {
+            "duplicate_reply": duplicate_reply,
+            "created": created,
+            "job": self.get(digest_date, opp_id, deliverable_type)
+        }
+
+    def claim(self, digest_date: str, opp_id: str, deliverable_type: str) -> bool:
+        """
+        Take a job to run it; only one caller (in any process) wins
+
+        Returns:
+            True if the job was queued, failed or stale and is now running
+            for this caller; False if it is done or running elsewhere
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET state = 'running', attempts = attempts + 1, updated_at = ?"
+                " WHERE digest_date = ? AND opp_id = ? AND type = ?"
+                " AND (state IN ('queued', 'failed') OR (state = 'running' AND updated_at < ?))",
+                (now, digest_date, opp_id, deliverable_type, self._stale_cutoff())
+            ).rowcount > 0
+
+    def _finish(self, digest_date: str, opp_id: str, deliverable_type: str, state: str, result: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, result = ?, updated_at = ? WHERE digest_date = ? AND opp_id = ? AND type = ?",
+                (state, json.dumps(result), datetime.now().isoformat(), digest_date, opp_id, deliverable_type)
+            )
+
+    def complete(self, digest_date: str, opp_id: str, deliverable_type: str, result: Dict[str, Any]):
+        """Mark a claimed job done, keeping its result for later submissions"""
+        self._finish(digest_date, opp_id, deliverable_type, 'done', result)
+
+    def fail(self, digest_date: str, opp_id: str, deliverable_type: str, result: Dict[str, Any]):
+        """Mark a claimed job failed (the next submission runs it again)"""
+        self._finish(digest_date, opp_id, deliverable_type, 'failed', result)
+
+    @staticmethod
+    def _row_to_job(row) -> Dict[str, Any]:
+        digest_date, opp_id, deliverable_type, state, attempts, context, result, created_at, updated_at = row
+        return {
+            "digest_date": digest_date,
+            "opp_id": opp_id,
+            "type": deliverable_type,
+            "state": state,
+            "attempts": attempts,
+            "context": json.loads(context) if context else None,
+            "result": json.loads(result) if result else None,
+            "created_at": created_at,
+            "updated_at": updated_at
+        }
+
+    def get(self, digest_date: str, opp_id: str, deliverable_type: str) -> Optional[Dict[str, Any]]:
+        """
+        A job, or None if never submitted
+
+        Returns:
+            {"digest_date", "opp_id", "type", "state", "attempts", "context",
+             "result", "created_at", "updated_at"}
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest_date, opp_id, type, state, attempts, context, result, created_at, updated_at"
+                " FROM jobs WHERE digest_date = ? AND opp_id = ? AND type = ?",
+                (digest_date, opp_id, deliverable_type)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def wait(self, digest_date: str, opp_id: str, deliverable_type: str, timeout: float = None, poll: float = 1.0) -> Dict[str, Any]:
+        """Block until a job running elsewhere is done or failed (or timeout seconds pass); returns the job"""
+        deadline = time.monotonic() + (self.stale_seconds if timeout is None else timeout)
+        while True:
+            job = self.get(digest_date, opp_id, deliverable_type)
+            if job['state'] in ('done', 'failed') or time.monotonic() >= deadline:
+                return job
+            time.sleep(poll)
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Queued jobs and stale running ones, oldest first (to resume after a restart)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT digest_date, opp_id, type, state, attempts, context, result, created_at, updated_at"
+                " FROM jobs WHERE state = 'queued' OR (state = 'running' AND updated_at < ?)"
+                " ORDER BY created_at",
+                (self._stale_cutoff(),)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+# Quick test
+if __name__ == "__main__":
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    test_dir = tempfile.mkdtemp()
+    db_path = os.path.join(test_dir, 'jobs.db')
+    queue = JobQueue(db_path)
+
+    first = queue.submit('2026-02-02', 'H1', 'plan', '1770000100.1', context={'thread_ts': '1770000000.1'})
+    assert first['created'] and not first['duplicate_reply'] and first['job']['state'] == 'queued'
+    # Same reply seen twice: a duplicate, and the job is not recreated
+    again = queue.submit('2026-02-02', 'H1', 'plan', '1770000100.1')
+    assert again['duplicate_reply'] and not again['created']
+    assert [job['opp_id'] for job in queue.pending()] == ['H1']
+
+    # Racing runners in separate connections: exactly one claims the job
+    runners = [JobQueue(db_path) for _ in range(6)]
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        claims = list(pool.map(lambda q: q.claim('2026-02-02', 'H1', 'plan'), runners))
+    assert claims.count(True) == 1
+    assert not queue.claim('2026-02-02', 'H1', 'plan') and queue.pending() == []
+
+    # Re-approval (new reply) while running, then after completion: no new job, stored result returned
+    threading.Timer(0.2, queue.complete, ('2026-02-02', 'H1', 'plan', {'success': True, 'deliverable_file': 'x.json'})).start()
+    second = queue.submit('2026-02-02', 'H1', 'plan', '1770000200.1')
+    assert not second['duplicate_reply'] and not second['created'] and second['job']['state'] == 'running'
+    done = queue.wait('2026-02-02', 'H1', 'plan', poll=0.05)
+    assert done['state'] == 'done' and done['result']['deliverable_file'] == 'x.json' and done['attempts'] == 1
+    assert done['context'] == {'thread_ts': '1770000000.1'}
+    assert not queue.claim('2026-02-02', 'H1', 'plan')
+
+    # A failed job is retried by the next claim; force regenerates a finished one
+    queue.submit('2026-02-02', 'W1', 'brief')
+    assert queue.claim('2026-02-02', 'W1', 'brief')
+    queue.fail('2026-02-02', 'W1', 'brief', {'success': False, 'error': 'timeout'})
+    assert queue.claim('2026-02-02', 'W1', 'brief')
+    queue.complete('2026-02-02', 'W1', 'brief', {'success': True})
+    assert queue.submit('2026-02-02', 'W1', 'brief', force=True)['job']['state'] == 'queued'
+
+    # A running job whose process died is picked up again once stale
+    queue.submit('2026-02-02', 'W2', 'slide')
+    assert queue.claim('2026-02-02', 'W2', 'slide')
+    stale = JobQueue(db_path, stale_seconds=0)
+    time.sleep(0.01)
+    assert 'W2' in [job['opp_id'] for job in stale.pending()] and stale.claim('2026-02-02', 'W2', 'slide')
+
+    for q in runners + [queue, stale]:
+        q.close()
+    print("All tests passed! ✅")
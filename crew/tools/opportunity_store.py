@@ -0,0 +1,376 @@
+"""
+Opportunity Store
+Indexed, cross-date store of digest opportunities and their approval status
+
+Replaces reading a whole output/opportunities_{date}.json to look up one ID.
+Opportunities are keyed by (digest_date, opp_id), with secondary indexes on
+a normalized title hash (the same opportunity resurfacing on another date)
+and on status. The database runs in WAL mode, so parallel Catalyst runs read
+while a digest is being written. export_json() still writes the per-date
+JSON file that the n8n workflows read.
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+STORE_PATH = "cache/opportunities.db"
+
+STATUSES = ('pending', 'approved', 'dismissed', 'delivered')
+
+def title_hash(title: str) -> str:
+    """Hash a title, ignoring case and whitespace, into a compact key"""
+    normalized = ' '.join(title.lower().split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+class OpportunityStore:
+    """SQLite-backed opportunity mapping for every digest"""
+
+    def __init__(self, path: str = STORE_PATH, timeout: float = 30):
+        """
+        Open (or create) the store
+
+        Args:
+            path: SQLite database file
+            timeout: Seconds to wait for another process's write lock
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        # Readers never block the digest writer (or each other) in WAL mode
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS digests ("
+            " digest_date TEXT PRIMARY KEY,"
+            " digest_message_ts TEXT NOT NULL DEFAULT '',"
+            " created_at TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS opportunities ("
+            " digest_date TEXT NOT NULL,"
+            " opp_id TEXT NOT NULL,"
+            " position INTEGER NOT NULL,"
+            " title_hash TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " data TEXT NOT NULL,"
+            " updated_at TEXT NOT NULL,"
+            " PRIMARY KEY (digest_date, opp_id)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS digests_message_ts ON digests(digest_message_ts);"
+            "CREATE INDEX IF NOT EXISTS opportunities_title_hash ON opportunities(title_hash);"
+            "CREATE INDEX IF NOT EXISTS opportunities_status ON opportunities(status, digest_date);"
+        )
+        self._conn.commit()
+
+    def save_digest(self, digest_date: str, opportunities: Dict[str, Dict[str, Any]], digest_message_ts: str = ""):
+        """
+        Store (or replace) the opportunities of one digest
+
+        A rerun of the same digest keeps the status of opportunities whose
+        title is unchanged; the rest start as 'pending'.
+
+        Args:
+            digest_date: YYYY-MM-DD
+            opportunities: {"H1": {"title": ..., ...}, "W1": {...}} as from parse_opportunities
+            digest_message_ts: Slack message timestamp (kept if empty and already set)
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (digest_date, opp_id, position, title_hash(opportunity.get('title', '')), json.dumps(opportunity), now)
+            for position, (opp_id, opportunity) in enumerate(opportunities.items())
+        ]
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO digests (digest_date, digest_message_ts, created_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(digest_date) DO UPDATE SET created_at = excluded.created_at,"
+                " digest_message_ts = CASE WHEN excluded.digest_message_ts != ''"
+                " THEN excluded.digest_message_ts ELSE digest_message_ts END",
+                (digest_date, digest_message_ts, now)
+            )
+            self._conn.execute(
+                f"DELETE FROM opportunities WHERE digest_date = ? AND opp_id NOT IN ({','.join('?' * len(rows))})",
+                (digest_date, *opportunities)
+            )
+            self._conn.executemany(
+                "INSERT INTO opportunities (digest_date, opp_id, position, title_hash, data, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(digest_date, opp_id) DO UPDATE SET"
+                " position = excluded.position, data = excluded.data, updated_at = excluded.updated_at,"
+                " status = CASE WHEN title_hash = excluded.title_hash THEN status ELSE 'pending' END,"
+                " title_hash = excluded.title_hash",
+                rows
+            )
+
+    def set_message_ts(self, digest_date: str, digest_message_ts: str, overwrite: bool = True) -> bool:
+        """
+        Record the Slack timestamp of a posted digest
+
+        Args:
+            digest_date: Digest date (YYYY-MM-DD)
+            digest_message_ts: Slack message timestamp
+            overwrite: Replace a timestamp already recorded (False: only fill it in once)
+
+        Returns:
+            False if the digest is unknown (or already has a timestamp and overwrite is False)
+        """
+        where = "digest_date = ?" if overwrite else "digest_date = ? AND digest_message_ts = ''"
+        with self._lock, self._conn:
+            return self._conn.execute(
+                f"UPDATE digests SET digest_message_ts = ? WHERE {where}",
+                (digest_message_ts, digest_date)
+            ).rowcount > 0
+
+    def find_digest(self, digest_message_ts: str) -> Optional[str]:
+        """Date of the digest posted as a Slack message, or None if unknown"""
+        if not digest_message_ts:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest_date FROM digests WHERE digest_message_ts = ?", (digest_message_ts,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def has_digest(self, digest_date: str) -> bool:
+        """Check whether a digest's opportunities are in the store"""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM digests WHERE digest_date = ?", (digest_date,)).fetchone()
+        return row is not None
+
+    def get(self, digest_date: str, opp_id: str) -> Optional[Dict[str, Any]]:
+        """One opportunity's data, or None if it does not exist"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM opportunities WHERE digest_date = ? AND opp_id = ?",
+                (digest_date, opp_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_status(self, digest_date: str, opp_id: str) -> Optional[str]:
+        """An opportunity's status, or None if it does not exist"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM opportunities WHERE digest_date = ? AND opp_id = ?",
+                (digest_date, opp_id)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_digest(self, digest_date: str) -> Dict[str, Dict[str, Any]]:
+        """All opportunities of a digest in their original order ({} if unknown)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT opp_id, data FROM opportunities WHERE digest_date = ? ORDER BY position",
+                (digest_date,)
+            ).fetchall()
+        return {opp_id: json.loads(data) for opp_id, data in rows}
+
+    def digest(self, digest_date: str) -> 'DigestView':
+        """Read-only mapping over one digest that looks up each ID on demand"""
+        return DigestView(self, digest_date)
+
+    def set_status(self, digest_date: str, opp_id: str, status: str) -> bool:
+        """
+        Move an opportunity to a new status
+
+        Args:
+            status: 'pending', 'approved', 'dismissed' or 'delivered'
+
+        Returns:
+            False if the opportunity does not exist
+        """
+        if status not in STATUSES:
+            raise ValueError(f"Unknown opportunity status '{status}' (expected one of {', '.join(STATUSES)})")
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE opportunities SET status = ?, updated_at = ? WHERE digest_date = ? AND opp_id = ?",
+                (status, datetime.now().isoformat(), digest_date, opp_id)
+            ).rowcount > 0
+
+    def _records(self, where: str, params: tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT digest_date, opp_id, status, updated_at, data FROM opportunities"
+                f" WHERE {where} ORDER BY digest_date, position",
+                params
+            ).fetchall()
+        return [
+            {'digest_date': digest_date, 'opp_id': opp_id, 'status': status,
+             'updated_at': updated_at, 'opportunity': json.loads(data)}
+            for digest_date, opp_id, status, updated_at, data in rows
+        ]
+
+    def find_by_title(self, title: str) -> List[Dict[str, Any]]:
+        """
+        Every digest an opportunity with this title appeared in
+
+        Returns:
+            [{"digest_date", "opp_id", "status", "updated_at", "opportunity"}, ...] oldest first
+        """
+        return self._records("title_hash = ?", (title_hash(title),))
+
+    def by_status(self, status: str, digest_date: str = None) -> List[Dict[str, Any]]:
+        """Opportunities with a status, optionally for one digest (same records as find_by_title)"""
+        if digest_date is None:
+            return self._records("status = ?", (status,))
+        return self._records("status = ? AND digest_date = ?", (status, digest_date))
+
+    def export_json(self, digest_date: str, output_file: str = None) -> str:
+        """
+        Write a digest as the opportunities_{date}.json file n8n reads
+
+        Args:
+            digest_date: YYYY-MM-DD
+            output_file: Path to write (default: output/opportunities_{date}.json)
+
+        Returns:
+            Path to the written file
+        """
+        if output_file is None:
+            output_file = f"output/opportunities_{digest_date}.json"
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest_message_ts, created_at FROM digests WHERE digest_date = ?", (digest_date,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"No opportunities stored for digest {digest_date}")
+
+        payload = {
+            "digest_date": digest_date,
+            "digest_message_ts": row[0],
+            "created_at": row[1],
+            "opportunities": self.get_digest(digest_date)
+        }
+        with open(output_file, 'w') as f:
+            json.dump(payload, f, indent=2)
+        return output_file
+
+    def import_json(self, mapping_file: str) -> str:
+        """Load an existing opportunities_{date}.json into the store; returns its digest date"""
+        with open(mapping_file, 'r') as f:
+            data = json.load(f)
+        self.save_digest(data['digest_date'], data['opportunities'], data.get('digest_message_ts', ''))
+        return data['digest_date']
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+class DigestView(Mapping):
+    """Mapping of opp_id -> opportunity for one digest, backed by indexed lookups"""
+
+    def __init__(self, store: OpportunityStore, digest_date: str):
+        self.store = store
+        self.digest_date = digest_date
+
+    def __getitem__(self, opp_id: str) -> Dict[str, Any]:
+        opportunity = self.store.get(self.digest_date, opp_id)
+        if opportunity is None:
+            raise KeyError(opp_id)
+        return opportunity
+
+    def __contains__(self, opp_id) -> bool:
+        return self.store.get_status(self.digest_date, opp_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.get_digest(self.digest_date))
+
+    def __len__(self) -> int:
+        return len(self.store.get_digest(self.digest_date))
+
+# Quick test
+if __name__ == "__main__":
+    import time
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    test_dir = tempfile.mkdtemp()
+    db_path = os.path.join(test_dir, 'opportunities.db')
+    store = OpportunityStore(db_path)
+
+    day_one = {
+        'H1': {'title': 'Local LLM Fine-tuning', 'relevance': 'AI Box', 'signal': 's', 'next_steps': 'n', 'full_text': 'f'},
+        'W1': {'title': 'Code Review Patterns', 'relevance': 'Team velocity', 'signal': 's', 'next_steps': 'n', 'full_text': 'f'},
+    }
+    store.save_digest('2026-02-01', day_one)
+    store.save_digest('2026-02-02', {
+        'W1': {'title': 'code review  patterns', 'relevance': 'Still relevant'},
+        'H1': {'title': 'Tailscale ACLs'},
+        'H2': {'title': 'Proxmox Backup'},
+    })
+
+    assert store.get('2026-02-01', 'H1')['relevance'] == 'AI Box'
+    assert store.get('2026-02-01', 'H9') is None
+    assert list(store.get_digest('2026-02-02')) == ['W1', 'H1', 'H2'], "digest order should be preserved"
+    assert [r['digest_date'] for r in store.find_by_title('Code Review Patterns')] == ['2026-02-01', '2026-02-02']
+
+    assert store.set_status('2026-02-02', 'H1', 'approved')
+    assert store.set_status('2026-02-02', 'H2', 'dismissed')
+    assert not store.set_status('2026-02-02', 'H9', 'approved')
+    try:
+        store.set_status('2026-02-02', 'H1', 'archived')
+        raise AssertionError("unknown statuses should be rejected")
+    except ValueError:
+        pass
+    assert [r['opp_id'] for r in store.by_status('pending', '2026-02-02')] == ['W1']
+
+    # Rerunning a digest keeps the status of unchanged opportunities only
+    store.save_digest('2026-02-02', {'H1': {'title': 'Tailscale ACLs'}, 'H2': {'title': 'Something new'}})
+    assert store.get_status('2026-02-02', 'H1') == 'approved'
+    assert store.get_status('2026-02-02', 'H2') == 'pending'
+    assert store.get('2026-02-02', 'W1') is None
+
+    # Export shim: same shape as save_opportunity_mapping's JSON, and round-trips
+    store.set_message_ts('2026-02-01', '1738400000.000100')
+    assert store.find_digest('1738400000.000100') == '2026-02-01' and store.find_digest('') is None
+    assert not store.set_message_ts('2026-02-01', '1738499999.000100', overwrite=False), "a recorded ts is kept"
+    assert store.set_message_ts('2026-02-02', '1738500000.000100', overwrite=False)
+    assert store.find_digest('1738400000.000100') == '2026-02-01'
+    exported = store.export_json('2026-02-01', os.path.join(test_dir, 'opportunities_2026-02-01.json'))
+    with open(exported) as f:
+        payload = json.load(f)
+    assert list(payload) == ['digest_date', 'digest_message_ts', 'created_at', 'opportunities']
+    assert payload['opportunities'] == day_one and payload['digest_message_ts'] == '1738400000.000100'
+
+    view = store.digest('2026-02-01')
+    assert 'H1' in view and 'H9' not in view and view['W1']['title'] == 'Code Review Patterns'
+    assert dict(view) == day_one
+
+    # Lookup cost does not grow with the number of stored digests
+    for day in range(200):
+        store.save_digest(f"2025-{day // 28 + 1:02d}-{day % 28 + 1:02d}",
+                          {f"H{i}": {'title': f"Opportunity {day}-{i}", 'full_text': 'x' * 2000} for i in range(1, 11)})
+    start = time.perf_counter()
+    for _ in range(2000):
+        store.get('2026-02-01', 'W1')
+    print(f"2000 lookups across {len(store.by_status('pending'))} opportunities: {time.perf_counter() - start:.3f}s")
+
+    # Concurrent readers (another process's connection) alongside a writer
+    readers = [OpportunityStore(db_path) for _ in range(4)]
+
+    def read_many(reader):
+        return sum(reader.get('2026-02-01', 'H1') is not None for _ in range(300))
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        reads = [pool.submit(read_many, reader) for reader in readers]
+        for day in range(20):
+            store.save_digest(f"2026-03-{day + 1:02d}", {'H1': {'title': f"Write {day}"}})
+        assert [r.result() for r in reads] == [300] * 4
+    with readers[0]._lock:
+        assert readers[0]._conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+    reimported = OpportunityStore(os.path.join(test_dir, 'reimported.db'))
+    assert reimported.import_json(exported) == '2026-02-01'
+    assert reimported.get_digest('2026-02-01') == day_one
+
+    for s in readers + [store, reimported]:
+        s.close()
+    print("All tests passed! ✅")
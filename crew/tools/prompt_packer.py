@@ -0,0 +1,111 @@
+"""
+Prompt Packer
+Fits fetched entries into a Scout prompt under a token budget
+"""
+
+from typing import List, Dict, Tuple
+
+# Rough chars-per-token ratio for English prose with Claude tokenizers;
+# good enough for budgeting without a network round-trip to count tokens
+CHARS_PER_TOKEN = 4
+MAX_SUMMARY_CHARS = 1000
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text locally"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def format_entry(index: int, entry: Dict, summary: str) -> str:
+    """Render one entry as a Scout prompt item"""
+    sources = ', '.join(entry.get('sources', [entry['source']]))
+    return (
+        f"## Item {index}: {entry['title']}\n"
+        f"**Source:** {sources}\n"
+        f"**Published:** {entry['published']}\n"
+        f"**Link:** {entry['link']}\n\n"
+        f"{summary}\n\n"
+        "---\n\n"
+    )
+
+def pack_entries(
+    entries: List[Dict],
+    token_budget: int,
+    min_summary_tokens: int = 40
+) -> Tuple[str, List[Dict]]:
+    """
+    Greedily pack entries into a token budget, highest priority first
+
+    Each entry gets its summary (capped at MAX_SUMMARY_CHARS) if it fits;
+    otherwise the summary is cut to the remaining budget, and if not even
+    min_summary_tokens fit the entry is dropped. Smaller entries further
+    down the list can still fill the space a dropped entry left.
+
+    Args:
+        entries: Entry dicts in priority order (e.g. from select_top_k)
+        token_budget: Estimated tokens available for the content block
+        min_summary_tokens: Smallest useful summary for a truncated entry
+
+    Returns:
+        (prompt text, manifest) where manifest has one
+        {"index", "title", "source", "status", "tokens"} dict per entry and
+        status is "included", "truncated" or "dropped"
+    """
+    manifest = []
+    parts = []
+    # Reserve room for the header, whose item count is only known at the end
+    used = estimate_tokens(f"# Content Summary ({len(entries)} items)\n\n")
+
+    for i, entry in enumerate(entries):
+        summary = entry['summary'][:MAX_SUMMARY_CHARS]
+        item = format_entry(len(parts) + 1, entry, summary)
+        cost = estimate_tokens(item)
+        status = "included"
+
+        if used + cost > token_budget:
+            overhead = cost - estimate_tokens(summary)
+            room = token_budget - used - overhead - 1  # -1 absorbs estimate rounding
+            if room < min_summary_tokens:
+                manifest.append({
+                    "index": i,
+                    "title": entry['title'],
+                    "source": entry['source'],
+                    "status": "dropped",
+                    "tokens": 0
+                })
+                continue
+            summary = summary[:room * CHARS_PER_TOKEN - 3] + "..."
+            item = format_entry(len(parts) + 1, entry, summary)
+            cost = estimate_tokens(item)
+            status = "truncated"
+
+        parts.append(item)
+        used += cost
+        manifest.append({
+            "index": i,
+            "title": entry['title'],
+            "source": entry['source'],
+            "status": status,
+            "tokens": cost
+        })
+
+    if not parts:
+        return "No new content found in the specified timeframe.", manifest
+
+    header = f"# Content Summary ({len(parts)} items)\n\n"
+    return header + ''.join(parts), manifest
+
+# Quick test
+if __name__ == "__main__":
+    test_entries = [
+        {'source': 'Feed A', 'title': f'Item {n}', 'published': 'Unknown',
+         'link': f'https://example.com/{n}', 'summary': 'word ' * 300}
+        for n in range(10)
+    ]
+
+    text, test_manifest = pack_entries(test_entries, token_budget=1200)
+    counts = {}
+    for item in test_manifest:
+        counts[item['status']] = counts.get(item['status'], 0) + 1
+    print(f"Packed {estimate_tokens(text)} tokens: {counts}")
+    assert estimate_tokens(text) <= 1200
+    assert counts.get('truncated') == 1 and counts.get('dropped', 0) > 0
+    print("All tests passed! ✅")
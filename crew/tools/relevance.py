@@ -0,0 +1,140 @@
+"""
+Relevance Ranking
+Scores fetched entries against monitored interest areas (BM25) and selects the top K
+"""
+
+import os
+import re
+import math
+from collections import Counter
+from typing import List, Dict, Optional
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'[a-z0-9][a-z0-9+.#-]*[a-z0-9+#]|[a-z0-9]')
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have how i in is it its of on or our
+that the this to was we what when which who will with you your not but can
+all about into new more than just also they their there them these those so
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with HTML and stopwords removed"""
+    words = _WORD_RE.findall(_TAG_RE.sub(' ', text).lower())
+    return [w for w in words if w not in STOPWORDS and len(w) > 1]
+
+def build_query(categories: List[str], interest_areas_file: Optional[str] = None) -> Counter:
+    """
+    Build the relevance query from source categories and the interest areas file
+
+    Args:
+        categories: `category` values from sources.yaml (e.g. 'agent_coding')
+        interest_areas_file: Markdown file of topics the Scout monitors (optional)
+
+    Returns:
+        Query term weights
+    """
+    query = Counter()
+    for category in categories:
+        query.update(tokenize(category.replace('_', ' ')))
+
+    if interest_areas_file and os.path.exists(interest_areas_file):
+        with open(interest_areas_file, 'r') as f:
+            query.update(tokenize(f.read()))
+
+    return query
+
+def bm25_scores(docs: List[Counter], query: Counter, k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """
+    BM25-score pre-tokenized documents against the query
+
+    The documents themselves are the corpus for IDF, so terms every document
+    mentions carry little weight and distinctive matches rank highest.
+    """
+    if not docs or not query:
+        return [0.0] * len(docs)
+
+    lengths = [sum(doc.values()) for doc in docs]
+    avg_length = (sum(lengths) / len(lengths)) or 1.0
+
+    doc_freq = Counter()
+    for doc in docs:
+        doc_freq.update(term for term in doc if term in query)
+
+    n = len(docs)
+    idf = {
+        term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+        for term, df in doc_freq.items()
+    }
+
+    scores = []
+    for doc, length in zip(docs, lengths):
+        norm = k1 * (1 - b + b * length / avg_length)
+        score = 0.0
+        for term, term_idf in idf.items():
+            tf = doc.get(term)
+            if tf:
+                # Repeated query terms (e.g. a topic listed twice) weigh more, sublinearly
+                score += term_idf * (tf * (k1 + 1)) / (tf + norm) * (1 + math.log(query[term]))
+        scores.append(score)
+
+    return scores
+
+def score_entries(entries: List[Dict], query: Counter, k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """BM25-score each entry's title+summary against the query"""
+    # Title counted twice: headlines are the densest description of an item
+    docs = [Counter(tokenize(f"{e.get('title', '')} {e.get('title', '')} {e.get('summary', '')}")) for e in entries]
+    return bm25_scores(docs, query, k1, b)
+
+def select_top_k(
+    entries: List[Dict],
+    query: Counter,
+    max_entries: int = 15,
+    per_source_limit: Optional[int] = None
+) -> List[Dict]:
+    """
+    Select the most relevant entries under an entry budget
+
+    Args:
+        entries: Entry dicts from SourceFetcher
+        query: Term weights from build_query()
+        max_entries: Total entries to keep
+        per_source_limit: Cap per source so one busy feed cannot crowd out the rest
+
+    Returns:
+        Selected entries, highest score first (ties keep feed order), each
+        annotated with its 'score'
+    """
+    scores = score_entries(entries, query)
+    ranked = sorted(range(len(entries)), key=lambda i: -scores[i])
+
+    selected = []
+    per_source = Counter()
+    for i in ranked:
+        if len(selected) >= max_entries:
+            break
+        source = entries[i]['source']
+        if per_source_limit and per_source[source] >= per_source_limit:
+            continue
+        per_source[source] += 1
+        entry = entries[i].copy()
+        entry['score'] = round(scores[i], 3)
+        selected.append(entry)
+
+    return selected
+
+# Quick test
+if __name__ == "__main__":
+    test_entries = [
+        {'source': 'Feed A', 'title': 'Quarterly earnings roundup', 'summary': 'Stocks moved on rate news.'},
+        {'source': 'Feed A', 'title': 'Running local LLMs on a homelab GPU', 'summary': 'Ollama and llama.cpp on Proxmox.'},
+        {'source': 'Feed B', 'title': 'New agent coding tools', 'summary': 'Coding agents gain repository context.'},
+    ]
+    test_query = build_query(['agent_coding', 'local_llms'])
+    test_query.update(tokenize("homelab proxmox ollama"))
+
+    top = select_top_k(test_entries, test_query, max_entries=2)
+    for entry in top:
+        print(f"{entry['score']:6.2f}  {entry['title']}")
+    assert [e['title'] for e in top] == ['Running local LLMs on a homelab GPU', 'New agent coding tools']
+    print("All tests passed! ✅")
@@ -0,0 +1,175 @@
+"""
+LLM Response Cache
+Content-addressed on-disk cache of crew outputs, so identical reruns skip the LLM calls
+"""
+
+import os
+import json
+import time
+import hashlib
+from typing import Any, Dict, List, Optional
+
+class ResponseCache:
+    """Directory of JSON files keyed by prompt hash, with TTL and size eviction"""
+
+    def __init__(self, directory: str = "cache/llm", ttl_hours: float = 168, max_bytes: int = 50 * 1024 * 1024):
+        """
+        Args:
+            directory: Where cached responses are stored
+            ttl_hours: Entries older than this are treated as misses and deleted
+            max_bytes: Total cache size; least recently used entries are evicted beyond it
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None on miss/expiry"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - record.get('created', 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used for eviction
+        except OSError:
+            # Evicted by a concurrent stage after the read; the value is still good
+            pass
+        return record['value']
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store value under key, then evict down to max_bytes"""
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'created': time.time(), 'value': value}, f)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        files = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        for mtime, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _model_name(agent) -> str:
+    """Model identifier of an agent (crewai wraps string llm ids in an LLM object)"""
+    return str(getattr(agent.llm, 'model', agent.llm))
+
+def crew_cache_key(crew) -> str:
+    """
+    Hash everything that determines a crew's outputs
+
+    For each task in order: the agent's model, role, goal and backstory,
+    the task description and expected output, and which earlier tasks it
+    takes as context. Context outputs are themselves determined by earlier
+    tasks in the same crew, so they are covered by hashing those tasks.
+    """
+    task_index = {id(task): i for i, task in enumerate(crew.tasks)}
+    parts = []
+    for task in crew.tasks:
+        agent = task.agent
+        parts.append({
+            'model': _model_name(agent),
+            'role': agent.role,
+            'goal': agent.goal,
+            'backstory': agent.backstory,
+            'description': task.description,
+            'expected_output': task.expected_output,
+            'context': [task_index.get(id(t)) for t in (task.context or [])]
+        })
+
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def kickoff_cached(crew, cache: Optional[ResponseCache], telemetry=None, stage: str = None,
+                   refresh: bool = False) -> List[str]:
+    """
+    Run crew.kickoff(), or return the cached outputs of an identical run
+
+    Args:
+        crew: Crew to execute
+        cache: ResponseCache, or None to always run (e.g. --no-cache)
+        telemetry: RunTelemetry to record the call's time, tokens and cost (optional)
+        stage: Stage name the call is recorded under
+        refresh: Always run, replacing any cached outputs (e.g. a forced regeneration)
+
+    Returns:
+        Raw output of each task, in crew.tasks order
+    """
+    start = time.perf_counter()
+    key = crew_cache_key(crew) if cache else None
+    if cache and not refresh:
+        cached = cache.get(key)
+        if cached is not None:
+            print(f"[ResponseCache] Hit {key[:12]} - skipping {len(crew.tasks)} LLM task(s)")
+            if telemetry:
+                telemetry.record_crew(stage, crew, None, cached['outputs'], time.perf_counter() - start, cached=True)
+            return cached['outputs']
+
+    result = crew.kickoff()
+    outputs = [task.output.raw for task in crew.tasks]
+    if telemetry:
+        telemetry.record_crew(stage, crew, result, outputs, time.perf_counter() - start)
+
+    if cache:
+        cache.put(key, {'outputs': outputs})
+        print(f"[ResponseCache] Stored {key[:12]}")
+
+    return outputs
+
+# Quick test
+if __name__ == "__main__":
+    import tempfile
+    from types import SimpleNamespace
+
+    kickoffs = []
+    agent = SimpleNamespace(llm='claude-sonnet-4-5-20250929', role='Catalyst', goal='g', backstory='b')
+    task = SimpleNamespace(agent=agent, description='Plan for H1', expected_output='A plan', context=None, output=None)
+
+    def kickoff():
+        kickoffs.append(1)
+        task.output = SimpleNamespace(raw=f"plan v{len(kickoffs)}")
+
+    crew = SimpleNamespace(tasks=[task], kickoff=kickoff)
+    cache = ResponseCache(tempfile.mkdtemp())
+
+    assert kickoff_cached(crew, cache) == ['plan v1']
+    assert kickoff_cached(crew, cache) == ['plan v1'] and len(kickoffs) == 1, "identical prompt should hit"
+    # A forced regeneration skips the hit, and its output replaces the cached one
+    assert kickoff_cached(crew, cache, refresh=True) == ['plan v2'] and len(kickoffs) == 2
+    assert kickoff_cached(crew, cache) == ['plan v2'] and len(kickoffs) == 2
+    assert kickoff_cached(crew, None) == ['plan v3']
+
+    print("All tests passed! ✅")
@@ -0,0 +1,89 @@
+"""
+Seen-Entry Index
+Tracks which feed entries have already been sent downstream, across runs
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable
+
+class SeenIndex:
+    """SQLite-backed set of entry hashes with age-based eviction"""
+
+    def __init__(self, path: str, retention_days: int = 30):
+        """
+        Open (or create) the index
+
+        Args:
+            path: SQLite database file
+            retention_days: Entries older than this are evicted on mark_seen()
+        """
+        self.path = path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " key TEXT PRIMARY KEY,"
+            " first_seen TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS seen_first_seen ON seen(first_seen)")
+        self._conn.commit()
+
+    @staticmethod
+    def entry_key(guid: str, link: str = '') -> str:
+        """Hash an entry's GUID (or link, if it has no GUID) into a compact key"""
+        identity = guid or link
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+
+    def contains(self, guid: str, link: str = '') -> bool:
+        """Check whether an entry was already processed in an earlier run"""
+        if not guid and not link:
+            return False
+
+        key = self.entry_key(guid, link)
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def mark_seen(self, entries: Iterable[Dict]) -> int:
+        """
+        Record entries as processed and evict expired keys
+
+        Call only once the entries have actually been analyzed; anything
+        marked here is skipped by every later run.
+
+        Args:
+            entries: Entry dicts from SourceFetcher (uses 'guid', 'link' and 'duplicates')
+
+        Returns:
+            Number of keys evicted
+        """
+        now = datetime.now()
+        rows = []
+        for entry in entries:
+            # Near-duplicates collapsed into this entry were covered by it too
+            for item in [entry] + entry.get('duplicates', []):
+                if item.get('guid') or item.get('link'):
+                    rows.append((self.entry_key(item.get('guid', ''), item.get('link', '')), now.isoformat()))
+        cutoff = (now - timedelta(days=self.retention_days)).isoformat()
+
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO seen (key, first_seen) VALUES (?, ?)", rows)
+            evicted = self._conn.execute("DELETE FROM seen WHERE first_seen < ?", (cutoff,)).rowcount
+            self._conn.commit()
+
+        return evicted
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
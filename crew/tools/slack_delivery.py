@@ -0,0 +1,665 @@
+"""
+Slack Delivery
+Posts the digest and Catalyst deliverables to Slack as Block Kit messages
+
+The full Scout and Analyst output is sent rather than a 500/800-character
+preview: text is converted to Slack mrkdwn, split at paragraph, line or word
+boundaries into section blocks under Slack's limits, and packed into as few
+messages as fit. The first message (header and opportunities) is posted to
+the channel and the rest go into its thread. Every API call passes through a
+token-bucket limiter, and 429/ratelimited responses pause it for Retry-After
+(or a default back-off). A post is never resent once it may have reached
+Slack, so a timeout cannot duplicate a message.
+"""
+
+import re
+import json
+import time
+import random
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_SLACK_API_URL = "https://slack.com/api"
+
+# Slack limits: 3000 characters of text per section block, 50 blocks per
+# message, 150 characters of header text. Messages are further capped so
+# each threaded chunk stays a readable size.
+SECTION_TEXT_LIMIT = 3000
+MAX_BLOCKS_PER_MESSAGE = 50
+HEADER_TEXT_LIMIT = 150
+MESSAGE_TEXT_LIMIT = 12000
+# Web API methods that create something: a request that may have reached
+# Slack is never resent, or a timed-out post that was accepted would appear twice
+NON_IDEMPOTENT_METHODS = {'chat.postMessage'}
+# Notification/fallback text shown where blocks are not rendered
+FALLBACK_TEXT_LIMIT = 300
+# First line of every digest: the n8n approval poller finds the digest
+# message by this exact text, so it must not change
+DIGEST_MARKER = "📊 *Strategic Intelligence Digest*"
+
+DELIVERABLE_LABELS = {
+    'plan': ('🔧', 'Technical Plan'),
+    'brief': ('📋', 'Leadership Brief'),
+    'slide': ('📊', 'Client Slide'),
+}
+
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_HEADING_RE = re.compile(r'^#{1,6}\s+(.+?)\s*#*$', re.MULTILINE)
+_LINK_RE = re.compile(r'\[([^\]]+)\]\((https?://[^)\s]+)\)')
+_BULLET_RE = re.compile(r'^(\s*)[-*]\s+', re.MULTILINE)
+
+class SlackError(Exception):
+    """A Slack API call failed (the Slack error code, or the transport error)"""
+
+def to_mrkdwn(text: str) -> str:
+    """Convert the agents' Markdown (headings, **bold**, [links](url), - bullets) to Slack mrkdwn"""
+    text = _LINK_RE.sub(r'<\2|\1>', text)
+    text = _BOLD_RE.sub(r'*\1*', text)
+    text = _HEADING_RE.sub(r'*\1*', text)
+    return _BULLET_RE.sub(r'\1• ', text)
+
+def split_text(text: str, limit: int = SECTION_TEXT_LIMIT) -> List[str]:
+    """
+    Split text into chunks of at most limit characters
+
+    Breaks between paragraphs where possible, then between lines, then
+    between words; only a single word longer than limit is cut.
+    """
+    text = text.strip()
+    if len(text) <= limit:
+        return [text] if text else []
+
+    for separator in ('\n\n', '\n', ' '):
+        pieces = text.split(separator)
+        if len(pieces) > 1:
+            break
+    else:
+        return [text[i:i + limit] for i in range(0, len(text), limit)]
+
+    chunks = []
+    current = ''
+    for piece in pieces:
+        candidate = f"{current}{separator}{piece}" if current else piece
+        if len(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current.strip())
+        if len(piece) > limit:
+            chunks.extend(split_text(piece, limit))
+            current = ''
+        else:
+            current = piece
+    if current.strip():
+        chunks.append(current.strip())
+    return chunks
+
+def header_block(text: str) -> Dict[str, Any]:
+    return {"type": "header", "text": {"type": "plain_text", "text": text[:HEADER_TEXT_LIMIT], "emoji": True}}
+
+def context_block(text: str) -> Dict[str, Any]:
+    return {"type": "context", "elements": [{"type": "mrkdwn", "text": text[:SECTION_TEXT_LIMIT]}]}
+
+def section_blocks(text: str) -> List[Dict[str, Any]]:
+    """Section blocks holding all of text, in order"""
+    return [{"type": "section", "text": {"type": "mrkdwn", "text": chunk}} for chunk in split_text(text)]
+
+def _block_text(block: Dict[str, Any]) -> str:
+    if 'text' in block:
+        return block['text']['text']
+    return ' '.join(element.get('text', '') for element in block.get('elements', []))
+
+def pack_messages(blocks: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Group blocks, in order, into messages within the block and text limits"""
+    messages = []
+    current, size = [], 0
+    for block in blocks:
+        length = len(_block_text(block))
+        if current and (len(current) >= MAX_BLOCKS_PER_MESSAGE or size + length > MESSAGE_TEXT_LIMIT):
+            messages.append(current)
+            current, size = [], 0
+        # A divider never starts or ends a chunk
+        if not current and block['type'] == 'divider':
+            continue
+        current.append(block)
+        size += length
+    if current:
+        messages.append(current)
+    for message in messages:
+        while len(message) > 1 and message[-1]['type'] == 'divider':
+            message.pop()
+    return messages
+
+def fallback_text(blocks: List[Dict[str, Any]]) -> str:
+    """Plain notification text for a message: its first text, shortened"""
+    for block in blocks:
+        text = _block_text(block) if block['type'] != 'divider' else ''
+        if text:
+            return text if len(text) <= FALLBACK_TEXT_LIMIT else text[:FALLBACK_TEXT_LIMIT - 3] + '...'
+    return DIGEST_MARKER
+
+def _opp_number(opp_id: str) -> int:
+    """Sort key for opportunity IDs: H2 before H10"""
+    digits = opp_id[1:]
+    return int(digits) if digits.isdigit() else 0
+
+def render_digest(payload: Dict[str, Any]) -> List[List[Dict[str, Any]]]:
+    """
+    Render a digest as Block Kit messages
+
+    Args:
+        payload: The slack_digest JSON written by slack_formatter.save_for_n8n_with_opportunities
+            (timestamp, sources_count, signals_count, opportunities, raw_outputs, telemetry)
+
+    Returns:
+        Messages (lists of blocks): the first is the top-level digest with the
+        opportunities, the rest are the full Analyst and Scout output for its thread
+    """
+    opportunities = payload.get('opportunities') or {}
+    raw_outputs = payload.get('raw_outputs') or {}
+
+    stats = f"{payload.get('timestamp', '')} | Sources: {payload.get('sources_count', 'N/A')} | Signals: {payload.get('signals_count', 'N/A')}"
+    if payload.get('telemetry'):
+        from tools.telemetry import format_summary_line
+        stats += f" | {format_summary_line(payload['telemetry'])}"
+
+    # A section rather than a header block so the message text starts with DIGEST_MARKER
+    top = [section_blocks(DIGEST_MARKER)[0], context_block(stats)]
+    for key, label, empty in (
+        ('homelab', '🏠 HOMELAB OPPORTUNITIES', '_No homelab opportunities identified today_'),
+        ('work', '💼 WORK OPPORTUNITIES', '_No work opportunities identified today_'),
+    ):
+        top += [{"type": "divider"}, section_blocks(f"*{label}*")[0]]
+        group = opportunities.get(key) or {}
+        if not group:
+            top += section_blocks(empty)
+        for opp_id in sorted(group, key=_opp_number):
+            opportunity = group[opp_id]
+            top += section_blocks(to_mrkdwn(
+                f"*[{opp_id}] {opportunity['title']}*\n_{opportunity.get('relevance', '')}_\n"
+                f"Signal: {opportunity.get('signal', '')}\nNext Steps: {opportunity.get('next_steps', '')}"
+            ))
+    top += [
+        {"type": "divider"},
+        context_block("Reply in thread: `approve [ID] [type]` to generate a deliverable "
+                      "(`plan` for homelab, `brief` or `slide` for work), e.g. `approve H1, W1 brief`. "
+                      "Full Analyst synthesis and Scout signals are in the thread.")
+    ]
+
+    thread = []
+    for key, label in (('analyst', '🧠 ANALYST SYNTHESIS'), ('scout', '🔍 SCOUT SIGNALS')):
+        text = raw_outputs.get(key) or ''
+        if text.strip():
+            thread += [{"type": "divider"}, header_block(label)] + section_blocks(to_mrkdwn(text))
+
+    return pack_messages(top) + pack_messages(thread)
+
+def render_deliverables(results: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Render Catalyst results (generate_deliverable / generate_batch items) as
+    messages, several short deliverables sharing one message
+    """
+    blocks = []
+    for result in results:
+        opp_id = result.get('opportunity_id', '')
+        emoji, label = DELIVERABLE_LABELS.get(result.get('deliverable_type'), ('📄', 'Deliverable'))
+        blocks.append({"type": "divider"})
+        if result.get('success'):
+            blocks += section_blocks(f"{emoji} *{label} for [{opp_id}] {result.get('opportunity_title', 'Unknown')}*")
+            blocks += section_blocks(to_mrkdwn(result.get('deliverable_content', '')))
+        else:
+            blocks += section_blocks(f"❌ Failed to generate {label} for *{opp_id}*\nError: {result.get('error', 'Unknown error')}")
+    return pack_messages(blocks)
+
+class TokenBucket:
+    """Thread-safe token bucket: rate calls per second on average, bursts of up to capacity"""
+
+    def __init__(self, rate: float = 1.0, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available; returns seconds waited"""
+        with self._lock:
+            self._refill(self._clock())
+            # Reserve the token now so concurrent callers queue up behind it
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """Hold every caller for at least seconds (e.g. a Retry-After)"""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+class SlackClient:
+    """Minimal Slack Web API client for posting, rate-limited and retrying"""
+
+    def __init__(
+        self,
+        token: str,
+        api_url: str = DEFAULT_SLACK_API_URL,
+        limiter: TokenBucket = None,
+        retries: int = 3,
+        backoff_base: float = 1.0,
+        timeout: float = 30
+    ):
+        """
+        Args:
+            token: Bot token (xoxb-...)
+            api_url: Web API base URL (a fake server in tests)
+            limiter: Shared limiter (default: 1 message per second, Slack's
+                chat.postMessage rate per channel)
+            retries: Retries after rate limiting, 5xx responses or connection
+                errors (chat.postMessage only after rate limiting, or errors
+                where nothing was sent)
+            backoff_base: First retry delay in seconds when Slack gives no Retry-After
+            timeout: Socket timeout per request in seconds
+        """
+        self.token = token
+        self.api_url = api_url.rstrip('/')
+        self.limiter = limiter or TokenBucket(rate=1.0, capacity=1.0)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self.stats = {'calls': 0, 'rate_limited': 0, 'retries': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def call(self, method: str, payload: Dict[str, Any], form: bool = False) -> Dict[str, Any]:
+        """
+        Call a Web API method
+
+        Args:
+            method: Web API method (e.g. chat.postMessage)
+            payload: Arguments, sent as a JSON body
+            form: Send them form-encoded instead (read methods such as
+                conversations.history do not accept JSON)
+
+        Returns:
+            The response body ({"ok": True, ...})
+
+        Raises:
+            SlackError: Slack returned ok=false, retries ran out, or a post
+                failed after it may have reached Slack
+        """
+        import socket
+        import urllib.error
+        import urllib.request
+
+        if form:
+            body = urllib.parse.urlencode(payload).encode('utf-8')
+            content_type = 'application/x-www-form-urlencoded'
+        else:
+            body = json.dumps(payload).encode('utf-8')
+            content_type = 'application/json; charset=utf-8'
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            self._count('calls')
+            request = urllib.request.Request(
+                f"{self.api_url}/{method}",
+                data=body,
+                headers={'Authorization': f"Bearer {self.token}", 'Content-Type': content_type},
+                method='POST'
+            )
+
+            retry_after = None
+            rate_limited = False
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    result = json.loads(response.read())
+                if result.get('ok'):
+                    return result
+                if result.get('error') != 'ratelimited':
+                    raise SlackError(f"{method} failed: {result.get('error', 'unknown error')}")
+                error = 'ratelimited'
+                rate_limited = True
+            except urllib.error.HTTPError as e:
+                if e.code != 429 and e.code < 500:
+                    raise SlackError(f"{method} failed: HTTP {e.code}")
+                if e.code != 429 and method in NON_IDEMPOTENT_METHODS:
+                    # Slack's edge can answer 5xx after the message was accepted
+                    raise SlackError(f"{method} failed: HTTP {e.code} (not retried, it may have been posted)")
+                error = f"HTTP {e.code}"
+                rate_limited = e.code == 429
+                retry_after = e.headers.get('Retry-After')
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                reason = getattr(e, 'reason', e)
+                error = str(reason)
+                # Refused or unresolvable: the request never left; anything else may have been received
+                not_sent = isinstance(reason, (ConnectionRefusedError, socket.gaierror))
+                if method in NON_IDEMPOTENT_METHODS and not not_sent:
+                    raise SlackError(f"{method} failed: {error} (not retried, it may have been posted)")
+
+            if attempt >= self.retries:
+                raise SlackError(f"{method} failed after {self.retries} retries: {error}")
+
+            backoff = self.backoff_base * (2 ** attempt)
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else backoff
+            if rate_limited:
+                self._count('rate_limited')
+                # Everyone sharing the limiter waits, not just this call
+                self.limiter.pause(delay)
+            else:
+                if not retry_after:
+                    delay *= random.uniform(0.5, 1.0)
+                time.sleep(delay)
+            print(f"[SlackDelivery] {method}: {error}, retrying (waiting {delay:.1f}s)")
+            self._count('retries')
+
+    def post_message(self, channel: str, blocks: List[Dict[str, Any]] = None, text: str = None,
+                     thread_ts: str = None) -> str:
+        """Post one message (blocks, or plain text); returns its ts"""
+        payload = {"channel": channel, "unfurl_links": False, "unfurl_media": False}
+        if blocks:
+            payload["blocks"] = blocks
+            payload["text"] = text or fallback_text(blocks)
+        else:
+            payload["text"] = text or ''
+        if thread_ts:
+            payload["thread_ts"] = thread_ts
+        return self.call('chat.postMessage', payload)['ts']
+
+    def fetch_message(self, channel: str, ts: str) -> Optional[Dict[str, Any]]:
+        """A top-level channel message by its ts, or None if there is none (needs channels:history)"""
+        result = self.call('conversations.history', {"channel": channel, "latest": ts, "inclusive": "true", "limit": 1}, form=True)
+        messages = [message for message in result.get('messages', []) if message.get('ts') == ts]
+        return messages[0] if messages else None
+
+def post_messages(client: SlackClient, channel: str, messages: List[List[Dict[str, Any]]],
+                  thread_ts: str = None) -> Dict[str, Any]:
+    """
+    Post messages in order; without thread_ts the first starts a thread for the rest
+
+    Returns:
+        {"success": bool, "ts": top-level ts, "thread_ts": ..., "messages": posted count, "error": ...}
+    """
+    posted = 0
+    top_ts = None
+    try:
+        for blocks in messages:
+            ts = client.post_message(channel, blocks, thread_ts=thread_ts)
+            posted += 1
+            if thread_ts is None:
+                top_ts = thread_ts = ts
+    except SlackError as e:
+        print(f"[SlackDelivery] {e}")
+        return {"success": False, "ts": top_ts, "thread_ts": thread_ts, "messages": posted, "error": str(e)}
+    return {"success": True, "ts": top_ts, "thread_ts": thread_ts, "messages": posted}
+
+def deliver_digest(client: SlackClient, channel: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Post a digest (see render_digest) as a top-level message plus threaded chunks"""
+    messages = render_digest(payload)
+    print(f"[SlackDelivery] Posting digest as {len(messages)} message(s) to {channel}")
+    return post_messages(client, channel, messages)
+
+def deliver_deliverables(client: SlackClient, channel: str, thread_ts: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Post Catalyst results into the digest thread, batched into as few messages as fit"""
+    messages = render_deliverables(results)
+    print(f"[SlackDelivery] Posting {len(results)} deliverable(s) as {len(messages)} message(s)")
+    return post_messages(client, channel, messages, thread_ts=thread_ts)
+
+class FakeSlackServer:
+    """
+    Local stand-in for the Slack Web API (chat.postMessage and
+    conversations.history) for tests
+
+    Enforces the block and text limits, answers every rate_limit_every-th call
+    with HTTP 429 (with Retry-After unless retry_after is None), and records
+    accepted messages as posted by a bot. Messages appended to .messages
+    directly stand in for other posts.
+    """
+
+    def __init__(self, rate_limit_every: int = 0, retry_after: Optional[int] = 1):
+        self.messages = []
+        self.calls = 0
+        self._ts = 1770000000.0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status, body, headers=None):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')
+                if self.headers.get('Content-Type', '').startswith('application/x-www-form-urlencoded'):
+                    payload = dict(urllib.parse.parse_qsl(body))
+                else:
+                    payload = json.loads(body)
+                with fake._lock:
+                    fake.calls += 1
+                    if rate_limit_every and fake.calls % rate_limit_every == 0:
+                        headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+                        self._send(429, {"ok": False, "error": "ratelimited"}, headers)
+                        return
+                    if self.path == '/conversations.history':
+                        found = [m for m in fake.messages
+                                 if m.get('channel') == payload.get('channel') and m['ts'] == payload.get('latest')
+                                 and m.get('thread_ts', m['ts']) == m['ts']]
+                        self._send(200, {"ok": True, "messages": found})
+                        return
+                    error = fake.validate(payload)
+                    if error:
+                        self._send(200, {"ok": False, "error": error})
+                        return
+                    fake._ts += 1
+                    ts = f"{fake._ts:.6f}"
+                    fake.messages.append({**payload, "ts": ts, "bot_id": "BFAKE", "received_at": time.monotonic()})
+                self._send(200, {"ok": True, "channel": payload['channel'], "ts": ts})
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @staticmethod
+    def validate(payload: Dict[str, Any]) -> Optional[str]:
+        if not payload.get('channel'):
+            return 'channel_not_found'
+        blocks = payload.get('blocks') or []
+        if len(blocks) > MAX_BLOCKS_PER_MESSAGE:
+            return 'invalid_blocks'
+        for block in blocks:
+            limit = HEADER_TEXT_LIMIT if block['type'] == 'header' else SECTION_TEXT_LIMIT
+            if len(_block_text(block)) > limit:
+                return 'invalid_blocks'
+        if not payload.get('text') and not blocks:
+            return 'no_text'
+        return None
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+# Quick test
+if __name__ == "__main__":
+    paragraph = ("Agent frameworks are converging on explicit tool schemas and durable state. " * 6).strip()
+    analyst = "\n\n".join(f"## Theme {i}\n\n**Signal {i}:** {paragraph}\n- [Source](https://example.com/{i})" for i in range(40))
+    scout = "\n".join(f"- [{i}] {paragraph[:160]}" for i in range(300))
+    payload = {
+        "timestamp": "2026-02-02 03:30:00",
+        "sources_count": 12,
+        "signals_count": 42,
+        "opportunities": {
+            "homelab": {
+                opp_id: {"title": "Local LLM Fine-tuning", "relevance": "AI Box", "signal": "s", "next_steps": "n"}
+                for opp_id in ("H10", "H1", "H2")
+            },
+            "work": {}
+        },
+        "raw_outputs": {"scout": scout, "analyst": analyst}
+    }
+
+    assert to_mrkdwn("## Head\n**bold** and [x](https://a.b/c)\n- item") == "*Head*\n*bold* and <https://a.b/c|x>\n• item"
+    chunks = split_text("word " * 2000, 500)
+    assert all(len(c) <= 500 for c in chunks) and ' '.join(chunks).split() == ["word"] * 2000
+    assert split_text("x" * 7000) == ["x" * 3000, "x" * 3000, "x" * 1000]
+
+    messages = render_digest(payload)
+    print(f"Digest ({len(analyst) + len(scout):,} chars of Scout/Analyst output) -> {len(messages)} messages, "
+          f"{sum(len(m) for m in messages)} blocks")
+    assert len(messages) > 3 and '[H1] Local LLM Fine-tuning' in json.dumps(messages[0])
+    top_text = json.dumps(messages[0], ensure_ascii=False)
+    assert top_text.index('[H1]') < top_text.index('[H2]') < top_text.index('[H10]'), "IDs sort numerically"
+    assert fallback_text(messages[0]) == DIGEST_MARKER, "the n8n approval poller matches this text"
+    sent_text = ' '.join(_block_text(b) for m in messages for b in m if b['type'] == 'section')
+    for i in (0, 39):
+        assert f"<https://example.com/{i}|Source>" in sent_text, "nothing of the analysis should be dropped"
+    assert sent_text.count('] Agent frameworks') == 300
+
+    # Limiter: 10 calls at 50/s with a burst of 2 take ~(10 - 2) / 50 s
+    bucket = TokenBucket(rate=50, capacity=2)
+    start = time.monotonic()
+    for _ in range(10):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+    assert 0.12 <= elapsed < 0.5, elapsed
+    clock = [0.0]
+    paused = TokenBucket(rate=1, capacity=1, clock=lambda: clock[0], sleep=lambda s: None)
+    paused.pause(5)
+    assert abs(paused.acquire() - 5) < 1e-9
+
+    # Against the fake Slack: limits enforced, every 4th call answered 429 + Retry-After
+    fake = FakeSlackServer(rate_limit_every=4, retry_after=1)
+    client = SlackClient('xoxb-test', api_url=fake.url, limiter=TokenBucket(rate=20, capacity=1), backoff_base=0.05)
+    result = deliver_digest(client, 'C1', payload)
+    assert result['success'] and result['messages'] == len(messages) == len(fake.messages), result
+    assert all(m['thread_ts'] == result['ts'] for m in fake.messages[1:]) and 'thread_ts' not in fake.messages[0]
+    assert DIGEST_MARKER in fake.messages[0]['text']
+    assert client.stats['rate_limited'] >= 1
+    gaps = [b['received_at'] - a['received_at'] for a, b in zip(fake.messages, fake.messages[1:])]
+    assert max(gaps) >= 0.9, "a 429 should hold the next post for Retry-After"
+
+    results = [
+        {"success": True, "opportunity_id": "H1", "deliverable_type": "plan", "opportunity_title": "Fine-tuning",
+         "deliverable_content": "## Overview\nShort plan."},
+        {"success": True, "opportunity_id": "W1", "deliverable_type": "brief", "opportunity_title": "Reviews",
+         "deliverable_content": "## Executive Summary\nShort brief."},
+        {"success": False, "opportunity_id": "W2", "deliverable_type": "slide", "error": "timeout"},
+    ]
+    before = len(fake.messages)
+    batch = deliver_deliverables(client, 'C1', result['ts'], results)
+    assert batch['success'] and batch['messages'] == 1 == len(fake.messages) - before, "short deliverables share a message"
+    assert '*Technical Plan for [H1] Fine-tuning*' in json.dumps(fake.messages[-1], ensure_ascii=False)
+
+    parent = client.fetch_message('C1', result['ts'])
+    assert parent['bot_id'] and parent['blocks'] == messages[0]
+    assert client.fetch_message('C1', fake.messages[1]['ts']) is None, "thread replies are not channel messages"
+
+    try:
+        client.call('chat.postMessage', {"channel": "", "text": "x"})
+        raise AssertionError("Slack errors should raise")
+    except SlackError as e:
+        assert 'channel_not_found' in str(e)
+    fake.close()
+
+    # 429 without Retry-After: still a rate limit, with the default back-off on the shared limiter
+    fake = FakeSlackServer(rate_limit_every=2, retry_after=None)
+    client = SlackClient('xoxb-test', api_url=fake.url, limiter=TokenBucket(rate=50, capacity=1), backoff_base=0.05)
+    client.post_message('C1', text='one')
+    client.post_message('C1', text='two')
+    assert client.stats['rate_limited'] == 1 and [m['text'] for m in fake.messages] == ['one', 'two']
+    fake.close()
+
+    # A post that timed out may have been accepted: not resent. Reads are retried.
+    received = []
+
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(self.path)
+            self.rfile.read(int(self.headers['Content-Length']))
+            time.sleep(0.3)
+
+        def log_message(self, format, *args):
+            pass
+
+    slow = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=slow.serve_forever, daemon=True).start()
+    client = SlackClient('xoxb-test', api_url=f"http://127.0.0.1:{slow.server_address[1]}",
+                         limiter=TokenBucket(rate=50, capacity=1), retries=2, backoff_base=0.01, timeout=0.1)
+    try:
+        client.post_message('C1', text='once')
+        raise AssertionError("a timed-out post should raise")
+    except SlackError as e:
+        assert 'not retried' in str(e)
+    assert received == ['/chat.postMessage']
+    try:
+        client.fetch_message('C1', '1770000001.000000')
+        raise AssertionError("a timed-out read should raise once retries run out")
+    except SlackError:
+        pass
+    assert received.count('/conversations.history') == 3
+    slow.shutdown()
+    slow.server_close()
+
+    # Connection refused: nothing was sent, so even a post is retried
+    client = SlackClient('xoxb-test', api_url=f"http://127.0.0.1:{slow.server_address[1]}",
+                         limiter=TokenBucket(rate=50, capacity=1), retries=2, backoff_base=0.01)
+    try:
+        client.post_message('C1', text='refused')
+        raise AssertionError("a refused post should raise once retries run out")
+    except SlackError as e:
+        assert 'after 2 retries' in str(e)
+    assert client.stats['calls'] == 3
+
+    # A 5xx may come after the post was accepted: not resent. Reads are retried.
+    received = []
+
+    class UnavailableHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(self.path)
+            self.rfile.read(int(self.headers['Content-Length']))
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    unavailable = ThreadingHTTPServer(('127.0.0.1', 0), UnavailableHandler)
+    threading.Thread(target=unavailable.serve_forever, daemon=True).start()
+    client = SlackClient('xoxb-test', api_url=f"http://127.0.0.1:{unavailable.server_address[1]}",
+                         limiter=TokenBucket(rate=50, capacity=1), retries=2, backoff_base=0.01)
+    try:
+        client.post_message('C1', text='once')
+        raise AssertionError("a post answered with 503 should raise")
+    except SlackError as e:
+        assert 'HTTP 503' in str(e) and 'not retried' in str(e)
+    assert received == ['/chat.postMessage']
+    try:
+        client.fetch_message('C1', '1770000001.000000')
+        raise AssertionError("a read answered with 503 should raise once retries run out")
+    except SlackError:
+        pass
+    assert received.count('/conversations.history') == 3
+    unavailable.shutdown()
+    unavailable.server_close()
+    print("All tests passed! ✅")
@@ -1,58 +1,349 @@
-import feedparser
+import io
+import time
+import zlib
+import tempfile
+import http.client
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Iterable, List, Dict, Tuple
+from urllib.parse import urlparse
+from tools.entry import Entry
+from tools.feed_stream import iter_entries
+from tools.http_cache import ValidatorStore
+from tools.http_session import HttpSession
+from tools.seen_index import SeenIndex
+from tools.prompt_packer import MAX_SUMMARY_CHARS, format_entry, pack_entries
+
+# A date-ordered feed stops being read after this many consecutive entries
+# older than the lookback window
+EARLY_STOP_AFTER = 3
+
+# Failures while streaming a response body (resets, timeouts, truncated gzip)
+_READ_ERRORS = (OSError, http.client.HTTPException, zlib.error)
+
+# Bytes of a feed kept in memory for the feedparser fallback before spilling to disk
+SPOOL_MEMORY_BYTES = 1024 * 1024
+
+class _SpooledReader:
+    """Binary stream wrapper that keeps a replayable copy of everything read"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.spool.write(data)
+        return data
+
+    def replay(self):
+        """The whole document from the start (reads whatever is left first)"""
+        self.spool.write(self.stream.read())
+        self.spool.seek(0)
+        return self.spool
+
+    def close(self):
+        self.spool.close()
 
 class SourceFetcher:
     """Fetches content from RSS feeds and web sources"""
     
-    def __init__(self, lookback_hours: int = 168):
+    def __init__(
+        self,
+        lookback_hours: int = 168,
+        timeout: float = 30,
+        validator_cache: str = None,
+        seen_index: SeenIndex = None,
+        retries: int = 3,
+        time_budget: float = 90
+    ):
         """
         Initialize source fetcher
         
         Args:
             lookback_hours: How many hours back to fetch content (default: 168 = 1 week)
+            timeout: Per-feed network timeout in seconds (default: 30)
+            validator_cache: Path to ETag/Last-Modified store (None disables conditional GET)
+            seen_index: Index of already-processed entries to skip (None disables incremental mode)
+            retries: Retries per source for transient network failures (default: 3)
+            time_budget: Total seconds per source request, retries included (default: 90)
         """
         self.lookback_hours = lookback_hours
         self.cutoff_date = datetime.now() - timedelta(hours=lookback_hours)
+        self.timeout = timeout
+        self.validators = ValidatorStore(validator_cache) if validator_cache else None
+        self.seen_index = seen_index
+        # One pooled session for every source: keep-alive per host, gzip, retries
+        self.session = HttpSession(timeout=timeout, retries=retries, time_budget=time_budget)
+        self.source_status = {}  # source name -> 'fetched' | 'unchanged' | 'error'
+        self.source_seconds = {}  # source name -> wall time to fetch and parse
+        self._host_locks = {}
+        self._host_locks_guard = threading.Lock()
+    
+    def close(self):
+        """Close the pooled connections and the seen index (the resident worker reuses the process)"""
+        self.session.close()
+        if self.seen_index:
+            self.seen_index.close()
+    
+    def fetch_all(self, sources: List[Dict], max_workers: int = 8, per_host_limit: int = 2) -> List[List[Entry]]:
+        """
+        Fetch many RSS and web sources concurrently
+        
+        Args:
+            sources: Source dicts from sources.yaml (name, url, type, ...)
+            max_workers: Maximum feeds in flight at once
+            per_host_limit: Maximum concurrent requests to the same host
+        
+        Returns:
+            One entry list per source, in the same order as `sources`
+        """
+        if not sources:
+            return []
+        
+        def fetch_one(source):
+            with self._host_semaphore(source['url'], per_host_limit):
+                # Timed once the host slot is held, so queueing is not counted
+                start = time.perf_counter()
+                try:
+                    if source.get('type') == 'web':
+                        return self.fetch_web(source['url'], source['name'])
+                    return self.fetch_rss(source['url'], source['name'])
+                finally:
+                    self.source_seconds[source['name']] = time.perf_counter() - start
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(sources))) as pool:
+            return list(pool.map(fetch_one, sources))
+    
+    def _host_semaphore(self, url: str, limit: int) -> threading.Semaphore:
+        """Get (or create) the semaphore limiting concurrency for a URL's host"""
+        host = urlparse(url).netloc.lower()
+        with self._host_locks_guard:
+            if host not in self._host_locks:
+                self._host_locks[host] = threading.BoundedSemaphore(limit)
+            return self._host_locks[host]
+    
+    def _open(self, url: str, headers: Dict[str, str]):
+        """
+        Open a feed document for streaming through the pooled session
+        
+        Returns:
+            HttpResponse (the caller closes it), or None if the server
+            answered 304 Not Modified
+        """
+        response = self.session.open(url, headers)
+        
+        if response.status != 200:
+            # Drain the empty/error body so the connection goes back to the pool
+            with response:
+                response.read()
+            if response.status == 304:
+                return None
+            raise OSError(f"HTTP {response.status}")
+        return response
+    
+    def _parse_feed(self, stream, source_name: str, progress: Dict[str, int]) -> Tuple[List[Entry], int, bool]:
+        """Stream-parse a feed document (feedparser for malformed XML); counts parsed items in progress['items']"""
+        def counted(items):
+            for item in items:
+                progress['items'] += 1
+                yield item
+        
+        reader = _SpooledReader(stream)
+        try:
+            return self._collect(counted(iter_entries(reader)), source_name)
+        except ET.ParseError:
+            # Not well-formed XML (bare HTML entities, bad encoding, ...):
+            # feedparser recovers what it can from the full document
+            import feedparser
+            
+            feed = feedparser.parse(reader.replay())
+            return self._collect(map(self._from_feedparser, feed.entries), source_name)
+        finally:
+            reader.close()
+    
+    def _read_rss(self, url: str, source_name: str, headers: Dict[str, str]):
+        """
+        Fetch and parse a feed, recovering from a body read that fails midway
+        
+        The response is only retried up to its headers by the session, so a
+        reset or timeout while streaming the body is handled here: before any
+        item was parsed the stream is reopened (within the session's retries
+        and time budget); after, the body is fetched whole with get() and
+        parsed from memory.
+        
+        Returns:
+            (response, (entries, skipped_seen, stopped_early)), or (None, None) on 304
+        """
+        deadline = time.monotonic() + self.session.time_budget
+        attempt = 0
+        while True:
+            response = self._open(url, headers)
+            if response is None:
+                return None, None
+            progress = {'items': 0}
+            try:
+                with response:
+                    return response, self._parse_feed(response, source_name, progress)
+            except _READ_ERRORS as e:
+                delay = min(self.session.backoff_max, self.session.backoff_base * (2 ** attempt))
+                if progress['items']:
+                    print(f"[SourceFetcher] {source_name}: Read failed after {progress['items']} entries ({e}), refetching whole")
+                    break
+                if attempt >= self.session.retries or time.monotonic() + delay >= deadline:
+                    raise
+                print(f"[SourceFetcher] {source_name}: Read failed ({e}), reopening in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+        
+        response = self.session.get(url, headers)
+        if response.status == 304:
+            return None, None
+        if response.status != 200:
+            raise OSError(f"HTTP {response.status}")
+        return response, self._parse_feed(io.BytesIO(response.body), source_name, {'items': 0})
     
-    def fetch_rss(self, url: str, source_name: str) -> List[Dict]:
+    def fetch_rss(self, url: str, source_name: str) -> List[Entry]:
         """Fetch entries from an RSS feed"""
-        entries = []
+        try:
+            headers = self.validators.request_headers(url) if self.validators else {}
+            response, parsed = self._read_rss(url, source_name, headers)
+            if response is None:
+                self.source_status[source_name] = 'unchanged'
+                print(f"[SourceFetcher] {source_name}: Unchanged since last run (304)")
+                return []
+            entries, skipped_seen, stopped_early = parsed
+            
+            # Only once the body was read, so a failed read is refetched next run
+            if self.validators:
+                self.validators.update(url, response.headers.get('etag'), response.headers.get('last-modified'))
+            
+            self.source_status[source_name] = 'fetched'
+            seen_note = f" ({skipped_seen} already seen)" if skipped_seen else ""
+            stop_note = " (stopped at lookback cutoff)" if stopped_early else ""
+            print(f"[SourceFetcher] {source_name}: Fetched {len(entries)} entries{seen_note}{stop_note}")
+            return entries
+            
+        except Exception as e:
+            self.source_status[source_name] = 'error'
+            print(f"[SourceFetcher] Error fetching {source_name}: {str(e)}")
+            return []
+    
+    def fetch_web(self, url: str, source_name: str) -> List[Entry]:
+        """Fetch entries from a blog/news index page without a feed"""
+        from tools.web_extract import extract_articles
         
         try:
-            feed = feedparser.parse(url)
+            headers = self.validators.request_headers(url) if self.validators else {}
+            response = self.session.get(url, headers)
+            
+            # Unchanged pages cost one conditional request and no parsing
+            unchanged = response.status == 304
+            if response.status == 200 and self.validators:
+                self.validators.update(url, response.headers.get('etag'), response.headers.get('last-modified'))
+                unchanged = not self.validators.content_changed(url, response.body)
+            if unchanged:
+                self.source_status[source_name] = 'unchanged'
+                print(f"[SourceFetcher] {source_name}: Unchanged since last run")
+                return []
+            if response.status != 200:
+                raise OSError(f"HTTP {response.status}")
             
-            for entry in feed.entries:
-                # Parse published date
-                pub_date = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    pub_date = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    pub_date = datetime(*entry.updated_parsed[:6])
-                
-                # Skip if too old (if date available)
-                if pub_date and pub_date < self.cutoff_date:
-                    continue
-                
-                # Extract entry data
-                entry_data = {
-                    'source': source_name,
-                    'title': entry.get('title', 'No title'),
-                    'link': entry.get('link', ''),
-                    'summary': entry.get('summary', entry.get('description', '')),
-                    'published': pub_date.isoformat() if pub_date else 'Unknown',
-                    'content': self._extract_content(entry)
-                }
-                
-                entries.append(entry_data)
+            charset = 'utf-8'
+            content_type = response.headers.get('content-type', '')
+            if 'charset=' in content_type:
+                charset = content_type.split('charset=', 1)[1].split(';')[0].strip().strip('"')
+            try:
+                html = response.body.decode(charset, errors='replace')
+            except LookupError:
+                html = response.body.decode('utf-8', errors='replace')
             
-            print(f"[SourceFetcher] {source_name}: Fetched {len(entries)} entries")
+            entries, skipped_seen, _ = self._collect(extract_articles(html, response.url), source_name)
+            
+            self.source_status[source_name] = 'fetched'
+            seen_note = f" ({skipped_seen} already seen)" if skipped_seen else ""
+            print(f"[SourceFetcher] {source_name}: Extracted {len(entries)} articles{seen_note}")
             return entries
             
         except Exception as e:
+            self.source_status[source_name] = 'error'
             print(f"[SourceFetcher] Error fetching {source_name}: {str(e)}")
             return []
     
+    def _collect(self, items: Iterable[Dict], source_name: str) -> Tuple[List[Entry], int, bool]:
+        """
+        Filter parsed entries by date and the seen index
+        
+        Args:
+            items: Entry dicts from feed_stream.iter_entries, web_extract.extract_articles
+                or _from_feedparser
+            source_name: Source name recorded on each entry
+        
+        Returns:
+            (entries, number skipped as already seen, whether reading stopped early)
+        """
+        entries = []
+        skipped_seen = 0
+        previous_date = None
+        date_ordered = True
+        old_streak = 0
+        
+        for item in items:
+            pub_date = item['published'] or item['updated']
+            
+            if pub_date:
+                if previous_date and pub_date > previous_date:
+                    date_ordered = False
+                previous_date = pub_date
+            
+            # Skip if too old (if date available); on a newest-first feed a
+            # run of old entries means the rest are older still
+            if pub_date and pub_date < self.cutoff_date:
+                old_streak += 1
+                if date_ordered and old_streak >= EARLY_STOP_AFTER:
+                    return entries, skipped_seen, True
+                continue
+            old_streak = 0
+            
+            # Skip if already processed in an earlier run
+            guid = item['guid']
+            if self.seen_index and self.seen_index.contains(guid, item['link']):
+                skipped_seen += 1
+                continue
+            
+            # Extract entry data
+            entries.append(Entry(
+                source=source_name,
+                guid=guid,
+                title=item['title'] or 'No title',
+                link=item['link'],
+                summary=item['summary'],
+                published=pub_date.isoformat() if pub_date else 'Unknown',
+                content=item['content']
+            ))
+        
+        return entries, skipped_seen, False
+    
+    def _from_feedparser(self, entry) -> Dict:
+        """Convert a feedparser entry to the feed_stream entry shape"""
+        published = updated = None
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            published = datetime(*entry.published_parsed[:6])
+        if hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+            updated = datetime(*entry.updated_parsed[:6])
+        
+        return {
+            'guid': entry.get('id', ''),
+            'title': entry.get('title', ''),
+            'link': entry.get('link', ''),
+            'summary': entry.get('summary', entry.get('description', '')),
+            'content': self._extract_content(entry),
+            'published': published,
+            'updated': updated
+        }
+    
     def _extract_content(self, entry) -> str:
         """Extract full content from entry"""
         # Try content first (more complete)
@@ -74,17 +365,106 @@ class SourceFetcher:
         if not entries:
             return "No new content found in the specified timeframe."
         
-        formatted = f"# Content Summary ({len(entries)} items)\n\n"
+        parts = [f"# Content Summary ({len(entries)} items)\n\n"]
+        # Truncate very long content
+        parts.extend(
+            format_entry(i, entry, entry['summary'][:MAX_SUMMARY_CHARS])
+            for i, entry in enumerate(entries, 1)
+        )
+        return ''.join(parts)
+    
+    def pack_for_scout(self, entries: List[Dict], token_budget: int) -> Tuple[str, List[Dict]]:
+        """
+        Format entries for the Scout within a token budget
         
-        for i, entry in enumerate(entries, 1):
-            formatted += f"## Item {i}: {entry['title']}\n"
-            formatted += f"**Source:** {entry['source']}\n"
-            formatted += f"**Published:** {entry['published']}\n"
-            formatted += f"**Link:** {entry['link']}\n\n"
-            
-            # Truncate very long content
-            content = entry['summary'][:1000] if len(entry['summary']) > 1000 else entry['summary']
-            formatted += f"{content}\n\n"
-            formatted += "---\n\n"
+        Args:
+            entries: Entries in priority order
+            token_budget: Estimated tokens available for the content block
+        
+        Returns:
+            (formatted content, manifest of included/truncated/dropped entries)
+        """
+        return pack_entries(entries, token_budget)
+
+# Quick test against the local HTML fixtures
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from functools import partial
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+    
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+    
+    fixture_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'web')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=fixture_dir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    page_url = f"http://127.0.0.1:{server.server_address[1]}/article_blog.html"
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        fetcher = SourceFetcher(lookback_hours=24 * 365 * 10, validator_cache=os.path.join(cache_dir, 'validators.json'))
+        first = fetcher.fetch_web(page_url, 'Fixture Blog')
+        assert [e['title'] for e in first] == ['Shipping agents to production', 'Notes on local inference']
+        assert fetcher.source_status['Fixture Blog'] == 'fetched'
+        
+        # Unchanged page: answered from validators/content hash, nothing parsed
+        fetcher.validators.save()
+        fetcher = SourceFetcher(validator_cache=os.path.join(cache_dir, 'validators.json'))
+        assert fetcher.fetch_web(page_url, 'Fixture Blog') == []
+        assert fetcher.source_status['Fixture Blog'] == 'unchanged'
+    
+    server.shutdown()
+    
+    # A connection reset partway through a feed body does not drop the source
+    import socket
+    import struct
+    from email.utils import formatdate
+    from http.server import BaseHTTPRequestHandler
+    
+    item = ("<item><title>Post {i}</title><link>https://example.com/{i}</link><guid>g{i}</guid>"
+            f"<pubDate>{formatdate(usegmt=True)}</pubDate><description>{'x' * 400}</description></item>")
+    feed_body = ("<rss><channel><title>T</title>" + "".join(item.format(i=i) for i in range(400)) + "</channel></rss>").encode()
+    requests_seen = {}
+    
+    class ResettingHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def log_message(self, format, *args):
+            pass
+        
+        def do_GET(self):
+            requests_seen[self.path] = requests_seen.get(self.path, 0) + 1
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(feed_body)))
+            self.end_headers()
+            if requests_seen[self.path] > 1:
+                self.wfile.write(feed_body)
+                return
+            # First request: part of the body, then a TCP reset
+            self.wfile.write(feed_body[:40 if self.path == '/early' else 120 * 1024])
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+            self.connection.close()
+            self.close_connection = True
         
-        return formatted
+        def finish(self):
+            try:
+                super().finish()
+            except (OSError, ValueError):
+                pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ResettingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    fetcher = SourceFetcher(lookback_hours=24)
+    fetcher.session.backoff_base = 0.01
+    
+    # Reset before any entry was parsed: the stream is reopened
+    assert len(fetcher.fetch_rss(base + '/early', 'Early')) == 400 and requests_seen['/early'] == 2
+    # Reset after entries were parsed: the whole body is refetched and parsed once
+    late = fetcher.fetch_rss(base + '/late', 'Late')
+    assert [e['title'] for e in late] == [f"Post {i}" for i in range(400)] and requests_seen['/late'] == 2
+    assert fetcher.source_status == {'Early': 'fetched', 'Late': 'fetched'}
+    fetcher.close()
+    server.shutdown()
+    print("All tests passed! ✅")
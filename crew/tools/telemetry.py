@@ -0,0 +1,242 @@
+"""
+Run Telemetry
+Per-run wall time, token and cost accounting for the digest pipeline
+
+Stages and their sub-steps (source fetches, dedup/ranking/packing, prompt
+builds, agent calls) are recorded as timed spans; every crew kickoff
+records its model, input/output tokens and estimated cost. The summary is
+written as JSON next to the digest and embedded in the Slack payload, so
+runs can be compared over time.
+"""
+
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from tools.prompt_packer import estimate_tokens
+
+# USD per million (input, output) tokens, matched by model-id prefix
+MODEL_PRICING = {
+    'claude-3-haiku': (0.25, 1.25),
+    'claude-3-5-haiku': (0.80, 4.00),
+    'claude-haiku-4-5': (1.00, 5.00),
+    'claude-sonnet-4': (3.00, 15.00),
+    'claude-opus-4': (15.00, 75.00),
+}
+
+def model_price(model: str) -> Optional[Tuple[float, float]]:
+    """(input, output) USD per million tokens for a model id, or None if unknown"""
+    model = model.rsplit('/', 1)[-1]  # e.g. "anthropic/claude-3-haiku-20240307"
+    matches = [prefix for prefix in MODEL_PRICING if model.startswith(prefix)]
+    return MODEL_PRICING[max(matches, key=len)] if matches else None
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+    """Estimated USD cost of one call, or None for an unpriced model"""
+    price = model_price(model)
+    if price is None:
+        return None
+    return (input_tokens * price[0] + output_tokens * price[1]) / 1_000_000
+
+def _usage_tokens(usage) -> Optional[Tuple[int, int]]:
+    """(prompt, completion) tokens from a crewai UsageMetrics object or usage dict"""
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        prompt, completion = usage.get('prompt_tokens'), usage.get('completion_tokens')
+    else:
+        prompt, completion = getattr(usage, 'prompt_tokens', None), getattr(usage, 'completion_tokens', None)
+    if not prompt and not completion:
+        return None
+    return int(prompt or 0), int(completion or 0)
+
+class RunTelemetry:
+    """Thread-safe recorder for one pipeline run (stages run concurrently)"""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._spans = []
+        self._llm_calls = []
+        self._lock = threading.Lock()
+
+    def record_span(self, name: str, kind: str, seconds: float, **attrs):
+        """
+        Record a timed step
+
+        Args:
+            name: Step name (e.g. 'scout', 'fetch:Hacker News')
+            kind: 'stage', 'fetch' (download + parse of one source),
+                'select' (dedup/ranking) or 'prompt' (prompt and context build)
+            seconds: Wall time
+            **attrs: Extra JSON-serializable fields (e.g. entries=12)
+        """
+        with self._lock:
+            self._spans.append({'name': name, 'kind': kind, 'seconds': round(seconds, 3), **attrs})
+
+    @contextmanager
+    def span(self, name: str, kind: str, **attrs):
+        """Time the enclosed block as a span (recorded even if it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, kind, time.perf_counter() - start, **attrs)
+
+    def record_llm(
+        self,
+        stage: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        seconds: float,
+        cached: bool = False,
+        estimated: bool = False
+    ):
+        """
+        Record one agent call
+
+        Args:
+            stage: Pipeline stage that made the call
+            model: Model id
+            input_tokens / output_tokens: Token counts (0 for a cache hit)
+            seconds: Wall time of the call
+            cached: Served from the response cache (no LLM call made)
+            estimated: Counts are local estimates because crewai reported no usage
+        """
+        cost = estimate_cost(model, input_tokens, output_tokens)
+        with self._lock:
+            self._llm_calls.append({
+                'stage': stage,
+                'model': model,
+                'input_tokens': input_tokens,
+                'output_tokens': output_tokens,
+                'cost_usd': round(cost, 6) if cost is not None else None,
+                'seconds': round(seconds, 3),
+                'cached': cached,
+                'estimated': estimated
+            })
+
+    def record_crew(self, stage: str, crew, kickoff_result, outputs: List[str], seconds: float, cached: bool = False):
+        """
+        Record a crew kickoff, reading token usage from crewai when it reports it
+
+        Args:
+            stage: Pipeline stage name
+            crew: The Crew that ran (or would have run, on a cache hit)
+            kickoff_result: Return value of crew.kickoff() (None on a cache hit)
+            outputs: Raw task outputs
+            seconds: Wall time of the kickoff
+            cached: Outputs came from the response cache
+        """
+        # Every crew in the pipeline has a single agent, so one model per call
+        agent = crew.tasks[0].agent
+        model = str(getattr(agent.llm, 'model', agent.llm))
+        if cached:
+            self.record_llm(stage, model, 0, 0, seconds, cached=True)
+            return
+
+        tokens = _usage_tokens(getattr(kickoff_result, 'token_usage', None))
+        tokens = tokens or _usage_tokens(getattr(crew, 'usage_metrics', None))
+        estimated = tokens is None
+        if estimated:
+            prompt = ''.join(
+                f"{task.agent.role}{task.agent.goal}{task.agent.backstory}{task.description}{task.expected_output}"
+                for task in crew.tasks
+            )
+            tokens = (estimate_tokens(prompt), sum(estimate_tokens(output or '') for output in outputs))
+        self.record_llm(stage, model, tokens[0], tokens[1], seconds, estimated=estimated)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Snapshot of everything recorded so far
+
+        Returns:
+            {"run_id", "started_at", "elapsed_seconds", "stages": {name: seconds},
+             "spans": [...], "llm_calls": [...],
+             "models": {model: {"calls", "cached_calls", "input_tokens", "output_tokens", "cost_usd"}},
+             "totals": {"input_tokens", "output_tokens", "cost_usd"}}
+        """
+        with self._lock:
+            spans = list(self._spans)
+            llm_calls = list(self._llm_calls)
+
+        models = {}
+        for call in llm_calls:
+            model = models.setdefault(call['model'], {
+                'calls': 0, 'cached_calls': 0, 'input_tokens': 0, 'output_tokens': 0, 'cost_usd': 0.0
+            })
+            model['calls'] += 1
+            model['cached_calls'] += call['cached']
+            model['input_tokens'] += call['input_tokens']
+            model['output_tokens'] += call['output_tokens']
+            model['cost_usd'] += call['cost_usd'] or 0.0
+        for model in models.values():
+            model['cost_usd'] = round(model['cost_usd'], 6)
+
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'elapsed_seconds': round(time.perf_counter() - self._start, 3),
+            'stages': {span['name']: span['seconds'] for span in spans if span['kind'] == 'stage'},
+            'spans': spans,
+            'llm_calls': llm_calls,
+            'models': models,
+            'totals': {
+                'input_tokens': sum(m['input_tokens'] for m in models.values()),
+                'output_tokens': sum(m['output_tokens'] for m in models.values()),
+                'cost_usd': round(sum(m['cost_usd'] for m in models.values()), 6)
+            }
+        }
+
+    def save(self, output_file: str) -> str:
+        """Write summary() as JSON; returns the path"""
+        with open(output_file, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        return output_file
+
+def format_summary_line(summary: Dict[str, Any]) -> str:
+    """One-line digest header, e.g. '41,230 in / 3,105 out tokens, ~$0.0581, 94.2s'"""
+    totals = summary['totals']
+    return (f"{totals['input_tokens']:,} in / {totals['output_tokens']:,} out tokens, "
+            f"~${totals['cost_usd']:.4f}, {summary['elapsed_seconds']:.1f}s")
+
+# Quick test
+if __name__ == "__main__":
+    from types import SimpleNamespace as NS
+
+    assert model_price('claude-3-haiku-20240307') == (0.25, 1.25)
+    assert model_price('anthropic/claude-sonnet-4-5-20250929') == (3.00, 15.00)
+    assert model_price('gpt-unknown') is None
+    assert abs(estimate_cost('claude-sonnet-4-5-20250929', 1_000_000, 100_000) - 4.5) < 1e-9
+
+    telemetry = RunTelemetry('test-run')
+    with telemetry.span('fetch', 'stage'):
+        telemetry.record_span('fetch:Example Feed', 'fetch', 0.42, entries=7)
+
+    def make_crew(model):
+        agent = NS(role='Trend Scout', goal='g', backstory='b' * 400, llm=model)
+        return NS(tasks=[NS(agent=agent, description='d' * 4000, expected_output='e')])
+
+    # crewai reported usage (newer versions: CrewOutput.token_usage)
+    crew = make_crew('claude-3-haiku-20240307')
+    telemetry.record_crew('scout', crew, NS(token_usage=NS(prompt_tokens=2000, completion_tokens=500)), ['x'], 3.2)
+    # No usage reported: estimated locally
+    telemetry.record_crew('homelab', make_crew(NS(model='claude-sonnet-4-5-20250929')), 'raw', ['y' * 400], 8.0)
+    # Response cache hit: no tokens, no cost
+    telemetry.record_crew('analyst', make_crew('claude-3-haiku-20240307'), None, ['z'], 0.01, cached=True)
+
+    summary = telemetry.summary()
+    print(json.dumps(summary['models'], indent=2))
+    print(format_summary_line(summary))
+
+    haiku = summary['models']['claude-3-haiku-20240307']
+    assert haiku == {'calls': 2, 'cached_calls': 1, 'input_tokens': 2000, 'output_tokens': 500, 'cost_usd': 0.001125}
+    sonnet_call = next(c for c in summary['llm_calls'] if c['stage'] == 'homelab')
+    assert sonnet_call['estimated'] and sonnet_call['input_tokens'] > 1000 and sonnet_call['output_tokens'] == 100
+    assert list(summary['stages']) == ['fetch'] and summary['spans'][0]['entries'] == 7
+    json.dumps(summary)
+    print("All tests passed! ✅")
@@ -0,0 +1,231 @@
+"""
+Web Article Extraction
+Pulls an article list (title, link, date, teaser) out of a blog or news index page
+
+Lightweight by design: one pass of the stdlib HTML parser, no DOM, no
+rendering. Pages built from <article> elements are read element by
+element; otherwise links pointing below the index page (e.g. /news/...)
+are treated as article cards.
+"""
+
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from tools.feed_stream import parse_date
+
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4'}
+SKIP_TAGS = {'script', 'style', 'noscript', 'svg', 'template'}
+
+MIN_TITLE_CHARS = 12
+
+# "Feb 2, 2026", "February 2, 2026", "2 Feb 2026", "2026-02-02"
+_DATE_RE = re.compile(
+    r'\b(?:[A-Z][a-z]{2,8}\.? \d{1,2}, \d{4}|\d{1,2} [A-Z][a-z]{2,8} \d{4}|\d{4}-\d{2}-\d{2})\b'
+)
+_DATE_FORMATS = ('%b %d, %Y', '%B %d, %Y', '%b. %d, %Y', '%d %b %Y', '%d %B %Y', '%Y-%m-%d')
+
+def _parse_loose_date(text: str) -> Optional[datetime]:
+    """Parse a machine (<time datetime>) or human-readable date"""
+    parsed = parse_date(text)
+    if parsed:
+        return parsed
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text.strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+class _Card:
+    """Text and links collected inside one <article> or one article link"""
+
+    def __init__(self, link: str = ''):
+        self.link = link
+        self.heading = []
+        self.link_text = []
+        self.paragraph = []
+        self.text = []
+        self.date = None
+        self.in_heading = 0
+        self.in_link = False
+        self.in_paragraph = 0
+        self.paragraph_done = False
+
+    def to_entry(self) -> Optional[Dict]:
+        title = ' '.join(' '.join(self.heading).split()) or ' '.join(' '.join(self.link_text).split())
+        if not self.link or len(title) < MIN_TITLE_CHARS:
+            return None
+
+        published = self.date
+        if published is None:
+            match = _DATE_RE.search(' '.join(self.text))
+            if match:
+                published = _parse_loose_date(match.group(0))
+
+        summary = ' '.join(' '.join(self.paragraph).split())
+        return {
+            'guid': self.link,
+            'title': title,
+            'link': self.link,
+            'summary': summary,
+            'content': summary,
+            'published': published,
+            'updated': None
+        }
+
+class _ArticleListParser(HTMLParser):
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        base = urlparse(base_url)
+        self.base_host = base.netloc
+        self.base_path = base.path.rstrip('/') + '/'
+
+        self.articles = []      # cards from <article> elements
+        self.link_cards = []    # cards from links below the index page
+        self._article = None
+        self._article_depth = 0
+        self._link_card = None
+        self._skip = 0
+
+    def _is_article_link(self, href: str) -> bool:
+        target = urlparse(href)
+        return (
+            target.netloc == self.base_host
+            and target.path.startswith(self.base_path)
+            and target.path.rstrip('/') != self.base_path.rstrip('/')
+        )
+
+    def _open_cards(self) -> List[_Card]:
+        return [card for card in (self._article, self._link_card) if card is not None]
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+            return
+        if self._skip:
+            return
+        attrs = dict(attrs)
+
+        if tag == 'article':
+            if self._article is None:
+                self._article = _Card()
+            self._article_depth += 1
+
+        if tag == 'a' and attrs.get('href'):
+            href = urljoin(self.base_url, attrs['href']).split('#')[0]
+            if self._article is not None and not self._article.link:
+                self._article.link = href
+                self._article.in_link = True
+            if self._article is None and self._link_card is None and self._is_article_link(href):
+                self._link_card = _Card(href)
+
+        for card in self._open_cards():
+            if tag in HEADING_TAGS:
+                card.in_heading += 1
+            elif tag == 'p' and not card.paragraph_done:
+                card.in_paragraph += 1
+            elif tag == 'time' and card.date is None and attrs.get('datetime'):
+                card.date = _parse_loose_date(attrs['datetime'])
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+            return
+        if self._skip:
+            return
+
+        for card in self._open_cards():
+            if tag in HEADING_TAGS and card.in_heading:
+                card.in_heading -= 1
+            elif tag == 'p' and card.in_paragraph:
+                card.in_paragraph -= 1
+                card.paragraph_done = card.in_paragraph == 0
+
+        if tag == 'a' and self._article is not None:
+            self._article.in_link = False
+
+        if tag == 'a' and self._link_card is not None:
+            self.link_cards.append(self._link_card)
+            self._link_card = None
+
+        if tag == 'article' and self._article is not None:
+            self._article_depth -= 1
+            if self._article_depth == 0:
+                self.articles.append(self._article)
+                self._article = None
+
+    def handle_data(self, data):
+        if self._skip or not data.strip():
+            return
+        for card in self._open_cards():
+            card.text.append(data)
+            if card.in_heading:
+                card.heading.append(data)
+            elif card.in_paragraph:
+                card.paragraph.append(data)
+            if card.in_link or card is self._link_card:
+                card.link_text.append(data)
+
+def extract_articles(html: str, base_url: str, max_articles: int = 50) -> List[Dict]:
+    """
+    Extract the article list from an index page
+
+    Args:
+        html: Page source
+        base_url: URL the page was fetched from (for resolving relative links)
+        max_articles: Cap on entries returned
+
+    Returns:
+        Entry dicts in page order, same shape as feed_stream.iter_entries
+        ({"guid", "title", "link", "summary", "content", "published", "updated"});
+        guid is the article link
+    """
+    parser = _ArticleListParser(base_url)
+    parser.feed(html)
+    parser.close()
+
+    cards = parser.articles if parser.articles else parser.link_cards
+
+    entries = []
+    seen_links = set()
+    for card in cards:
+        entry = card.to_entry()
+        if entry is None or entry['link'] in seen_links:
+            continue
+        seen_links.add(entry['link'])
+        entries.append(entry)
+        if len(entries) >= max_articles:
+            break
+    return entries
+
+# Quick test
+if __name__ == "__main__":
+    import os
+
+    fixture_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'web')
+
+    with open(os.path.join(fixture_dir, 'article_blog.html'), 'r') as f:
+        blog = extract_articles(f.read(), 'https://blog.example.com/')
+    for entry in blog:
+        print(f"{str(entry['published']):20s} {entry['title']}  <{entry['link']}>")
+    assert [e['title'] for e in blog] == ['Shipping agents to production', 'Notes on local inference']
+    assert blog[0]['link'] == 'https://blog.example.com/posts/agents-in-production'
+    assert blog[0]['published'] == datetime(2026, 2, 2, 9, 0)
+    assert blog[0]['summary'].startswith('What changed when')
+
+    with open(os.path.join(fixture_dir, 'news_cards.html'), 'r') as f:
+        news = extract_articles(f.read(), 'https://www.example.com/news')
+    for entry in news:
+        print(f"{str(entry['published']):20s} {entry['title']}  <{entry['link']}>")
+    assert [e['link'] for e in news] == [
+        'https://www.example.com/news/model-context-update',
+        'https://www.example.com/news/developer-platform-pricing',
+    ]
+    assert news[0]['title'] == 'Model context protocol update'
+    assert news[1]['published'] == datetime(2026, 1, 28)
+
+    print("All tests passed! ✅")
@@ -0,0 +1,57 @@
+"""
+Crew Worker Client
+Submits digest and deliverable jobs to the resident crew worker (worker.py)
+"""
+
+import os
+import json
+from typing import Any, Dict, Optional
+
+DEFAULT_WORKER_URL = "http://127.0.0.1:8790"
+
+def worker_url() -> str:
+    """Base URL of the crew worker (CREW_WORKER_URL overrides the default)"""
+    return os.getenv('CREW_WORKER_URL', DEFAULT_WORKER_URL).rstrip('/')
+
+def submit_job(kind: str, payload: Dict[str, Any], timeout: float = 3600) -> Optional[Dict[str, Any]]:
+    """
+    Run a job on the crew worker and wait for its result
+
+    Args:
+        kind: Job type ('digest' or 'deliverable')
+        payload: Job arguments, passed to the worker as JSON
+        timeout: Seconds to wait for the job to finish
+
+    Returns:
+        The worker's result dict, or None if no worker is listening (the
+        caller should then run the job in-process). Once the worker has
+        accepted a job, failures are reported as {"success": False, ...}
+        rather than None, so the job is never run twice.
+    """
+    # Imported here so entry points that exit early (--help, bad arguments)
+    # never load urllib/http.client
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(
+        f"{worker_url()}/jobs/{kind}",
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        # Worker answered with an error status; its body is still a result dict
+        try:
+            return json.loads(e.read())
+        except ValueError:
+            return {"success": False, "error": f"Crew worker returned HTTP {e.code}"}
+    except urllib.error.URLError as e:
+        if isinstance(e.reason, (ConnectionRefusedError, FileNotFoundError)):
+            return None
+        return {"success": False, "error": f"Crew worker request failed: {e.reason}"}
+    except (TimeoutError, OSError) as e:
+        return {"success": False, "error": f"Crew worker request failed: {str(e)}"}
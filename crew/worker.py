@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Crew Worker
+Long-lived process that keeps the digest crew and Catalyst agents warm and
+runs digest and deliverable jobs for crew.py / catalyst.py over local HTTP
+
+Usage:
+    python3 worker.py [--host 127.0.0.1] [--port 8790]
+
+Endpoints:
+    GET  /health            -> {"status": "ok", ...}
+    POST /jobs/digest       {"resume": null, "use_cache": true}
+    POST /jobs/deliverable  {"digest_date": "2026-02-02", "opportunity": "H1", "type": "plan", "use_cache": true,
+                             "reply_ts": "", "force": false}
+    POST /jobs/deliverable_batch
+                            {"digest_date": "2026-02-02", "approvals": [{"opp_id": "H1", "type": "plan"}, ...],
+                             "max_workers": 3, "use_cache": true, "force": false}
+"""
+
+import json
+import argparse
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+
+import crew
+import catalyst
+from tools.worker_client import DEFAULT_WORKER_URL
+
+class CrewWorker:
+    """Warm agents plus one lock per job type (agents are not shared across concurrent runs)"""
+
+    def __init__(self):
+        print("[Worker] Building agents...")
+        self.digest_agents = crew.build_agents()
+        self.catalyst_agent = catalyst.build_catalyst_agent()
+        self.digest_lock = threading.Lock()
+        self.deliverable_lock = threading.Lock()
+        self.started_at = datetime.now().isoformat()
+        self.jobs_run = 0
+
+    def run_digest(self, job):
+        with self.digest_lock:
+            self.jobs_run += 1
+            return crew.run_digest(
+                agents=self.digest_agents,
+                resume=job.get('resume'),
+                use_cache=job.get('use_cache', True)
+            )
+
+    def run_deliverable(self, job):
+        for field in ('digest_date', 'opportunity', 'type'):
+            if not job.get(field):
+                return {"success": False, "error": f"Missing required field: {field}"}
+        if job['type'] not in ('plan', 'brief', 'slide'):
+            return {"success": False, "error": f"Invalid deliverable type: {job['type']}"}
+
+        with self.deliverable_lock:
+            self.jobs_run += 1
+            return catalyst.generate_deliverable(
+                job['digest_date'],
+                job['opportunity'],
+                job['type'],
+                use_cache=job.get('use_cache', True),
+                agent=self.catalyst_agent,
+                reply_ts=job.get('reply_ts', ''),
+                force=job.get('force', False)
+            )
+
+    def run_deliverable_batch(self, job):
+        if not job.get('digest_date') or not job.get('approvals'):
+            return {"success": False, "error": "Missing required field: digest_date or approvals"}
+
+        # Batch items build their own agents, so they need no lock
+        self.jobs_run += 1
+        return catalyst.generate_batch(
+            job['digest_date'],
+            job['approvals'],
+            max_workers=job.get('max_workers', 3),
+            use_cache=job.get('use_cache', True),
+            force=job.get('force', False)
+        )
+
+def make_handler(worker: CrewWorker):
+    """Bind a request handler class to a worker instance"""
+
+    routes = {
+        '/jobs/digest': worker.run_digest,
+        '/jobs/deliverable': worker.run_deliverable,
+        '/jobs/deliverable_batch': worker.run_deliverable_batch,
+    }
+
+    class JobHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if urlparse(self.path).path != '/health':
+                self._send_json(404, {"success": False, "error": "Not found"})
+                return
+            self._send_json(200, {
+                "status": "ok",
+                "started_at": worker.started_at,
+                "jobs_run": worker.jobs_run
+            })
+
+        def do_POST(self):
+            handler = routes.get(urlparse(self.path).path)
+            if handler is None:
+                self._send_json(404, {"success": False, "error": "Not found"})
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                job = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                self._send_json(400, {"success": False, "error": "Request body must be JSON"})
+                return
+
+            try:
+                result = handler(job)
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            self._send_json(200, result)
+
+        def log_message(self, format, *args):
+            print(f"[Worker] {self.address_string()} {format % args}")
+
+    return JobHandler
+
+def main():
+    default_port = int(DEFAULT_WORKER_URL.rsplit(':', 1)[1])
+    parser = argparse.ArgumentParser(description='Run the resident crew worker')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: localhost only)')
+    parser.add_argument('--port', type=int, default=default_port, help=f'Port to listen on (default: {default_port})')
+    args = parser.parse_args()
+
+    # Load environment variables
+    load_dotenv('config/.env')
+
+    worker = CrewWorker()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(worker))
+    print(f"[Worker] Listening on http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[Worker] Shutting down")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
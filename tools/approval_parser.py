@@ -5,7 +5,7 @@ Parses approval/dismiss syntax from Slack replies for Criterion 5
 """
 
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Mapping
 
 def parse_approval_syntax(text: str) -> Dict[str, Any]:
     """
@@ -129,13 +129,15 @@ def parse_single_approval(item: str, action: str) -> Dict[str, Any]:
 
     return result
 
-def validate_against_opportunities(approvals: List[Dict[str, str]], opportunities: Dict[str, Any]) -> Dict[str, Any]:
+def validate_against_opportunities(approvals: List[Dict[str, str]], opportunities: Mapping[str, Any]) -> Dict[str, Any]:
     """
     Validate parsed approvals against actual opportunity mapping
 
     Args:
         approvals: List of {"opp_id": "H1", "type": "plan"} from parse_approval_syntax
-        opportunities: Dict of opportunities from opportunities_{date}.json
+        opportunities: Opportunities of the digest, either the dict from
+            opportunities_{date}.json or OpportunityStore.digest(date), which
+            looks up only the approved IDs
 
     Returns:
         {
@@ -166,6 +168,26 @@ def validate_against_opportunities(approvals: List[Dict[str, str]], opportunitie
 
     return result
 
+def record_decisions(parsed: Dict[str, Any], digest_date: str, store) -> List[str]:
+    """
+    Record a valid approve/dismiss reply as opportunity statuses
+
+    Args:
+        parsed: Result of parse_approval_syntax
+        digest_date: Digest the reply belongs to
+        store: OpportunityStore holding the digest
+
+    Returns:
+        IDs whose status was updated (unknown IDs are skipped)
+    """
+    if not parsed["valid"]:
+        return []
+    status = "dismissed" if parsed["action"] == "dismiss" else "approved"
+    return [
+        approval["opp_id"] for approval in parsed["approvals"]
+        if store.set_status(digest_date, approval["opp_id"], status)
+    ]
+
 def generate_help_message(errors: List[str]) -> str:
     """Generate helpful error message for invalid syntax"""
     lines = [